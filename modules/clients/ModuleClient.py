@@ -3,9 +3,11 @@ import websocket
 import json
 import time
 import threading
-from typing import Callable, Optional, Dict, Any, List
+from collections import deque
+from typing import Callable, Optional, Deque, Dict, Any, List
 from enums.Events import EventsType, EventsTopic
 from utils.EnvHelper import getenv
+from utils.Tracer import Tracer
 
 
 class ModuleClient:
@@ -38,6 +40,8 @@ class ModuleClient:
 
         self._on_message = None
         self._on_command: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        # Трассы, уже отправленные этим клиентом: следующие сообщения запроса идут без них
+        self._sent_traces: Deque[str] = deque(maxlen=256)
 
     def _read_manifest(self):
         try:
@@ -57,13 +61,45 @@ class ModuleClient:
         self._on_command[topic] = handler
         return self
 
-    def emit(self, obj: Dict[str, Any]):
+    def emit(self, obj: Dict[str, Any], final: bool = False):
+        """
+        Args:
+            obj (Dict[str, Any]): Сообщение
+            final (bool): Итоговое сообщение запроса - получает текущую трассу, даже если она уже отправлялась
+        """
         try:
             if self._ws and self._ws.sock and self._ws.sock.connected:
-                self._ws.send(json.dumps(obj))
+                self._ws.send(json.dumps(self._with_trace(obj, final)))
         except Exception:
             pass
 
+    def _with_trace(self, obj: Dict[str, Any], final: bool = False) -> Dict[str, Any]:
+        """
+        Трасса в payload; sent_at - для времени в очереди. Своя трасса сообщения
+        отправляется всегда, текущая в потоке - только с первым сообщением запроса
+        и с итоговым (final), чтобы не раздувать каждый кусок потока.
+        """
+        payload = obj.get('payload')
+        if not isinstance(payload, dict):
+            return obj
+        trace = payload.get('trace')
+        if not trace:
+            tracer = Tracer.getInstance()
+            trace = tracer.current() if tracer.enabled else None
+            if not trace or (trace.get('id') in self._sent_traces and not final):
+                return obj
+            self._sent_traces.append(trace.get('id'))
+        return {**obj, 'payload': {**payload, 'trace': {**trace, 'sent_at': time.time()}}}
+
+    def _handle(self, topic: str, handler: Callable[[Dict[str, Any]], None], data: Dict[str, Any]):
+        payload = data.get('payload')
+        trace = payload.get('trace') if isinstance(payload, dict) else None
+        tracer = Tracer.getInstance()
+        if trace and trace.get('sent_at'):
+            tracer.add_span(f"queue:{topic}", trace, trace['sent_at'], service=self.service_name)
+        with tracer.activate(trace):
+            handler(data)
+
     def start(self, stop_event: Optional[threading.Event] = None, block: bool = True):
         if stop_event is not None:
             self._stop = stop_event
@@ -103,14 +139,14 @@ class ModuleClient:
                         handler = self._on_command.get(topic)
                         if handler:
                             try:
-                                handler(data)
+                                self._handle(topic, handler, data)
                             except Exception as e:
                                 self._log('handler error for', topic, e)
                         else:
                             for pat, h in list(self._on_command.items()):
                                 if pat.endswith('*') and topic.startswith(pat[:-1]):
                                     try:
-                                        h(data)
+                                        self._handle(topic, h, data)
                                     except Exception as e:
                                         self._log('handler error for', pat, e)
                 if self._on_message:
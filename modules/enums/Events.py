@@ -20,10 +20,16 @@ class EventsTopic(enum.Enum):
     JSON_DIALOGS_DATA_SET = 'json_dialogs_data_set'
 
     RAW_TEXT_DATA_RECOGNIZED = 'raw_text_data_recognized'
+    RAW_TEXT_DATA_PARTIAL = 'raw_text_data_partial'
+    RAW_TEXT_DATA_TRANSCRIBED = 'raw_text_data_transcribed'
+    RAW_AUDIO_DATA_CHUNK = 'raw_audio_data_chunk'
 
     ACTION_APP_OPEN = 'action_app_open'
     ACTION_THEME_SET = 'action_theme_set'
     ACTION_WAKE = 'action_wake'
+    ACTION_FOLLOW_UP_END = 'action_follow_up_end'
+    ACTION_BATCH_TRANSCRIBE = 'action_batch_transcribe'
+    ACTION_BATCH_TRANSCRIBE_DONE = 'action_batch_transcribe_done'
     ACTION_TRANSCRIPT = 'action_transcript'
     ACTION_MODE_SET = 'action_mode_set'
     ACTION_AIMODEL_SET = 'action_aimodel_set'
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+
+
+class IAudioSource(ABC):
+    """
+    Источник int16 PCM кадров для распознавания речи.
+
+    read() блокируется до получения запрошенного числа кадров и бросает
+    EOFError, когда источник исчерпан (файл закончился, пайп закрыт).
+    """
+
+    is_live: bool = True
+
+    def __init__(self, rate: int, channels: int, frames_per_buffer: int):
+        self.rate = rate
+        self.channels = channels
+        self.frames_per_buffer = frames_per_buffer
+        self.sample_width = 2
+
+    @abstractmethod
+    def open(self) -> None:
+        pass
+
+    @abstractmethod
+    def read(self, frames: int) -> bytes:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def is_active(self) -> bool:
+        pass
+
+    def reopen(self) -> None:
+        """Лёгкое восстановление после ошибки: переоткрыть только поток, не трогая бэкенд"""
+        self.close()
+        self.open()
+
+    def reset(self) -> None:
+        """Полная переинициализация бэкенда после ошибок (вызывается на закрытом источнике)"""
+        pass
+
+    @property
+    def source_name(self) -> str:
+        return self.__class__.__name__.replace('Source', '').lower()
@@ -35,3 +35,18 @@ class IProvider(ABC):
     
     def is_available(self) -> bool:
         return self.client is not None and bool(self.api_key) and bool(self.model)
+
+    def warm_up(self) -> Optional[float]:
+        """Открывает соединение заранее; возвращает затраченные секунды или None, если прогрев не поддерживается"""
+        return None
+
+    def record_first_token(self, seconds: float) -> None:
+        """Время от запроса до первого куска ответа"""
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {}
+
+    def close(self) -> None:
+        """Освобождает соединения при выселении экземпляра"""
+        pass
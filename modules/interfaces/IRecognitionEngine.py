@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+class IRecognitionEngine(ABC):
+    """
+    Движок распознавания речи поверх int16 PCM.
+
+    Потоковый интерфейс: accept() принимает очередной чанк и возвращает True,
+    когда движок сам закрыл фразу (тогда её забирают через result()),
+    partial() - текущая гипотеза, final() - принудительное закрытие фразы.
+    Результаты - словари {'text', 'words', 'confidence'}; words - список
+    {'word', 'start', 'end', 'conf'} или None, confidence - 0..1 или None.
+
+    Непотоковые движки (streaming = False) копят звук и декодируют его
+    в final(); для них основной вход - transcribe().
+    """
+
+    streaming: bool = True
+
+    def __init__(self, rate: int):
+        self.rate = rate
+
+    @abstractmethod
+    def accept(self, chunk: bytes) -> bool:
+        pass
+
+    @abstractmethod
+    def result(self) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def partial(self) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def final(self) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def reset(self) -> None:
+        pass
+
+    def transcribe(self, pcm: bytes) -> Dict[str, Any]:
+        """Распознаёт цельный фрагмент; состояние потока сбрасывается"""
+        self.reset()
+        results: List[Dict[str, Any]] = []
+        step = self.rate  # полсекунды int16
+        for offset in range(0, len(pcm), step):
+            if self.accept(pcm[offset:offset + step]):
+                results.append(self.result())
+        results.append(self.final())
+        self.reset()
+        return self.merge(results)
+
+    @staticmethod
+    def merge(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        words = [w for r in results for w in (r.get('words') or [])]
+        confidences = [r['confidence'] for r in results if r.get('text') and r.get('confidence') is not None]
+        return {
+            'text': ' '.join(r['text'] for r in results if r.get('text')),
+            'words': words or None,
+            'confidence': sum(confidences) / len(confidences) if confidences else None
+        }
+
+    @property
+    def engine_name(self) -> str:
+        return self.__class__.__name__.replace('Engine', '').lower()
+
+    @staticmethod
+    def make_result(text: str = '', words: Optional[list] = None, confidence: Optional[float] = None) -> Dict[str, Any]:
+        return {'text': text, 'words': words, 'confidence': confidence}
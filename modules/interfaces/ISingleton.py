@@ -16,4 +16,9 @@ class ISingleton(ABC, metaclass=SingletonMeta):
     
     @classmethod
     def getInstance(cls):
-        return cls()
\ No newline at end of file
+        return cls()
+
+    @classmethod
+    def drop_instance(cls):
+        """Забывает закешированный экземпляр, следующий вызов создаст новый"""
+        SingletonMeta._instances.pop(cls, None)
\ No newline at end of file
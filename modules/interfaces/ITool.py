@@ -11,6 +11,22 @@ class ITool(ISingleton):
 
     required_settings_fields = []
 
+    # Таймаут вызова в секундах; None - общий AI_TOOL_TIMEOUT_SECONDS
+    timeout = None
+
+    # Таймаут HTTP-запросов пакета в секундах: зависший запрос не держит поток пула инструментов
+    request_timeout = 10
+
+    # Команды с побочными эффектами: выполняются по одной, в порядке, в котором их запросила модель.
+    # Остальные команды пакета только читают и выполняются параллельно
+    side_effects = []
+
+    # Кэшируемые команды пакета и время жизни их результатов в секундах
+    cache_ttls = {}
+
+    # Команды с побочными эффектами -> команды (любых пакетов), чьи кэшированные результаты они сбрасывают
+    invalidates = {}
+
     @classmethod
     def get_commands(cls):
         return cls.commands
@@ -2,10 +2,14 @@ from .ISingleton import ISingleton
 from .IService import IService
 from .ITool import ITool
 from .IProvider import IProvider
+from .IAudioSource import IAudioSource
+from .IRecognitionEngine import IRecognitionEngine
 
 __all__ = [
     "ISingleton",
     "IService",
     "ITool",
-    "IProvider"
+    "IProvider",
+    "IAudioSource",
+    "IRecognitionEngine"
 ]
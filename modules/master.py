@@ -9,6 +9,7 @@ from clients import SocketClient
 from paths import path_resolver
 from enums.Events import EventsType, EventsTopic
 from store.ModulesStore import ModulesStore
+from utils.ResourceRegistry import ResourceRegistry
 from utils.LogService import get_logger, log_crash, log_error, log_info, log_warning
 
 class Logger:
@@ -44,6 +45,7 @@ class Orchestrator:
 		self.modules_manifests: Dict[str, Dict[str, Any]] = {}
 		self._running: Dict[Tuple[str, str, str], Tuple[threading.Thread, threading.Event]] = {}
 		self.registry: Dict[str, Dict[str, Any]] = {}
+		self.resources = ResourceRegistry()
 		self.client = SocketClient(log=True)
 		self.logger = Logger()
 
@@ -97,6 +99,10 @@ class Orchestrator:
 
 		self.stop_module(service_name)
 
+		released = self.resources.evict_owner(service_name)
+		if released:
+			self.logger.info(f"released resources of '{service_name}': {released}")
+
 	def _on_service_enable(self, msg: Dict[str, Any]):
 		service_name = msg.get('payload', {}).get('serviceId')
 
@@ -164,7 +170,7 @@ class Orchestrator:
 			self.logger.error(f"main file not found for {name}: {abs_path}")
 			return
 		
-		g = {'__name__': '__main__', 'ORC_STOP': stop_event}
+		g = {'__name__': '__main__', 'ORC_STOP': stop_event, 'ORC_RESOURCES': self.resources}
 		self.logger.info(f"starting module '{name}' -> {abs_path}")
 		
 		start_time = time.time()
@@ -324,7 +330,11 @@ class Orchestrator:
 			'thread_name': th.name,
 			'thread_daemon': th.daemon,
 			'last_heartbeat': registry_info.get('ts'),
-			'subscribes': registry_info.get('subscribes', [])
+			'subscribes': registry_info.get('subscribes', []),
+			'resources': [
+				key for key, info in self.resources.get_stats()['resources'].items()
+				if info['owner'] == service_id
+			]
 		}
 
 	def cleanup_dead_modules(self):
@@ -418,6 +428,7 @@ class Orchestrator:
 		self.logger.info(f'shutdown complete: {graceful_count} graceful, {forced_count} forced')
 		self._running.clear()
 		self.registry.clear()
+		self.resources.clear()
 		
 		try:
 			self.client.close()
@@ -446,4 +457,5 @@ def start():
 		_shutdown()
 
 
-start()
\ No newline at end of file
+if __name__ == '__main__':
+	start()
\ No newline at end of file
@@ -51,6 +51,8 @@ def _as_str(p: Path) -> str:
 
 
 VOICE_MODEL_DIR = _r('models', 'voice_small')
+VOICE_COMMAND_MODEL_DIR = _r('models', 'voice_command')
+WAKE_TEMPLATES_FILE = _r('models', 'wake_templates.npz')
 ASSETS_AUDIO_DIR = _r('assets', 'audio')
 ASSETS_NOTES_DIR = _r('assets', 'notes')
 GLOBAL_DIR = _r('global')
@@ -60,6 +62,8 @@ CACHE_DIR = _r('cache')
 
 path_resolver = {
     'voice_model_path': _as_str(VOICE_MODEL_DIR),
+    'voice_command_model_path': _as_str(VOICE_COMMAND_MODEL_DIR),
+    'wake_templates_path': _as_str(WAKE_TEMPLATES_FILE),
     'audio_path': _as_str(ASSETS_AUDIO_DIR),
     'notes_path': _as_str(ASSETS_NOTES_DIR),
     'global_path': _as_str(GLOBAL_DIR),
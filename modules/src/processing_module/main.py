@@ -7,9 +7,11 @@ from store.ToolsStore import ToolsStore
 from store.RuntimeCacheStore import RuntimeCacheStore
 from utils.EnvHelper import getenv_float
 from utils.LogService import get_logger, log_crash, log_error, log_info
+from utils.ResourceRegistry import ResourceRegistry
+from utils.Tracer import Tracer
 from utils import CacheService
 
-def run(stop_event):
+def run(stop_event, resources: ResourceRegistry):
     logger = get_logger()
     module_name = "processing_module"
     
@@ -19,14 +21,15 @@ def run(stop_event):
         client = ModuleClient(
             service_name='processing_module',
             manifest_file='manifest.json',
-            subscribes=[EventsTopic.RAW_TEXT_DATA_RECOGNIZED.value],
+            subscribes=[EventsTopic.RAW_TEXT_DATA_RECOGNIZED.value, EventsTopic.RAW_TEXT_DATA_PARTIAL.value, EventsTopic.ACTION_WAKE.value],
             heartbeat_interval=5.0,
             max_reconnect_attempts=10,
             log_prefix='processing'
         )
 
         executor = Excecutor(
-            prediction_threshold=getenv_float('TEXT_CLASSIFICATION_PREDICTION_THRESHOLD', 0.85)
+            prediction_threshold=getenv_float('TEXT_CLASSIFICATION_PREDICTION_THRESHOLD', 0.85),
+            resources=resources
         )
 
         executor.set_socket_client(client)
@@ -93,6 +96,8 @@ def run(stop_event):
         if dialog_id:
             dialogs_cache = CacheService.getInstance().get_cache('dialogs_cache', {})
             
+            executor.services['ai_service'].forget_dialog(dialog_id) # type: ignore
+
             if dialogs_cache and dialog_id in dialogs_cache:
                 del dialogs_cache[dialog_id]
                 CacheService.getInstance().set_cache('dialogs_cache', dialogs_cache)
@@ -113,6 +118,12 @@ def run(stop_event):
         if stop_event.is_set():
             return
 
+        tracer = Tracer.getInstance()
+        if not msg.get('payload', {}).get('trace'):
+            # Текст из интерфейса: трасса начинается с получения
+            msg = {**msg, 'payload': {**msg.get('payload', {}), 'trace': Tracer.new_trace()}}
+        trace = msg['payload']['trace']
+
         for out in executor.run(msg):
 
             service = executor.services["ai_service"]
@@ -122,25 +133,16 @@ def run(stop_event):
                 'topic': out['event'] if out.get("event") else EventsTopic.ACTION_TRANSCRIPT.value,
                 'payload': out,
                 'from': 'processing_module'
-            })
+            }, final=True)
 
             if msg.get('payload', {}).get('dialog_id') is not None:
-                dialogs_cache = CacheService.getInstance().get_cache('dialogs_cache', {})
-                current_dialog_cache = dialogs_cache.get(msg.get('payload', {}).get('dialog_id'), {}) # type: ignore
-
-                current_dialog_cache['create_at'] = current_dialog_cache.get('create_at', datetime.now().isoformat())
-                current_dialog_cache['updated_at'] = datetime.now().isoformat()
-                current_dialog_cache['title'] = current_dialog_cache.get('title', None)
-
-                current_dialog_cache['messages'] = current_dialog_cache.get('messages', [])
-                current_dialog_cache['messages'].append({
-                    'user_prompt': msg.get('payload', {}).get('text'),
-                    'assistant_response': out,
-                    'timestamp': datetime.now().isoformat(),
-                    'model_name': executor.current_model_name or 'Неизвестная модель'
-                })
-                dialogs_cache[msg.get('payload', {}).get('dialog_id')] = current_dialog_cache # type: ignore
-                CacheService.getInstance().set_cache('dialogs_cache', dialogs_cache)
+                service.save_turn(
+                    msg.get('payload', {}).get('dialog_id'), # type: ignore
+                    msg.get('payload', {}).get('text'),
+                    out,
+                    executor.current_model_name,
+                    trace
+                )
 
             for side_effect in service.get_socket_messages_queue():
                 client.emit({
@@ -152,16 +154,43 @@ def run(stop_event):
 
             service.clear_socket_messages_queue()
 
+        # От имени ассистента (или получения текста) до сохранённого ответа
+        tracer.add_span('end_to_end', trace, trace['started_at'])
+
+    def handle_partial_text(msg):
+        if stop_event.is_set():
+            return
+
+        # Готовимся один раз на фразу; финальный текст всё равно придёт в RAW_TEXT_DATA_RECOGNIZED
+        if msg.get('payload', {}).get('seq') == 0:
+            try:
+                executor.prepare(msg)
+            except Exception as e:
+                log_error(f"Error preparing context from partial text: {e}", module_name, e)
+
+    def handle_context_settings_set(msg):
+        settings = msg.get('payload', {}).get('data', {}).get('settings', {}).get('current.ai.context')
+        if settings is not None:
+            executor.services['ai_service'].set_context_settings(settings) # type: ignore
+
+    def handle_wake(msg):
+        if stop_event.is_set():
+            return
+        executor.warm_up()
+
     def handle_model_change(msg):
         executor.get_current_model_data_from_json(msg.get('payload', {}).get('data', {}).get('settings', {}).get('current.ai.model.id'))
 
     client.on(EventsTopic.RAW_TEXT_DATA_RECOGNIZED.value, handle_raw_text)
+    client.on(EventsTopic.RAW_TEXT_DATA_PARTIAL.value, handle_partial_text)
+    client.on(EventsTopic.ACTION_WAKE.value, handle_wake)
     client.on(EventsTopic.HAVE_TO_BE_REFETCHED_SETTINGS_DATA.value, handle_model_change)
     client.on(EventsTopic.ACTION_TOOL_OFF.value, handle_tool_off)
     client.on(EventsTopic.ACTION_TOOL_ON.value, handle_tool_on)
     client.on(EventsTopic.ACTION_DIALOG_RENAMED.value, handle_dialog_renamed)
     client.on(EventsTopic.ACTION_DIALOG_DELETED.value, handle_dialog_deleted)
     client.on(EventsTopic.ACTION_DIALOG_CREATED.value, handle_dialog_created)
+    client.on(EventsTopic.ACTION_CONTEXT_SETTINGS_SET.value, handle_context_settings_set)
 
     client.start(stop_event, block=False)
 
@@ -226,4 +255,7 @@ ORC_STOP = globals().get('ORC_STOP')
 if ORC_STOP is None:
     import threading
     ORC_STOP = threading.Event()
-run(ORC_STOP)
+ORC_RESOURCES = globals().get('ORC_RESOURCES')
+if ORC_RESOURCES is None:
+    ORC_RESOURCES = ResourceRegistry()
+run(ORC_STOP, ORC_RESOURCES)
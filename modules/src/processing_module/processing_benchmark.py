@@ -0,0 +1,236 @@
+"""
+Нагрузочный прогон AIService.execute без сети через ReplayProvider.
+
+Запросы идут через весь путь обработки: сборка контекста, вызовы
+инструментов (по умолчанию - только служебный пакет бенчмарка, чтобы
+синтетические вызовы не трогали систему), склейка потока и отправка
+сообщений (считаются в том виде, в каком их отправляет ModuleClient),
+сохранение обмена в dialogs_cache и окно истории диалога (тот же
+AIService.save_turn, что и в модуле). Контекст диалога включён
+(--context-messages), dialogs_cache лежит во временном каталоге, заполненном
+синтетической историей, так что результат не зависит от settings.json
+и dialogs_cache пользователя и не меняет их. Источник - запись RecordingProvider
+(AI_PROVIDER_RECORD_PATH) или синтетический поток.
+
+С TRACE_ENABLED=true этапы запросов попадают в файл трасс и в сводку p50/p95.
+
+Запуск из каталога modules:
+    python -m src.processing_module.processing_benchmark --source "synthetic:tokens=300,rate=200,tools=2" \
+        --requests 50 --speed 0 --output processing_report.json
+    python -m src.processing_module.processing_benchmark --source recordings.jsonl --speed 10 --profile processing.prof
+"""
+import os
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import json
+import time
+import cProfile
+import argparse
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from interfaces import ITool
+from src.processing_module.facades import ToolBuilder
+from src.processing_module.providers.ai.ProviderFactory import ProviderFactory
+from src.processing_module.services.AIService import AIService
+from src.processing_module.services.DialogHistory import DialogHistory
+from utils.CacheService import CacheService
+from utils.Tracer import Tracer
+
+
+class BenchmarkTool(ITool):
+    """Служебный пакет: вызов ждёт tool_ms и возвращает payload_bytes данных"""
+
+    name = 'Benchmark Tools Pack'
+
+    tool_ms = 50.0
+    payload_bytes = 512
+
+    @staticmethod
+    def setup_benchmark_sleep_tool():
+        return {
+            "name": "benchmark_sleep_tool",
+            "handler": BenchmarkTool.benchmark_sleep_handler,
+            "tool": ToolBuilder()
+                .set_name("benchmark_sleep_tool")
+                .set_description("Benchmark tool that waits and returns a fixed payload")
+                .build()
+        }
+
+    @staticmethod
+    def benchmark_sleep_handler(**kwargs):
+        time.sleep(BenchmarkTool.tool_ms / 1000)
+        return {"success": True, "message": "x" * BenchmarkTool.payload_bytes}
+
+
+BenchmarkTool.commands = [
+    BenchmarkTool.setup_benchmark_sleep_tool(),
+]
+
+
+class CountingClient:
+    """Вместо ModuleClient: считает сообщения и байты по топикам"""
+
+    def __init__(self):
+        self.topics: Dict[str, Dict[str, int]] = {}
+
+    def emit(self, obj: Dict[str, Any]):
+        size = len(json.dumps(obj))
+        stats = self.topics.setdefault(obj.get('topic', ''), {'messages': 0, 'bytes': 0})
+        stats['messages'] += 1
+        stats['bytes'] += size
+
+
+def _seed_dialogs(dialogs: int, turns: int):
+    """dialogs_cache с `turns` обменами в каждом диалоге (пишется в текущий каталог кэша)"""
+    data = {
+        f"benchmark-{index}": {
+            'messages': [
+                {'user_prompt': f"Предыдущий запрос номер {turn}", 'assistant_response': f"Предыдущий ответ номер {turn}"}
+                for turn in range(turns)
+            ]
+        }
+        for index in range(dialogs)
+    }
+    CacheService.getInstance().set_cache('dialogs_cache', data)
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+
+def run_benchmark(source: str, requests: int, speed: float, dialogs: int, packs: List[str],
+                  tool_ms: float, payload_bytes: int, profile_path: Optional[str] = None,
+                  context_messages: int = 6) -> Dict[str, Any]:
+    BenchmarkTool.tool_ms = tool_ms
+    BenchmarkTool.payload_bytes = payload_bytes
+
+    service: AIService = AIService.getInstance()  # type: ignore
+    if BenchmarkTool not in service.tools_classes:
+        service.tools_classes.append(BenchmarkTool)
+        service.form_symlinks()
+    service.setup_tools({name: {'enabled': True} for name in [BenchmarkTool.name, *packs]})
+
+    client = CountingClient()
+    service.set_socket_client(client)
+
+    provider = ProviderFactory.get_provider('replay', '', source, reuse=False)
+    if provider is None:
+        raise ValueError(f"Cannot load replay source '{source}'")
+    provider.speed = speed  # type: ignore
+    service.provider = provider
+
+    # Кэш сервиса на время прогона смотрит во временный каталог: dialogs_cache пользователя не читается и не меняется
+    store = tempfile.TemporaryDirectory(prefix='processing_benchmark_')
+    cache = CacheService.getInstance()
+    cache.CACHE_BASE_DIR = store.name
+    _seed_dialogs(dialogs, context_messages)
+    saved_history, saved_settings = service.dialog_history, service._context_settings
+    service.dialog_history = DialogHistory.from_env(service._load_dialogs, service._extract_assistant_content)
+    service.set_context_settings({'enabled': context_messages > 0, 'max_messages': context_messages})
+    try:
+        return _run_requests(service, client, source, requests, speed, dialogs, packs, tool_ms, payload_bytes,
+                             profile_path, context_messages)
+    finally:
+        # Сервис - синглтон: после прогона у него остаются прежние история и настройки
+        service.dialog_history, service._context_settings = saved_history, saved_settings
+        service._prepared_context = None
+        del cache.CACHE_BASE_DIR
+        store.cleanup()
+
+
+def _run_requests(service: AIService, client: CountingClient, source: str, requests: int, speed: float, dialogs: int,
+                  packs: List[str], tool_ms: float, payload_bytes: int, profile_path: Optional[str],
+                  context_messages: int) -> Dict[str, Any]:
+    profiler = cProfile.Profile() if profile_path else None
+    latencies: List[float] = []
+    tool_calls = 0
+    start = time.perf_counter()
+    for index in range(requests):
+        dialog_id = f"benchmark-{index % dialogs}" if dialogs else None
+        text = f"Запрос номер {index}"
+
+        request_start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        trace = Tracer.new_trace()
+        result = service.execute(text, dialog_id, trace)
+        if dialog_id:
+            service.save_turn(dialog_id, text, result, service.provider.model if service.provider else None, trace)
+        if profiler:
+            profiler.disable()
+        latencies.append(time.perf_counter() - request_start)
+
+        tool_calls += len(result.get('tools_calling_stage', []))
+        service.clear_socket_messages_queue()
+    wall = time.perf_counter() - start
+
+    if profiler and profile_path:
+        profiler.dump_stats(profile_path)
+
+    return {
+        'config': {
+            'source': source,
+            'requests': requests,
+            'speed': speed,
+            'dialogs': dialogs,
+            'context_messages': context_messages,
+            'packs': [BenchmarkTool.name, *packs],
+            'tool_ms': tool_ms,
+            'payload_bytes': payload_bytes
+        },
+        'wall_seconds': round(wall, 3),
+        'requests_per_second': round(requests / wall, 2) if wall else None,
+        'latency': {
+            'mean': round(sum(latencies) / len(latencies), 4) if latencies else None,
+            'p50': _percentile(latencies, 0.5),
+            'p95': _percentile(latencies, 0.95),
+            'max': round(max(latencies), 4) if latencies else None
+        },
+        'tool_calls': tool_calls,
+        'emitted': client.topics,
+        'service': service.get_stats(),
+        # Спаны пишутся только при TRACE_ENABLED=true
+        'stages': Tracer.getInstance().get_summary()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIService load benchmark on recorded or synthetic provider streams")
+    parser.add_argument('--source', default='synthetic:tokens=200,rate=100,thinking=50,tools=2', help="Recording file or synthetic:... spec")
+    parser.add_argument('--requests', type=int, default=20, help="Requests to execute")
+    parser.add_argument('--speed', type=float, default=0.0, help="Replay speed-up (1 - real time, 0 - no delays)")
+    parser.add_argument('--dialogs', type=int, default=4, help="Spread requests over this many dialogs (0 - no dialog context)")
+    parser.add_argument('--context-messages', type=int, default=6, help="Dialog context window in turns; dialogs are pre-filled with this many turns (0 - context off)")
+    parser.add_argument('--packs', default='', help="Comma-separated extra tool packs to enable (real tools are executed!)")
+    parser.add_argument('--tool-ms', type=float, default=50.0, help="Benchmark tool execution time")
+    parser.add_argument('--payload-bytes', type=int, default=512, help="Benchmark tool response size")
+    parser.add_argument('--profile', default=None, help="Write cProfile stats of the request path to file")
+    parser.add_argument('--output', default=None, help="Write JSON report to file instead of stdout")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.source,
+        args.requests,
+        args.speed,
+        args.dialogs,
+        [p.strip() for p in args.packs.split(',') if p.strip()],
+        args.tool_ms,
+        args.payload_bytes,
+        args.profile,
+        args.context_messages
+    )
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    else:
+        print(data)
+
+
+if __name__ == '__main__':
+    main()
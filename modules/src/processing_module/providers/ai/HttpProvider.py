@@ -0,0 +1,186 @@
+import time
+import threading
+from abc import abstractmethod
+from typing import Any, Dict, Optional
+import httpx
+from interfaces import IProvider
+from utils.EnvHelper import getenv_int, getenv_float
+
+
+class ConnectionMetrics:
+    """
+    Время установки соединений провайдера отдельно от задержки модели.
+
+    На каждый запрос httpx вешается трассировка httpcore: если до отправки
+    заголовков прошли события connect_tcp / start_tls, соединение новое и
+    их длительность - время установки; если нет, соединение взято из пула.
+    Задержка модели - время до первого куска ответа минус установка
+    соединения этого запроса. Прогревочные запросы (extensions['warmup'])
+    считаются отдельно и в счётчики запросов не попадают.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.connect_seconds = 0.0
+        self.warmup_new_connections = 0
+        self.warmup_connect_seconds = 0.0
+        self.first_tokens = 0
+        self.first_token_seconds = 0.0
+        self.model_latency_seconds = 0.0
+        self.last: Dict[str, Optional[float]] = {'connect': None, 'first_token': None, 'model_latency': None}
+
+    def on_request(self, request: httpx.Request):
+        """Хук httpx: трассировка соединения для одного запроса"""
+        state: Dict[str, Any] = {'started': None, 'connect': 0.0}
+        warmup = bool(request.extensions.get('warmup'))
+        if not warmup:
+            self._local.connect = 0.0
+
+        def trace(event: str, info: Dict[str, Any]):
+            if event in ('connection.connect_tcp.started', 'connection.start_tls.started'):
+                state['started'] = time.perf_counter()
+            elif event in ('connection.connect_tcp.complete', 'connection.start_tls.complete') and state['started'] is not None:
+                state['connect'] += time.perf_counter() - state['started']
+                state['started'] = None
+            elif event.endswith('send_request_headers.started'):
+                if warmup:
+                    self._record_warmup_connection(state['connect'])
+                else:
+                    self._local.connect = state['connect']
+                    self._record_connection(state['connect'])
+
+        request.extensions['trace'] = trace
+
+    def _record_connection(self, connect: float):
+        with self._lock:
+            self.requests += 1
+            if connect:
+                self.new_connections += 1
+                self.connect_seconds += connect
+            else:
+                self.reused_connections += 1
+            self.last['connect'] = connect
+
+    def _record_warmup_connection(self, connect: float):
+        if not connect:
+            return
+        with self._lock:
+            self.warmup_new_connections += 1
+            self.warmup_connect_seconds += connect
+
+    def record_first_token(self, seconds: float):
+        """Время до первого куска ответа, замеренное в потоке, который делал запрос"""
+        connect = getattr(self._local, 'connect', 0.0)
+        with self._lock:
+            self.first_tokens += 1
+            self.first_token_seconds += seconds
+            self.model_latency_seconds += max(0.0, seconds - connect)
+            self.last['first_token'] = seconds
+            self.last['model_latency'] = max(0.0, seconds - connect)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': self.reused_connections,
+                'mean_connect_time': round(self.connect_seconds / self.new_connections, 4) if self.new_connections else None,
+                'warmup_new_connections': self.warmup_new_connections,
+                'mean_warmup_connect_time': round(self.warmup_connect_seconds / self.warmup_new_connections, 4) if self.warmup_new_connections else None,
+                'mean_first_token_time': round(self.first_token_seconds / self.first_tokens, 4) if self.first_tokens else None,
+                'mean_model_latency': round(self.model_latency_seconds / self.first_tokens, 4) if self.first_tokens else None,
+                'last': {k: round(v, 4) if v is not None else None for k, v in self.last.items()}
+            }
+
+
+class HttpProvider(IProvider):
+    """
+    Провайдер поверх httpx с постоянным пулом соединений.
+
+    Клиент SDK собирается один раз на экземпляр и ходит через общий
+    httpx-пул с keep-alive (AI_PROVIDER_KEEPALIVE_SECONDS), так что
+    повторные запросы и прогрев переиспользуют открытое TLS-соединение.
+    Наследник задаёт DEFAULT_BASE_URL и собирает клиент в _create_client().
+    """
+
+    DEFAULT_BASE_URL: str = ''
+
+    def __init__(self, api_key: str, model: str, base_url: Optional[str] = None):
+        self.base_url = base_url or self.DEFAULT_BASE_URL
+        self.metrics = ConnectionMetrics()
+        self.warmups = 0
+        self.warmup_seconds = 0.0
+        super().__init__(api_key, model)
+
+    def _http_options(self) -> Dict[str, Any]:
+        """Параметры httpx.Client: пул с keep-alive и хук метрик соединений"""
+        return {
+            'limits': httpx.Limits(
+                max_connections=getenv_int("AI_PROVIDER_MAX_CONNECTIONS", 4),
+                max_keepalive_connections=getenv_int("AI_PROVIDER_MAX_CONNECTIONS", 4),
+                keepalive_expiry=getenv_float("AI_PROVIDER_KEEPALIVE_SECONDS", 120.0)
+            ),
+            'event_hooks': {'request': [self.metrics.on_request]}
+        }
+
+    @abstractmethod
+    def _create_client(self) -> Any:
+        pass
+
+    @abstractmethod
+    def _http_client(self) -> Optional[httpx.Client]:
+        """httpx-клиент, через который ходит клиент SDK"""
+        pass
+
+    def _setup_client(self) -> None:
+        try:
+            self.client = self._create_client()
+        except Exception as e:
+            print(f"Failed to setup {self.__class__.__name__} client: {e}")
+            self.client = None
+
+    def warm_up(self) -> Optional[float]:
+        http = self._http_client()
+        if http is None:
+            return None
+        start = time.perf_counter()
+        try:
+            # Ответ не важен: нужно только открытое соединение в пуле
+            http.head(
+                self.base_url,
+                timeout=getenv_float("AI_PROVIDER_WARMUP_TIMEOUT_SECONDS", 5.0),
+                extensions={'warmup': True}
+            )
+        except Exception as e:
+            print(f"[{self.__class__.__name__}] Warm-up failed: {e}")
+            return None
+        elapsed = time.perf_counter() - start
+        self.warmups += 1
+        self.warmup_seconds += elapsed
+        return elapsed
+
+    def record_first_token(self, seconds: float):
+        self.metrics.record_first_token(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'provider': self.provider_name,
+            'model': self.model,
+            'base_url': self.base_url,
+            'warmups': self.warmups,
+            'mean_warmup_time': round(self.warmup_seconds / self.warmups, 4) if self.warmups else None,
+            **self.metrics.get_stats()
+        }
+
+    def close(self):
+        http = self._http_client()
+        if http is not None:
+            try:
+                http.close()
+            except Exception as e:
+                print(f"[{self.__class__.__name__}] Failed to close HTTP client: {e}")
@@ -1,19 +1,23 @@
 from typing import Any, Dict, List, Generator, Optional
+import httpx
 from ollama import Client
-from interfaces import IProvider
+from .HttpProvider import HttpProvider
 
 
-class OllamaProvider(IProvider):
-    
-    def _setup_client(self) -> None:
-        try:
-            self.client = Client(
-                host="https://ollama.com",
-                headers={'Authorization': self.api_key} if self.api_key else {}
-            )
-        except Exception as e:
-            print(f"Failed to setup Ollama client: {e}")
-            self.client = None
+class OllamaProvider(HttpProvider):
+
+    DEFAULT_BASE_URL = "https://ollama.com"
+
+    def _create_client(self) -> Client:
+        # Лишние параметры ollama передаёт в httpx.Client
+        return Client(
+            host=self.base_url,
+            headers={'Authorization': self.api_key} if self.api_key else {},
+            **self._http_options()
+        )
+
+    def _http_client(self) -> Optional[httpx.Client]:
+        return getattr(self.client, '_client', None)
     
     def chat_stream(self, messages: List[Dict[str, str]], tools: List[Any]) -> Generator[Any, None, None]:
         if not self.client:
@@ -1,16 +1,19 @@
 from typing import Any, Dict, List, Generator, Optional
+import httpx
 from openai import OpenAI
-from interfaces import IProvider
+from .HttpProvider import HttpProvider
 
 
-class OpenAIProvider(IProvider):
+class OpenAIProvider(HttpProvider):
 
-    def _setup_client(self) -> None:
-        try:
-            self.client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=self.api_key)
-        except Exception as e:
-            print(f"Failed to setup OpenAI client: {e}")
-            self.client = None
+    DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+
+    def _create_client(self) -> OpenAI:
+        self._http = httpx.Client(**self._http_options())
+        return OpenAI(base_url=self.base_url, api_key=self.api_key, http_client=self._http)
+
+    def _http_client(self) -> Optional[httpx.Client]:
+        return getattr(self, '_http', None)
     
     def chat_stream(self, messages: List[Dict[str, str]], tools: List[Any]) -> Generator[Any, None, None]:
         if not self.client:
@@ -1,7 +1,13 @@
-from typing import Dict, Type, Optional, List
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Type, Optional, List, Tuple
 from interfaces import IProvider
+from utils.EnvHelper import getenv, getenv_int
+from .HttpProvider import HttpProvider
 from .OllamaProvider import OllamaProvider
 from .OpenAIProvider import OpenAIProvider
+from .ReplayProvider import ReplayProvider
+from .RecordingProvider import RecordingProvider
 
 
 class ProviderFactory:
@@ -10,31 +16,114 @@ class ProviderFactory:
         'ollama': OllamaProvider,
         'router': OpenAIProvider
     }
-    
+
+    # Собранные провайдеры по (провайдер, ключ, модель, base URL): при переключении
+    # между моделями клиент и его пул соединений не собираются заново
+    _instances: "OrderedDict[Tuple[str, str, str, str], IProvider]" = OrderedDict()
+    _instances_lock = threading.Lock()
+    _hits = 0
+    _misses = 0
+    _evictions = 0
+
     @classmethod
     def register_provider(cls, name: str, provider_class: Type[IProvider]) -> None:
         cls._providers[name] = provider_class
-    
+
+    @classmethod
+    def get_base_url(cls, name: str) -> str:
+        """Адрес провайдера: AI_<NAME>_BASE_URL из настроек или адрес класса по умолчанию"""
+        provider_class = cls._providers.get(name)
+        default = provider_class.DEFAULT_BASE_URL if provider_class and issubclass(provider_class, HttpProvider) else ''
+        return getenv(f"AI_{name.upper()}_BASE_URL", "") or default
+
     @classmethod
-    def get_provider(cls, name: str, api_key: str, model: str) -> Optional[IProvider]:
+    def get_provider(cls, name: str, api_key: str, model: str, reuse: bool = True) -> Optional[IProvider]:
+        """
+        Args:
+            name (str): Имя зарегистрированного провайдера
+            api_key (str): Ключ API
+            model (str): Модель
+            reuse (bool): Взять готовый экземпляр из кэша, если он есть
+        """
         provider_class = cls._providers.get(name)
         if not provider_class:
             raise ValueError(f"Provider '{name}' is not supported. Available: {list(cls._providers.keys())}")
-        
+
+        base_url = cls.get_base_url(name)
+        key = (name, api_key, model, base_url)
+        if reuse:
+            with cls._instances_lock:
+                provider = cls._instances.get(key)
+                if provider is not None:
+                    cls._instances.move_to_end(key)
+                    cls._hits += 1
+                    return provider
+
         try:
-            provider = provider_class(api_key, model)
+            if issubclass(provider_class, HttpProvider):
+                provider = provider_class(api_key, model, base_url=base_url)
+            else:
+                provider = provider_class(api_key, model)
             if not provider.is_available():
                 print(f"Provider '{name}' is not available or not properly configured")
                 return None
-            return provider
         except Exception as e:
             print(f"Failed to create provider '{name}': {e}")
             return None
-    
+
+        record_path = getenv("AI_PROVIDER_RECORD_PATH", "")
+        if record_path and not isinstance(provider, ReplayProvider):
+            provider = RecordingProvider(provider, record_path)
+
+        if reuse:
+            cls._store(key, provider)
+        return provider
+
+    @classmethod
+    def _store(cls, key: Tuple[str, str, str, str], provider: IProvider) -> None:
+        evicted: List[IProvider] = []
+        with cls._instances_lock:
+            cls._misses += 1
+            previous = cls._instances.pop(key, None)
+            if previous is not None and previous is not provider:
+                evicted.append(previous)
+            cls._instances[key] = provider
+            max_instances = max(1, getenv_int("AI_PROVIDER_CACHE_SIZE", 4))
+            while len(cls._instances) > max_instances:
+                _, old = cls._instances.popitem(last=False)
+                evicted.append(old)
+                cls._evictions += 1
+        for old in evicted:
+            old.close()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._instances_lock:
+            providers = list(cls._instances.values())
+            cls._instances.clear()
+        for provider in providers:
+            provider.close()
+
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, Any]:
+        with cls._instances_lock:
+            return {
+                'size': len(cls._instances),
+                'hits': cls._hits,
+                'misses': cls._misses,
+                'evictions': cls._evictions,
+                # Ключ API в статистику не попадает
+                'entries': [{'provider': name, 'model': model, 'base_url': base_url} for name, _, model, base_url in cls._instances]
+            }
+
     @classmethod
     def get_available_providers(cls) -> List[str]:
         return list(cls._providers.keys())
-    
+
     @classmethod
     def is_provider_supported(cls, name: str) -> bool:
         return name in cls._providers
+
+
+# Провайдер без сети: воспроизведение записей и синтетические потоки для бенчмарков
+ProviderFactory.register_provider('replay', ReplayProvider)
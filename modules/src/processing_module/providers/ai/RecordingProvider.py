@@ -0,0 +1,107 @@
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Generator, Optional
+from interfaces import IProvider
+
+
+class RecordingProvider(IProvider):
+    """
+    Обёртка над провайдером, записывающая потоки ответа для ReplayProvider.
+
+    Каждый вызов chat_stream дописывает в файл строку JSON с кусками
+    {'dt', 'thinking', 'content', 'tool_calls'}; dt - сколько поток ждал
+    кусок от провайдера (у первого - время до первого куска), время
+    обработки кусков в AIService в него не входит. Запись включается
+    через AI_PROVIDER_RECORD_PATH.
+    """
+
+    def __init__(self, provider: IProvider, path: str):
+        """
+        Args:
+            provider (IProvider): Записываемый провайдер
+            path (str): Файл записи (дописывается)
+        """
+        self.provider = provider
+        self.path = path
+        self._lock = threading.Lock()
+        self.recorded_streams = 0
+        super().__init__(provider.api_key, provider.model)
+
+    def _setup_client(self) -> None:
+        self.client = self.provider.client
+
+    @property
+    def provider_name(self) -> str:
+        return self.provider.provider_name
+
+    def is_available(self) -> bool:
+        return self.provider.is_available()
+
+    def _chunk(self, part: Any, dt: float) -> Dict[str, Any]:
+        chunk: Dict[str, Any] = {'dt': round(dt, 4)}
+        thinking = self.provider.extract_thinking(part)
+        if thinking:
+            chunk['thinking'] = thinking
+        content = self.provider.extract_content(part)
+        if content:
+            chunk['content'] = content
+        tool_calls = self.provider.extract_tool_calls(part)
+        if tool_calls:
+            chunk['tool_calls'] = tool_calls
+        return chunk
+
+    def chat_stream(self, messages: List[Dict[str, str]], tools: List[Any]) -> Generator[Any, None, None]:
+        chunks: List[Dict[str, Any]] = []
+        stream = iter(self.provider.chat_stream(messages, tools))
+        try:
+            while True:
+                wait_start = time.perf_counter()
+                try:
+                    part = next(stream)
+                except StopIteration:
+                    break
+                chunks.append(self._chunk(part, time.perf_counter() - wait_start))
+                yield part
+        finally:
+            self._write(messages, chunks)
+
+    def _write(self, messages: List[Dict[str, str]], chunks: List[Dict[str, Any]]):
+        record = {
+            'provider': self.provider.provider_name,
+            'model': self.provider.model,
+            'recorded_at': datetime.now().isoformat(),
+            'messages': len(messages),
+            'chunks': chunks
+        }
+        try:
+            with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                self.recorded_streams += 1
+        except Exception as e:
+            print(f"[RecordingProvider] Failed to write recording: {e}")
+
+    def extract_thinking(self, part: Any) -> Optional[str]:
+        return self.provider.extract_thinking(part)
+
+    def extract_content(self, part: Any) -> Optional[str]:
+        return self.provider.extract_content(part)
+
+    def extract_tool_calls(self, part: Any) -> List[Dict[str, Any]]:
+        return self.provider.extract_tool_calls(part)
+
+    def warm_up(self) -> Optional[float]:
+        return self.provider.warm_up()
+
+    def record_first_token(self, seconds: float) -> None:
+        self.provider.record_first_token(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.provider.get_stats(),
+            'recording': {'path': self.path, 'streams': self.recorded_streams}
+        }
+
+    def close(self) -> None:
+        self.provider.close()
@@ -0,0 +1,167 @@
+import json
+import time
+import random
+import threading
+from typing import Any, Dict, List, Generator, Optional
+from interfaces import IProvider
+from utils.EnvHelper import getenv_float
+
+
+WORDS = [
+    'пользователь', 'хочет', 'узнать', 'что', 'сейчас', 'запущено', 'нужно', 'вызвать',
+    'инструмент', 'система', 'ответ', 'список', 'готово', 'и', 'в', 'на', 'это'
+]
+
+
+class ReplayProvider(IProvider):
+    """
+    Провайдер без сети: воспроизводит записанные потоки или генерирует синтетические.
+
+    Модель - источник потоков:
+        - путь к файлу записи RecordingProvider (JSONL, поток на строку); потоки
+          отдаются по очереди и по кругу, так что повтор тех же запросов
+          проходит тот же путь с инструментами;
+        - "synthetic:tokens=N,rate=M,tools=K,..." - поток из N токенов ответа
+          со скоростью M токенов/с; если K > 0, первая итерация запроса
+          вызывает K инструментов, а ответ приходит после их результатов.
+
+    Задержки между кусками делятся на speed (AI_REPLAY_SPEED): 1 - как в
+    записи, 10 - в десять раз быстрее, 0 - без задержек. Куски - словари
+    {'dt', 'thinking', 'content', 'tool_calls'}.
+    """
+
+    SYNTHETIC_PREFIX = 'synthetic:'
+
+    SYNTHETIC_DEFAULTS: Dict[str, Any] = {
+        'tokens': 200,          # токенов ответа
+        'rate': 50.0,           # токенов в секунду
+        'thinking': 0,          # токенов рассуждения перед ответом или вызовами
+        'tools': 0,             # вызовов инструментов в первой итерации
+        'tool_names': '',       # какие инструменты вызывать, через '|' (пусто - без обязательных аргументов из переданных)
+        'first_token_ms': 0.0,  # задержка до первого куска
+        'seed': 0
+    }
+
+    def __init__(self, api_key: str, model: str, speed: Optional[float] = None):
+        """
+        Args:
+            api_key (str): Не используется
+            model (str): Путь к записи или спецификация "synthetic:..."
+            speed (Optional[float]): Ускорение воспроизведения (по умолчанию AI_REPLAY_SPEED)
+        """
+        self.speed = getenv_float("AI_REPLAY_SPEED", 1.0) if speed is None else speed
+        self._lock = threading.Lock()
+        self._streams: List[Dict[str, Any]] = []
+        self._synthetic: Optional[Dict[str, Any]] = None
+        self._cursor = 0
+
+        self.streams_served = 0
+        self.chunks_served = 0
+        self.first_tokens = 0
+        self.first_token_seconds = 0.0
+        super().__init__(api_key, model)
+
+    def _setup_client(self) -> None:
+        try:
+            if self.model.startswith(self.SYNTHETIC_PREFIX):
+                self._synthetic = self.parse_synthetic(self.model[len(self.SYNTHETIC_PREFIX):])
+            else:
+                with open(self.model, 'r', encoding='utf-8') as f:
+                    self._streams = [json.loads(line) for line in f if line.strip()]
+                if not self._streams:
+                    raise ValueError(f"No recorded streams in '{self.model}'")
+            self.client = self
+        except Exception as e:
+            print(f"Failed to setup replay source: {e}")
+            self.client = None
+
+    @classmethod
+    def parse_synthetic(cls, spec: str) -> Dict[str, Any]:
+        options = dict(cls.SYNTHETIC_DEFAULTS)
+        for pair in filter(None, (p.strip() for p in spec.split(','))):
+            key, _, value = pair.partition('=')
+            if key not in options:
+                raise ValueError(f"Unknown synthetic option '{key}'. Available: {list(options.keys())}")
+            default = cls.SYNTHETIC_DEFAULTS[key]
+            options[key] = type(default)(value) if not isinstance(default, str) else value
+        return options
+
+    def is_available(self) -> bool:
+        return self.client is not None
+
+    def _next_stream(self, messages: List[Dict[str, str]], tools: List[Any]) -> List[Dict[str, Any]]:
+        if self._synthetic is not None:
+            return self.synthetic_chunks(messages, tools, self._synthetic)
+        with self._lock:
+            stream = self._streams[self._cursor % len(self._streams)]
+            self._cursor += 1
+        return stream.get('chunks', [])
+
+    @classmethod
+    def synthetic_chunks(cls, messages: List[Dict[str, str]], tools: List[Any], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+        rng = random.Random(options['seed'])
+        interval = 1 / options['rate'] if options['rate'] > 0 else 0.0
+        # Результаты инструментов AIService дописывает как "Tool <name> executed: ..."
+        has_tool_results = any(
+            m.get('role') == 'assistant' and str(m.get('content', '')).startswith('Tool ')
+            for m in messages
+        )
+        call_tools = options['tools'] > 0 and not has_tool_results
+
+        chunks: List[Dict[str, Any]] = []
+        if not has_tool_results:
+            chunks += [{'dt': interval, 'thinking': rng.choice(WORDS) + ' '} for _ in range(options['thinking'])]
+
+        if call_tools:
+            names = [n for n in options['tool_names'].split('|') if n] or [
+                t['function']['name'] for t in tools
+                if isinstance(t, dict) and not t.get('function', {}).get('required')
+            ]
+            for index in range(options['tools'] if names else 0):
+                chunks.append({'dt': interval, 'tool_calls': [{'name': names[index % len(names)], 'args': {}}]})
+        else:
+            chunks += [{'dt': interval, 'content': rng.choice(WORDS) + ' '} for _ in range(options['tokens'])]
+
+        if chunks:
+            chunks[0]['dt'] = options['first_token_ms'] / 1000
+        return chunks
+
+    def chat_stream(self, messages: List[Dict[str, str]], tools: List[Any]) -> Generator[Any, None, None]:
+        if not self.client:
+            raise ValueError("Replay source is not loaded")
+
+        chunks = self._next_stream(messages, tools)
+        with self._lock:
+            self.streams_served += 1
+        for chunk in chunks:
+            if self.speed > 0 and chunk.get('dt'):
+                time.sleep(chunk['dt'] / self.speed)
+            with self._lock:
+                self.chunks_served += 1
+            yield chunk
+
+    def extract_thinking(self, part: Any) -> Optional[str]:
+        return part.get('thinking') if isinstance(part, dict) else None
+
+    def extract_content(self, part: Any) -> Optional[str]:
+        return part.get('content') if isinstance(part, dict) else None
+
+    def extract_tool_calls(self, part: Any) -> List[Dict[str, Any]]:
+        return list(part.get('tool_calls') or []) if isinstance(part, dict) else []
+
+    def record_first_token(self, seconds: float) -> None:
+        with self._lock:
+            self.first_tokens += 1
+            self.first_token_seconds += seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'provider': self.provider_name,
+                'source': 'synthetic' if self._synthetic is not None else self.model,
+                'recorded_streams': len(self._streams),
+                'speed': self.speed,
+                'streams_served': self.streams_served,
+                'chunks_served': self.chunks_served,
+                'mean_first_token_time': round(self.first_token_seconds / self.first_tokens, 4) if self.first_tokens else None
+            }
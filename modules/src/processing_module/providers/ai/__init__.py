@@ -1,7 +1,14 @@
+from .HttpProvider import HttpProvider, ConnectionMetrics
 from .OllamaProvider import OllamaProvider
 from .OpenAIProvider import OpenAIProvider
+from .ReplayProvider import ReplayProvider
+from .RecordingProvider import RecordingProvider
 
 __all__ = [
+    "HttpProvider",
+    "ConnectionMetrics",
     "OllamaProvider",
-    "OpenAIProvider"
+    "OpenAIProvider",
+    "ReplayProvider",
+    "RecordingProvider"
 ]
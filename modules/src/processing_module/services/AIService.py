@@ -1,14 +1,23 @@
 import os
 import time
 import json
-from typing import Optional, List, Dict, Any
+import uuid
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from typing import Optional, List, Dict, Any, Set, Tuple
 from interfaces import IService, IProvider
 from src.processing_module.tools import FileSystemTool, ModuleManagementTool, NetworkTool, SystemManagementTool, \
 DockerTool, ToolManagementTool, GitHubTool, UserInfoTool, WebTool
 from enums.Events import EventsType, EventsTopic
 from src.processing_module.providers.ai.ProviderFactory import ProviderFactory
-from utils.EnvHelper import getenv
+from src.processing_module.services.ToolResultCache import ToolResultCache
+from src.processing_module.services.DialogHistory import DialogHistory
+from src.processing_module.services.StreamCoalescer import StreamCoalescer
+from utils.EnvHelper import getenv, getenv_int, getenv_float, getenv_bool
 from utils.CacheService import CacheService
+from utils.ResourceRegistry import ResourceRegistry
+from utils.Tracer import Tracer
 from paths import path_resolver
 
 header = f'''You are a voice assistant named {getenv('ASSISTANT_NAME', 'Assistant')}.
@@ -28,12 +37,31 @@ Do NOT truncate, summarize, or cut off lists or data. If a tool returns a list o
 
 class AIService(IService):
     SERVICE_NAME = "AIService"
+    MODULE_ID = "processing_module"
 
     def __init__(self):
         self.provider: Optional[IProvider] = None
+        self.resources = ResourceRegistry()
         self._socket_client = None
         self._socket_messages_queue: List[Dict[str, Any]] = []
 
+        self._prepared_context: Optional[Dict[str, Any]] = None
+        self._context_settings: Optional[Dict[str, Any]] = None
+        self.dialog_history = DialogHistory.from_env(self._load_dialogs, self._extract_assistant_content)
+        self.context_prefetch_hits = 0
+        self.context_prefetch_misses = 0
+
+        self.tool_workers = getenv_int("AI_TOOL_WORKERS", 4)
+        self.tool_timeout = getenv_float("AI_TOOL_TIMEOUT_SECONDS", 30.0)
+        self._tool_executor: Optional[ThreadPoolExecutor] = None
+        self.tool_executor_replacements = 0
+        self.tool_cache = ToolResultCache(max_entries=getenv_int("AI_TOOL_CACHE_MAX_ENTRIES", 256))
+        self.tool_cache_enabled = getenv_bool("AI_TOOL_CACHE_ENABLED", True)
+
+        self.tracer = Tracer.getInstance()
+        self.warmup_enabled = getenv_bool("AI_PROVIDER_WARMUP_ENABLED", True)
+        self._warmup_thread: Optional[threading.Thread] = None
+
         self.tools_classes = [
             FileSystemTool,
             ModuleManagementTool,
@@ -50,6 +78,9 @@ class AIService(IService):
         self.tools = []
         self.tool_aliases = {}
         self.tools_representation = {}
+        self.tool_side_effects: Set[str] = set()
+        self.tool_cache_ttls: Dict[str, float] = {}
+        self.tool_invalidates: Dict[str, List[str]] = {}
 
         self.form_symlinks()
     
@@ -66,6 +97,9 @@ class AIService(IService):
     def set_socket_client(self, socket_client):
         self._socket_client = socket_client
 
+    def set_resources(self, resources: ResourceRegistry):
+        self.resources = resources
+
     def form_symlinks(self):
         for tool in self.tools_classes:
             self.symlinks[tool.name] = tool
@@ -84,59 +118,89 @@ class AIService(IService):
                     "name": tool_el['name'],
                 })
 
+            self.tool_side_effects.update(tool.side_effects)
+            self.tool_cache_ttls.update(tool.cache_ttls)
+            self.tool_invalidates.update(tool.invalidates)
+
     def get_tools(self):
         return self.tools_representation
 
     def get_context_settings(self) -> Dict[str, Any]:
-        try:
-            with open(f"{path_resolver['global_path']}/settings.json", 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get("current.ai.context", {})
-        except Exception as e:
-            print(f"[AIService] Ошибка при чтении настроек контекста: {e}")
-            return {"enabled": False, "max_messages": 6}
+        """Настройки контекста читаются из settings.json один раз, дальше приходят событием"""
+        if self._context_settings is None:
+            try:
+                with open(f"{path_resolver['global_path']}/settings.json", 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    self.set_context_settings(data.get("current.ai.context", {}))
+            except Exception as e:
+                # Умолчания кэшируются как и прочитанные настройки: файл не перечитывается на каждом запросе
+                print(f"[AIService] Ошибка при чтении настроек контекста: {e}")
+                self.set_context_settings({"enabled": False, "max_messages": 6})
+        return self._context_settings  # type: ignore
+
+    def set_context_settings(self, settings: Dict[str, Any]):
+        self._context_settings = settings
+        # Блок, собранный по промежуточному тексту, мог быть собран со старыми настройками
+        self._prepared_context = None
+        self.dialog_history.configure(
+            max_tokens=settings.get("max_tokens"),
+            max_turns=settings.get("max_messages", 6)
+        )
+
+    def _load_dialogs(self) -> Dict[str, Any]:
+        return CacheService.getInstance().get_cache('dialogs_cache', {}) or {}
 
-    def get_dialog_history(self, dialog_id: str, max_messages: int) -> List[Dict[str, str]]:
+    def get_dialog_history(self, dialog_id: str) -> List[Dict[str, str]]:
         """
-        Извлекает последние N сообщений из истории диалога.
+        Последние сообщения диалога в пределах окна истории.
         Возвращает список словарей с ролями 'user' и 'assistant'.
         """
         try:
-            cache_service = CacheService.getInstance()
-            dialogs_cache = cache_service.get_cache('dialogs_cache', {})
-            
-            if not dialogs_cache or dialog_id not in dialogs_cache:
-                return []
-            
-            dialog = dialogs_cache[dialog_id]
-            messages = dialog.get('messages', [])
-            
-            # Берем последние max_messages сообщений
-            recent_messages = messages[-max_messages:] if len(messages) > max_messages else messages
-            
-            history = []
-            for msg in recent_messages:
-                # Добавляем запрос пользователя
-                if msg.get('user_prompt'):
-                    history.append({
-                        "role": "user",
-                        "content": msg['user_prompt']
-                    })
-                
-                # Добавляем ответ ассистента (только финальный content без reasoning)
-                if msg.get('assistant_response'):
-                    content = self._extract_assistant_content(msg['assistant_response'])
-                    if content:
-                        history.append({
-                            "role": "assistant",
-                            "content": content
-                        })
-            
-            return history
-            
+            return self.dialog_history.get_history(dialog_id)
         except Exception as e:
             print(f"[AIService] Error loading dialog history: {e}")
             return []
+
+    def record_turn(self, dialog_id: str, user_prompt: Optional[str], assistant_response: Any):
+        """Добавляет завершённый обмен в окно истории диалога"""
+        self.dialog_history.append(dialog_id, user_prompt, assistant_response)
+
+    def save_turn(self, dialog_id: str, user_prompt: Optional[str], assistant_response: Any,
+                  model_name: Optional[str] = None, trace: Optional[Dict[str, Any]] = None):
+        """
+        Сохраняет обмен в dialogs_cache (файл переписывается целиком) и добавляет его в окно истории.
+
+        Args:
+            dialog_id (str): Диалог
+            user_prompt (Optional[str]): Запрос пользователя
+            assistant_response (Any): Ответ execute()
+            model_name (Optional[str]): Модель, давшая ответ
+            trace (Optional[Dict[str, Any]]): Трасса запроса для спана persistence
+        """
+        persistence_start = time.time()
+        dialogs_cache = CacheService.getInstance().get_cache('dialogs_cache', {}) or {}
+        current_dialog_cache = dialogs_cache.get(dialog_id, {})
+
+        current_dialog_cache['create_at'] = current_dialog_cache.get('create_at', datetime.now().isoformat())
+        current_dialog_cache['updated_at'] = datetime.now().isoformat()
+        current_dialog_cache['title'] = current_dialog_cache.get('title', None)
+
+        current_dialog_cache['messages'] = current_dialog_cache.get('messages', [])
+        current_dialog_cache['messages'].append({
+            'user_prompt': user_prompt,
+            'assistant_response': assistant_response,
+            'timestamp': datetime.now().isoformat(),
+            'model_name': model_name or 'Неизвестная модель'
+        })
+        dialogs_cache[dialog_id] = current_dialog_cache
+        CacheService.getInstance().set_cache('dialogs_cache', dialogs_cache)
+        self.record_turn(dialog_id, user_prompt, assistant_response)
+        self.tracer.add_span('persistence', trace, persistence_start)
+
+    def forget_dialog(self, dialog_id: str):
+        self.dialog_history.forget(dialog_id)
+        if self._prepared_context is not None and self._prepared_context['dialog_id'] == dialog_id:
+            self._prepared_context = None
     
     def _extract_assistant_content(self, response: Any) -> str:
         """
@@ -161,30 +225,24 @@ class AIService(IService):
         2. История диалога в виде контекстного блока (если включена)
         3. Текущий запрос пользователя
         """
-        context_settings = self.get_context_settings()
-        
         # Системные инструкции всегда идут первыми
         messages = [{
             "role": "user",
             "content": f"System instructions: {header}"
         }]
         
-        # Добавляем историю диалога если включена
-        if context_settings.get("enabled", False) and dialog_id:
-            max_messages = context_settings.get("max_messages", 6)
-            history = self.get_dialog_history(dialog_id, max_messages)
-            
-            if history:
-                # Формируем контекстный блок из истории
-                context_parts = ["Previous conversation:"]
-                for entry in history:
-                    role = "User" if entry['role'] == 'user' else "Assistant"
-                    context_parts.append(f"{role}: {entry['content']}")
-                
-                messages.append({
-                    "role": "user",
-                    "content": "\n\n".join(context_parts)
-                })
+        # Добавляем историю диалога, собранную заранее по промежуточному распознаванию, либо собираем сейчас
+        prepared, self._prepared_context = self._prepared_context, None
+        if prepared is not None and prepared['dialog_id'] == dialog_id:
+            self.context_prefetch_hits += 1
+            context_block = prepared['block']
+        else:
+            if prepared is not None:
+                self.context_prefetch_misses += 1
+            context_block = self._build_context_block(dialog_id)
+
+        if context_block:
+            messages.append(context_block)
         
         # Текущий запрос пользователя
         messages.append({
@@ -194,12 +252,209 @@ class AIService(IService):
         
         return messages
 
+    def _build_context_block(self, dialog_id: Optional[str]) -> Optional[Dict[str, str]]:
+        context_settings = self.get_context_settings()
+        if not context_settings.get("enabled", False) or not dialog_id:
+            return None
+
+        try:
+            return self.dialog_history.get_block(dialog_id)
+        except Exception as e:
+            print(f"[AIService] Error loading dialog history: {e}")
+            return None
+
+    def prepare_context(self, dialog_id: Optional[str]):
+        """
+        Заранее собирает блок истории диалога, пока пользователь ещё говорит
+        (по первому промежуточному результату распознавания).
+        Используется один раз - следующим build_messages_with_context.
+        """
+        self._prepared_context = {
+            'dialog_id': dialog_id,
+            'block': self._build_context_block(dialog_id)
+        }
+
+    def _get_tool_executor(self) -> ThreadPoolExecutor:
+        if self._tool_executor is None:
+            self._tool_executor = ThreadPoolExecutor(max_workers=self.tool_workers, thread_name_prefix="AIServiceTool")
+        return self._tool_executor
+
+    def _replace_tool_executor(self, pending: List[Dict[str, Any]]):
+        """
+        Поток зависшего инструмента прервать нельзя: пул с ним бросается (потоки
+        доработают и завершатся сами), ещё не начатые вызовы переезжают в новый пул.
+        """
+        old = self._tool_executor
+        self._tool_executor = None
+        self.tool_executor_replacements += 1
+        for call in pending:
+            future = call.get('future')
+            if future is not None and not call['started'].is_set() and future.cancel():
+                call['future'] = self._get_tool_executor().submit(self._run_tool, call)
+        if old is not None:
+            old.shutdown(wait=False)
+
+    def _run_tool(self, call: Dict[str, Any]) -> Tuple[Any, float]:
+        call_name = call['name']
+        tool_execution_start = time.time()
+        call['started_at'] = tool_execution_start
+        call['started'].set()
+        with self.tracer.span(f"tool:{call_name}", call['trace']) as span:
+            try:
+                response = call['handler'](**call['kwargs'])
+            except Exception as e:
+                response = {"error": f"Tool execution failed: {str(e)}"}
+            span['error'] = isinstance(response, dict) and 'error' in response
+
+        if self.tool_cache_enabled:
+            if call_name in self.tool_invalidates:
+                # Повторно: читающие вызовы, шедшие параллельно, могли закэшировать старое состояние
+                self.tool_cache.invalidate(self.tool_invalidates[call_name])
+            elif call_name in self.tool_cache_ttls:
+                self.tool_cache.put(call_name, call['kwargs'], response, self.tool_cache_ttls[call_name])
+        return response, time.time() - tool_execution_start
+
+    def _dispatch_tool_call(self, call_name: str, call_args: Any, trace: Optional[Dict[str, Any]] = None,
+                            pending: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Отправляет читающий вызов инструмента (нет в side_effects пакета) в пул сразу
+        после разбора, не дожидаясь конца потока модели. Вызовы с побочными эффектами
+        и всё, что модель запросила после них, откладываются до _collect_tool_calls и
+        выполняются в порядке модели. Таймаут считается от начала выполнения: у класса
+        инструмента свой `timeout`, иначе AI_TOOL_TIMEOUT_SECONDS.
+
+        Args:
+            pending (Optional[List[Dict[str, Any]]]): Уже разобранные вызовы этой итерации
+        """
+        tool = self.tool_aliases[call_name]
+        call = {
+            "name": call_name,
+            "args": call_args,
+            "kwargs": call_args if isinstance(call_args, dict) else {},
+            "handler": tool['handler'],
+            "class": tool['class'],
+            "timeout": getattr(tool['class'], 'timeout', None) or self.tool_timeout,
+            "sequential": call_name in self.tool_side_effects,
+            "trace": trace,
+            "submitted_at": time.time(),
+            "started": threading.Event(),
+            "started_at": None,
+            "future": None,
+            "cached": False
+        }
+        if not call['sequential'] and not any(c['future'] is None for c in pending or []):
+            self._start_tool_call(call)
+        return call
+
+    def _start_tool_call(self, call: Dict[str, Any]):
+        call_name = call['name']
+        if self.tool_cache_enabled:
+            if call_name in self.tool_invalidates:
+                self.tool_cache.invalidate(self.tool_invalidates[call_name])
+            elif call_name in self.tool_cache_ttls:
+                hit, response = self.tool_cache.get(call_name, call['kwargs'])
+                if hit:
+                    call['started_at'] = time.time()
+                    call['started'].set()
+                    self.tracer.add_span(f"tool:{call_name}", call['trace'], call['started_at'], cached=True)
+                    future: Future = Future()
+                    future.set_result((response, 0.0))
+                    call.update(cached=True, future=future)
+                    return
+
+        call['future'] = self._get_tool_executor().submit(self._run_tool, call)
+
+    def _collect_tool_calls(self, pending: List[Dict[str, Any]], iteration: int) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Дожидается вызовов в том порядке, в каком их запросила модель. Отложенный
+        вызов стартует, когда всё до него завершилось; читающие вызовы за ним
+        до следующего вызова с побочными эффектами стартуют вместе с ним.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], float]: Результаты и время итерации по часам -
+            от первой отправки до последнего результата
+        """
+        results = []
+        for index, call in enumerate(pending):
+            if call['future'] is None:
+                self._start_tool_call(call)
+                if not call['sequential']:
+                    for later in pending[index + 1:]:
+                        if later['sequential']:
+                            break
+                        if later['future'] is None:
+                            self._start_tool_call(later)
+
+            timed_out = False
+            try:
+                # Ожидание в очереди пула в таймаут не входит
+                if not call['started'].wait(timeout=call['timeout']):
+                    raise FutureTimeoutError()
+                remaining = max(call['started_at'] + call['timeout'] - time.time(), 0)
+                response, tool_execution_time = call['future'].result(timeout=remaining)
+            except FutureTimeoutError:
+                timed_out = True
+                started = call['started'].is_set()
+                if not call['future'].cancel() and not call['future'].done():
+                    # Поток занят зависшим инструментом: дальше работаем на новом пуле
+                    self._replace_tool_executor(pending[index + 1:])
+                response = {"error": f"Tool execution timed out after {call['timeout']:.0f}s"
+                            if started else "Tool execution did not start: all tool workers are busy"}
+                tool_execution_time = time.time() - call['started_at'] if started else 0.0
+                print(f"[AIService] Tool {call['name']} {'timed out' if started else 'did not start'} after {call['timeout']:.0f}s")
+
+            results.append({
+                "name": call['name'],
+                "args": call['args'],
+                "response": response,
+                "execution_time": f"{tool_execution_time:.2f}",
+                "timed_out": timed_out,
+                "cached": call['cached'],
+                "iteration": iteration
+            })
+
+        iteration_wall_time = time.time() - pending[0]['submitted_at'] if pending else 0.0
+        for result in results:
+            result['iteration_wall_time'] = f"{iteration_wall_time:.2f}"
+
+        # Очереди сообщений инструментов забираются один раз, когда все вызовы итерации завершились
+        for tool_class in {id(call['class']): call['class'] for call in pending}.values():
+            try:
+                queue = tool_class.get_socket_messages_queue()
+                tool_class.clear_socket_messages_queue()
+                self.extend_socket_messages_queue(queue)
+            except Exception as e:
+                print(f"Error processing tool queue: {e}")
+
+        return results, iteration_wall_time
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'context_prefetch': {
+                'hits': self.context_prefetch_hits,
+                'misses': self.context_prefetch_misses
+            },
+            'tool_cache': {
+                'enabled': self.tool_cache_enabled,
+                **self.tool_cache.get_stats()
+            },
+            'tool_workers': {
+                'size': self.tool_workers,
+                'replaced_pools': self.tool_executor_replacements
+            },
+            'dialog_history': self.dialog_history.get_stats(),
+            'provider': self.provider.get_stats() if self.provider else None,
+            'provider_cache': ProviderFactory.get_cache_stats()
+        }
+
     def setup_tools(self, state: dict = {}):
         self.tools = []
 
         for tool_class in self.symlinks:
 
             if not state.get(self.symlinks[tool_class].name) or not state[self.symlinks[tool_class].name].get("enabled"):
+                # Выключенный пакет: его результаты не должны пережить повторное включение
+                self.tool_cache.invalidate(self.symlinks[tool_class].cache_ttls.keys())
                 continue
 
             tools_obj = self.symlinks[tool_class].get_commands()
@@ -213,30 +468,61 @@ class AIService(IService):
 
     def set_client_data(self, api_key: str, api_model: str, provider: str):
         try:
-            self.provider = ProviderFactory.get_provider(provider, api_key, api_model)
+            self.provider = self.resources.acquire(
+                "ai.provider",
+                lambda: ProviderFactory.get_provider(provider, api_key, api_model),
+                signature=(provider, api_model, api_key),
+                owner=self.MODULE_ID
+            )
             if not self.provider:
+                self.resources.evict("ai.provider")
                 raise ValueError(f"Failed to initialize provider '{provider}'")
         except Exception as e:
             print(f"Error setting client data: {e}")
             raise
 
+    def warm_up_provider(self, background: bool = True) -> Optional[float]:
+        """
+        Открывает соединение с провайдером до запроса (при старте, смене модели и по имени ассистента).
+
+        Args:
+            background (bool): Прогреть в отдельном потоке, не дожидаясь результата
+        """
+        provider = self.provider
+        if not self.warmup_enabled or provider is None:
+            return None
+        if not background:
+            return provider.warm_up()
+        if self._warmup_thread is not None and self._warmup_thread.is_alive():
+            return None
+        self._warmup_thread = threading.Thread(target=provider.warm_up, name="AIServiceWarmUp", daemon=True)
+        self._warmup_thread.start()
+        return None
+
     def create_completion(self, messages: List[Dict[str, str]]):
         if not self.provider:
             raise ValueError("Provider is not set. Please set it before creating a completion.")
         
         return self.provider.chat_stream(messages, self.tools)
 
-    def execute(self, text: str, dialog_id: Optional[str] = None):  # type: ignore
+    def execute(self, text: str, dialog_id: Optional[str] = None, trace: Optional[Dict[str, Any]] = None):  # type: ignore
         """
         Выполняет запрос к AI модели с поддержкой tool calls.
+
+        Args:
+            text (str): Запрос пользователя
+            dialog_id (Optional[str]): Диалог, из которого берётся история
+            trace (Optional[Dict[str, Any]]): Трасса запроса для спанов этапов (см. Tracer)
         """
         if not self.provider:
             raise ValueError("Provider is not set. Please set it before executing.")
 
         MAX_TOOL_ITERATIONS = 5
+        execute_start = time.time()
         
         try:
-            messages = self.build_messages_with_context(text, dialog_id)
+            with self.tracer.span('context_build', trace, dialog_id=dialog_id):
+                messages = self.build_messages_with_context(text, dialog_id)
         except Exception as e:
             print(f"[AIService] Error building messages: {e}")
             raise
@@ -248,11 +534,20 @@ class AIService(IService):
         total_timer = time.time()
         thinking_timer = 0
         tool_calls_timer = 0
+        tool_calls_serial_timer = 0
+
+        stream_id = uuid.uuid4().hex[:12]
+        stream = StreamCoalescer.from_env(
+            lambda data: self._emit_streaming_message(EventsType.SERVICE_ACTION.value, EventsTopic.ACTION_AI_STREAM_CHUNK.value, data),
+            stream_id,
+            meta={'original_text': text, 'model_name': self.provider.model}
+        )
 
         self._emit_streaming_message(
             EventsType.SERVICE_ACTION.value,
             EventsTopic.ACTION_AI_STREAM_START.value,
             {
+                'stream_id': stream_id,
                 'original_text': text,
                 'model_name': self.provider.model
             }
@@ -262,39 +557,32 @@ class AIService(IService):
         while iteration_count < MAX_TOOL_ITERATIONS:
             iteration_count += 1
             tool_calls_result = []
+            pending_tool_calls: List[Dict[str, Any]] = []
             thinking_in_iteration = 0
+            request_start = time.perf_counter()
+            request_start_wall = time.time()
+            first_part = True
             
             try:
                 for part in self.provider.chat_stream(messages, self.tools):
+                    if first_part:
+                        # Время до первого куска: установка соединения + задержка модели
+                        self.provider.record_first_token(time.perf_counter() - request_start)
+                        self.tracer.add_span('provider_first_token', trace, request_start_wall,
+                                             iteration=iteration_count, model=self.provider.model)
+                        first_part = False
+
                     thinking_chunk = self.provider.extract_thinking(part)
                     if thinking_chunk:
                         thinking_chunk_start = time.time()
                         initial_accumulated_response['thinking'] += thinking_chunk
                         thinking_in_iteration += time.time() - thinking_chunk_start
-                        
-                        self._emit_streaming_message(
-                            EventsType.SERVICE_ACTION.value,
-                            EventsTopic.ACTION_AI_STREAM_CHUNK.value,
-                            {
-                                'type': 'thinking',
-                                'content': thinking_chunk,
-                                'accumulated_thinking': initial_accumulated_response['thinking']
-                            }
-                        )
+                        stream.add('thinking', thinking_chunk)
                     
                     content_chunk = self.provider.extract_content(part)
                     if content_chunk:
                         initial_accumulated_response['content'] += content_chunk
-                        
-                        self._emit_streaming_message(
-                            EventsType.SERVICE_ACTION.value,
-                            EventsTopic.ACTION_AI_STREAM_CHUNK.value,
-                            {
-                                'type': 'content',
-                                'content': content_chunk,
-                                'accumulated_content': initial_accumulated_response['content']
-                            }
-                        )
+                        stream.add('content', content_chunk)
 
                     tool_calls = self.provider.extract_tool_calls(part)
                     for tool_call in tool_calls:
@@ -302,35 +590,17 @@ class AIService(IService):
                         call_args = tool_call.get('args', {})
 
                         if call_name in self.tool_aliases:
-                            handler = self.tool_aliases[call_name]['handler']
-                            args = call_args if isinstance(call_args, dict) else {}
-
-                            tool_execution_start = time.time()
-                            try:
-                                response = handler(**args)
-                            except Exception as e:
-                                response = {"error": f"Tool execution failed: {str(e)}"}
-                            tool_execution_time = time.time() - tool_execution_start
-
-                            try:
-                                queue = self.tool_aliases[call_name]['class'].get_socket_messages_queue()
-                                self.tool_aliases[call_name]['class'].clear_socket_messages_queue()
-                                self.extend_socket_messages_queue(queue)
-                            except Exception as e:
-                                print(f"Error processing tool queue: {e}")
-
-                            tool_calls_result.append({
-                                "name": call_name,
-                                "args": call_args,
-                                "response": response,
-                                "execution_time": f"{tool_execution_time:.2f}"
-                            })
+                            pending_tool_calls.append(self._dispatch_tool_call(call_name, call_args, trace, pending_tool_calls))
                 
+                # Провайдер закончил итерацию: остаток дельты не ждёт, пока выполнятся инструменты
+                stream.flush()
+                self.tracer.add_span('provider_stream', trace, request_start_wall, iteration=iteration_count)
                 thinking_timer += thinking_in_iteration
                 
-                if tool_calls_result:
-                    iteration_tool_time = sum(float(tool['execution_time']) for tool in tool_calls_result)
-                    tool_calls_timer += iteration_tool_time
+                if pending_tool_calls:
+                    tool_calls_result, iteration_wall_time = self._collect_tool_calls(pending_tool_calls, iteration_count)
+                    tool_calls_timer += iteration_wall_time
+                    tool_calls_serial_timer += sum(float(tool['execution_time']) for tool in tool_calls_result)
 
                 if not tool_calls_result:
                     final_accumulated_response = initial_accumulated_response
@@ -381,7 +651,8 @@ class AIService(IService):
             'timing': {
                 'total_time': f"{total_time:.2f}",
                 'thinking_time': f"{thinking_timer:.2f}",
-                'tool_calls_time': f"{tool_calls_timer:.2f}"
+                'tool_calls_time': f"{tool_calls_timer:.2f}",
+                'tool_calls_serial_time': f"{tool_calls_serial_timer:.2f}"
             }
         } if len(tools_results) > 0 else {
             "final_stage": final_accumulated_response,
@@ -391,10 +662,15 @@ class AIService(IService):
             }
         }
 
+        stream.close()
+        self.tracer.add_span('ai_execute', trace, execute_start, iterations=iteration_count, tool_calls=len(tools_results))
+
         self._emit_streaming_message(
             EventsType.SERVICE_ACTION.value,
             EventsTopic.ACTION_AI_STREAM_END.value,
             {
+                'stream_id': stream_id,
+                'stream': stream.get_stats(),
                 'original_text': text,
                 'model_name': self.provider.model,
                 'final_response': result
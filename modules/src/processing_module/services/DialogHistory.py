@@ -0,0 +1,198 @@
+import math
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+from utils.EnvHelper import getenv_int, getenv_float
+
+
+class DialogHistory:
+    """
+    Окна истории диалогов в памяти для контекстного блока запроса.
+
+    Каждое окно - последние обмены (запрос пользователя + ответ ассистента)
+    одного диалога, ограниченные оценкой числа токенов и числом обменов.
+    Окна заполняются из сохранённых диалогов один раз за процесс, дальше
+    пополняются по мере завершения ответов. Блок "Previous conversation"
+    собирается при изменении окна и отдаётся из кэша, так что сборка
+    контекста не зависит от числа сохранённых диалогов и сообщений.
+    """
+
+    def __init__(self,
+                 loader: Callable[[], Dict[str, Any]],
+                 extract_content: Callable[[Any], str],
+                 max_tokens: int = 1500,
+                 max_turns: int = 6,
+                 chars_per_token: float = 3.0):
+        """
+        Args:
+            loader (Callable[[], Dict[str, Any]]): Чтение всех сохранённых диалогов (dialog_id -> диалог)
+            extract_content (Callable[[Any], str]): Текст ответа ассистента без рассуждений и вызовов инструментов
+            max_tokens (int): Бюджет токенов окна (0 - без ограничения)
+            max_turns (int): Сколько последних обменов держать (0 - без ограничения)
+            chars_per_token (float): Сколько символов считать за токен при оценке
+        """
+        self.loader = loader
+        self.extract_content = extract_content
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+        self.chars_per_token = chars_per_token
+
+        self._lock = threading.Lock()
+        self._windows: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+
+        self.loads = 0
+        self.block_hits = 0
+        self.block_builds = 0
+        self.trimmed_turns = 0
+
+    def estimate_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token) if text else 0
+
+    def _entry(self, role: str, content: str) -> Dict[str, Any]:
+        # Один огромный ответ не должен вытеснить всё окно: режем его до половины бюджета
+        if self.max_tokens:
+            limit = int(self.max_tokens * self.chars_per_token / 2)
+            if len(content) > limit:
+                content = content[:limit] + '…'
+        line = f"{'User' if role == 'user' else 'Assistant'}: {content}"
+        return {'role': role, 'content': content, 'line': line, 'tokens': self.estimate_tokens(line)}
+
+    def _turn(self, user_prompt: Optional[str], assistant_response: Any) -> List[Dict[str, Any]]:
+        turn = []
+        if user_prompt:
+            turn.append(self._entry('user', user_prompt))
+        if assistant_response:
+            content = self.extract_content(assistant_response)
+            if content:
+                turn.append(self._entry('assistant', content))
+        return turn
+
+    def _new_window(self) -> Dict[str, Any]:
+        return {'turns': deque(), 'tokens': 0, 'block': None}
+
+    def _push(self, window: Dict[str, Any], turn: List[Dict[str, Any]]):
+        window['turns'].append(turn)
+        window['tokens'] += sum(e['tokens'] for e in turn)
+        window['block'] = None
+        self._trim(window)
+
+    def _trim(self, window: Dict[str, Any]):
+        turns: Deque[List[Dict[str, Any]]] = window['turns']
+        while len(turns) > 1 and (
+            (self.max_turns and len(turns) > self.max_turns) or
+            (self.max_tokens and window['tokens'] > self.max_tokens)
+        ):
+            window['tokens'] -= sum(e['tokens'] for e in turns.popleft())
+            self.trimmed_turns += 1
+
+    def _ensure_loaded(self):
+        """Заполняет окна из сохранённых диалогов; дальше они живут только в памяти"""
+        if self._loaded:
+            return
+        self._windows = {}
+        for dialog_id, dialog in (self.loader() or {}).items():
+            window = self._new_window()
+            # Идём с конца: старые сообщения за пределами окна даже не разбираем
+            turns: List[List[Dict[str, Any]]] = []
+            tokens = 0
+            for msg in reversed(dialog.get('messages', [])):
+                if self.max_turns and len(turns) >= self.max_turns:
+                    break
+                turn = self._turn(msg.get('user_prompt'), msg.get('assistant_response'))
+                if not turn:
+                    continue
+                turn_tokens = sum(e['tokens'] for e in turn)
+                if turns and self.max_tokens and tokens + turn_tokens > self.max_tokens:
+                    break
+                turns.append(turn)
+                tokens += turn_tokens
+            for turn in reversed(turns):
+                self._push(window, turn)
+            self._windows[dialog_id] = window
+        self._loaded = True
+        self.loads += 1
+
+    def configure(self, max_tokens: Optional[int] = None, max_turns: Optional[int] = None):
+        """
+        Меняет размер окна. При увеличении окна старые обмены нужно дочитать,
+        поэтому окна заполняются из сохранённых диалогов заново при следующем обращении.
+        """
+        with self._lock:
+            new_tokens = self.max_tokens if max_tokens is None else max_tokens
+            new_turns = self.max_turns if max_turns is None else max_turns
+            if (new_tokens, new_turns) == (self.max_tokens, self.max_turns):
+                return
+            self.max_tokens, self.max_turns = new_tokens, new_turns
+            self._loaded = False
+            self._windows = {}
+
+    def append(self, dialog_id: str, user_prompt: Optional[str], assistant_response: Any):
+        """
+        Добавляет завершённый обмен. Если окна ещё не заполнялись, ничего не делаем:
+        обмен уже сохранён и попадёт в окно при заполнении.
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            turn = self._turn(user_prompt, assistant_response)
+            if turn:
+                self._push(self._windows.setdefault(dialog_id, self._new_window()), turn)
+
+    def forget(self, dialog_id: str):
+        with self._lock:
+            self._windows.pop(dialog_id, None)
+
+    def get_history(self, dialog_id: str) -> List[Dict[str, str]]:
+        """Окно диалога в виде сообщений с ролями 'user' и 'assistant'"""
+        with self._lock:
+            self._ensure_loaded()
+            window = self._windows.get(dialog_id)
+            if window is None:
+                return []
+            return [{'role': e['role'], 'content': e['content']} for turn in window['turns'] for e in turn]
+
+    def get_block(self, dialog_id: str) -> Optional[Dict[str, str]]:
+        """Контекстный блок "Previous conversation" для диалога (None, если истории нет)"""
+        with self._lock:
+            self._ensure_loaded()
+            window = self._windows.get(dialog_id)
+            if window is None or not window['turns']:
+                return None
+
+            if window['block'] is not None:
+                self.block_hits += 1
+                return window['block']
+
+            context_parts = ["Previous conversation:"]
+            for turn in window['turns']:
+                context_parts.extend(e['line'] for e in turn)
+            window['block'] = {
+                "role": "user",
+                "content": "\n\n".join(context_parts)
+            }
+            self.block_builds += 1
+            return window['block']
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            windows = list(self._windows.values())
+            return {
+                'max_tokens': self.max_tokens,
+                'max_turns': self.max_turns,
+                'dialogs': len(windows),
+                'loads': self.loads,
+                'block_hits': self.block_hits,
+                'block_builds': self.block_builds,
+                'trimmed_turns': self.trimmed_turns,
+                'mean_window_tokens': round(sum(w['tokens'] for w in windows) / len(windows), 1) if windows else 0.0
+            }
+
+    @classmethod
+    def from_env(cls, loader: Callable[[], Dict[str, Any]], extract_content: Callable[[Any], str]) -> 'DialogHistory':
+        return cls(
+            loader=loader,
+            extract_content=extract_content,
+            max_tokens=getenv_int("AI_CONTEXT_MAX_TOKENS", 1500),
+            chars_per_token=getenv_float("AI_CONTEXT_CHARS_PER_TOKEN", 3.0)
+        )
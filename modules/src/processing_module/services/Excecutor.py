@@ -5,17 +5,22 @@ from utils import AudioService
 from interfaces import IService
 from colorama import Fore, Style
 from paths import path_resolver
+from utils.ResourceRegistry import ResourceRegistry
+from utils.Tracer import Tracer
+from typing import Optional
 
 colorama.init()
 
 class Excecutor:
     def __init__(self,
-                 prediction_threshold: float = 0.8):
+                 prediction_threshold: float = 0.8,
+                 resources: Optional[ResourceRegistry] = None):
         """
         Инициализация голосового ассистента
         
         Args:
             prediction_threshold (float): Порог уверенности для классификации
+            resources (Optional[ResourceRegistry]): Реестр оркестратора для переиспользования клиентов провайдеров
         """
         self.current_state = 'NORMAL'
 
@@ -31,6 +36,9 @@ class Excecutor:
             "ai_service": AIService().getInstance(),
         }
 
+        if resources is not None:
+            self.services["ai_service"].set_resources(resources) # type: ignore
+
         self.get_current_model_data_from_json()
 
     def set_socket_client(self, socket_client):
@@ -56,10 +64,21 @@ class Excecutor:
                 self.current_model_key = model.get("value")
                 self.current_model_provider = model.get("provider")
                 self.services["ai_service"].set_client_data(self.current_model_key, self.current_model_name, self.current_model_provider) # type: ignore
+                self.services["ai_service"].warm_up_provider() # type: ignore
+
+    def warm_up(self):
+        """Прогрев соединения с провайдером, пока пользователь договаривает команду"""
+        self.services["ai_service"].warm_up_provider() # type: ignore
+
+    def prepare(self, msg):
+        """Спекулятивная подготовка к запросу по промежуточному тексту распознавания"""
+        dialog_id = msg['payload'].get('dialog_id')
+        self.services["ai_service"].prepare_context(dialog_id) # type: ignore
 
     def run(self, msg):
         text = msg['payload']['text']
         dialog_id = msg['payload'].get('dialog_id')
-        data = self.services["ai_service"].execute(text, dialog_id) # type: ignore
+        trace = msg['payload'].get('trace') or Tracer.new_trace()
+        data = self.services["ai_service"].execute(text, dialog_id, trace) # type: ignore
 
         yield data
@@ -0,0 +1,122 @@
+import json
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+from utils.EnvHelper import getenv_int, getenv_float
+
+
+class StreamCoalescer:
+    """
+    Склейка потока ответа модели в дельты для ACTION_AI_STREAM_CHUNK.
+
+    Куски от провайдера копятся и уходят одним сообщением, когда с первого
+    неотправленного куска прошло window_ms или набралось max_chars символов;
+    таймер гарантирует, что дельта не застрянет, если провайдер замолчал.
+    Сообщение несёт только новые символы (deltas) и порядковый номер seq.
+    Раз в checkpoint_seconds к сообщению добавляется полный текст (checkpoint),
+    по которому интерфейс, подключившийся посреди ответа или потерявший
+    сообщение, восстанавливает состояние.
+    """
+
+    KINDS = ('thinking', 'content')
+
+    def __init__(self,
+                 emit: Callable[[Dict[str, Any]], None],
+                 stream_id: str,
+                 window_ms: int = 40,
+                 max_chars: int = 512,
+                 checkpoint_seconds: float = 2.0,
+                 meta: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            emit (Callable[[Dict[str, Any]], None]): Отправка данных сообщения
+            stream_id (str): Идентификатор ответа, повторяется в каждом сообщении
+            window_ms (int): Сколько копить куски перед отправкой (0 - отправлять каждый)
+            max_chars (int): Отправить раньше окна, если накопилось столько символов
+            checkpoint_seconds (float): Как часто прикладывать полный текст (0 - только по flush(checkpoint=True))
+            meta (Optional[Dict[str, Any]]): Что приложить к контрольной точке (запрос, модель)
+        """
+        self.emit = emit
+        self.stream_id = stream_id
+        self.window = window_ms / 1000
+        self.max_chars = max_chars
+        self.checkpoint_seconds = checkpoint_seconds
+        self.meta = meta or {}
+
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._pending: Dict[str, str] = {kind: '' for kind in self.KINDS}
+        self._accumulated: Dict[str, str] = {kind: '' for kind in self.KINDS}
+        self._last_checkpoint = time.monotonic()
+        self.seq = 0
+
+        self.chunks_in = 0
+        self.messages = 0
+        self.checkpoints = 0
+        self.bytes_out = 0
+
+    def add(self, kind: str, text: str):
+        if not text:
+            return
+        with self._lock:
+            self.chunks_in += 1
+            self._pending[kind] += text
+            self._accumulated[kind] += text
+
+            if not self.window or sum(len(p) for p in self._pending.values()) >= self.max_chars:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self, checkpoint: bool = False):
+        with self._lock:
+            self._flush_locked(checkpoint)
+
+    def _flush_locked(self, checkpoint: bool = False):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        deltas = {kind: text for kind, text in self._pending.items() if text}
+        now = time.monotonic()
+        checkpoint = checkpoint or bool(self.checkpoint_seconds and now - self._last_checkpoint >= self.checkpoint_seconds)
+        if not deltas and not checkpoint:
+            return
+
+        data: Dict[str, Any] = {'stream_id': self.stream_id, 'seq': self.seq, 'deltas': deltas}
+        if checkpoint:
+            data['checkpoint'] = {**self.meta, **self._accumulated}
+            self._last_checkpoint = now
+            self.checkpoints += 1
+
+        self._pending = {kind: '' for kind in self.KINDS}
+        self.seq += 1
+        self.messages += 1
+        self.bytes_out += len(json.dumps(data))
+        self.emit(data)
+
+    def close(self):
+        """Отправляет остаток; дальше сообщений по этому ответу нет"""
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'chunks_in': self.chunks_in,
+            'messages': self.messages,
+            'checkpoints': self.checkpoints,
+            'bytes': self.bytes_out,
+            'chunks_per_message': round(self.chunks_in / self.messages, 2) if self.messages else None
+        }
+
+    @classmethod
+    def from_env(cls, emit: Callable[[Dict[str, Any]], None], stream_id: str, meta: Optional[Dict[str, Any]] = None) -> 'StreamCoalescer':
+        return cls(
+            emit=emit,
+            stream_id=stream_id,
+            window_ms=getenv_int("AI_STREAM_COALESCE_MS", 40),
+            max_chars=getenv_int("AI_STREAM_COALESCE_MAX_CHARS", 512),
+            checkpoint_seconds=getenv_float("AI_STREAM_CHECKPOINT_SECONDS", 2.0),
+            meta=meta
+        )
@@ -0,0 +1,105 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class ToolResultCache:
+    """
+    Кэш результатов инструментов с ограниченным временем жизни.
+
+    Ключ - имя команды и её аргументы в каноническом виде (ключи словарей
+    отсортированы), так что одинаковые вызовы с разным порядком аргументов
+    попадают в одну запись. Что и сколько хранить, решает вызывающий (TTL
+    команды задаёт её пакет ITool.cache_ttls); ошибки не кэшируются.
+    Потокобезопасен: инструменты одной итерации выполняются параллельно.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Args:
+            max_entries (int): Сколько записей держать; самые старые вытесняются первыми
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0
+        self.per_tool: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(name: str, args: Any) -> Tuple[str, str]:
+        return name, json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
+
+    def _count(self, name: str, field: str):
+        counters = self.per_tool.setdefault(name, {'hits': 0, 'misses': 0})
+        counters[field] += 1
+
+    def get(self, name: str, args: Any) -> Tuple[bool, Any]:
+        """
+        Returns:
+            Tuple[bool, Any]: Найден ли живой результат и сам результат
+        """
+        key = self.make_key(name, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['expires_at'] <= time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                self._count(name, 'misses')
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._count(name, 'hits')
+            return True, entry['value']
+
+    def put(self, name: str, args: Any, value: Any, ttl: float):
+        if ttl <= 0 or (isinstance(value, dict) and 'error' in value):
+            return
+
+        key = self.make_key(name, args)
+        with self._lock:
+            self._entries[key] = {'value': value, 'expires_at': time.monotonic() + ttl}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, names: Optional[Iterable[str]] = None) -> int:
+        """
+        Сбрасывает записи указанных команд (None - весь кэш).
+
+        Returns:
+            int: Сколько записей удалено
+        """
+        with self._lock:
+            if names is None:
+                keys = list(self._entries)
+            else:
+                names = set(names)
+                keys = [key for key in self._entries if key[0] in names]
+            for key in keys:
+                del self._entries[key]
+            self.invalidated += len(keys)
+            return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'expired': self.expired,
+                'invalidated': self.invalidated,
+                'per_tool': {name: dict(counters) for name, counters in self.per_tool.items()}
+            }
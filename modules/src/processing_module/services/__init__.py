@@ -1,7 +1,13 @@
 from .Excecutor import Excecutor
 from .AIService import AIService
+from .ToolResultCache import ToolResultCache
+from .DialogHistory import DialogHistory
+from .StreamCoalescer import StreamCoalescer
 
 __all__ = [
     "Excecutor",
-    "AIService"
+    "AIService",
+    "ToolResultCache",
+    "DialogHistory",
+    "StreamCoalescer"
 ]
\ No newline at end of file
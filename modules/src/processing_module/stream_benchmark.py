@@ -0,0 +1,157 @@
+"""
+Бенчмарк протокола потоковой передачи ответа модели (ACTION_AI_STREAM_CHUNK).
+
+Синтетический ответ (рассуждение + ответ, по одному токену на кусок с
+заданным интервалом) прогоняется через прежний формат - сообщение на
+каждый кусок с полным накопленным текстом - и через StreamCoalescer
+с каждым из окон --windows. Считаются сообщения и байты в том виде,
+в каком их отправляет ModuleClient, и проверяется, что текст собирается
+из дельт без потерь.
+
+Запуск из каталога modules:
+    python -m src.processing_module.stream_benchmark --thinking-tokens 1500 --content-tokens 400 \
+        --windows 0,30,50 --output stream_report.json
+"""
+import os
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import json
+import time
+import random
+import argparse
+from typing import Any, Dict, List, Tuple
+
+from utils.EnvHelper import getenv_int, getenv_float
+from enums.Events import EventsType, EventsTopic
+from src.processing_module.services.StreamCoalescer import StreamCoalescer
+
+
+WORDS = [
+    'пользователь', 'хочет', 'узнать', 'что', 'сейчас', 'запущено', 'нужно', 'вызвать',
+    'инструмент', 'контейнеры', 'docker', 'система', 'ответ', 'список', 'и', 'в', 'на', 'это'
+]
+
+
+def _envelope(data: Dict[str, Any]) -> str:
+    return json.dumps({
+        'type': EventsType.SERVICE_ACTION.value,
+        'topic': EventsTopic.ACTION_AI_STREAM_CHUNK.value,
+        'payload': {'data': data},
+        'from': 'processing_module'
+    })
+
+
+def _synthetic_stream(thinking_tokens: int, content_tokens: int, seed: int) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    return [('thinking', rng.choice(WORDS) + ' ') for _ in range(thinking_tokens)] + \
+           [('content', rng.choice(WORDS) + ' ') for _ in range(content_tokens)]
+
+
+def run_legacy(stream: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Прежний формат: сообщение на каждый кусок вместе со всем накопленным текстом"""
+    accumulated = {'thinking': '', 'content': ''}
+    sizes = []
+    for kind, text in stream:
+        accumulated[kind] += text
+        sizes.append(len(_envelope({
+            'type': kind,
+            'content': text,
+            f'accumulated_{kind}': accumulated[kind]
+        })))
+    return {
+        'messages': len(sizes),
+        'bytes': sum(sizes),
+        'max_message_bytes': max(sizes, default=0)
+    }
+
+
+def run_coalesced(stream: List[Tuple[str, str]], token_ms: float, window_ms: int, max_chars: int, checkpoint_seconds: float) -> Dict[str, Any]:
+    sizes: List[int] = []
+    received: List[Dict[str, Any]] = []
+
+    def emit(data: Dict[str, Any]):
+        sizes.append(len(_envelope(data)))
+        received.append(data)
+
+    coalescer = StreamCoalescer(emit, 'bench', window_ms=window_ms, max_chars=max_chars, checkpoint_seconds=checkpoint_seconds)
+    start = time.perf_counter()
+    for kind, text in stream:
+        coalescer.add(kind, text)
+        time.sleep(token_ms / 1000)
+    coalescer.close()
+    wall = time.perf_counter() - start
+
+    rebuilt = {'thinking': '', 'content': ''}
+    in_order = all(data['seq'] == i for i, data in enumerate(received))
+    for data in received:
+        for kind, text in data['deltas'].items():
+            rebuilt[kind] += text
+    expected = {kind: ''.join(t for k, t in stream if k == kind) for kind in rebuilt}
+
+    return {
+        'window_ms': window_ms,
+        'messages': len(sizes),
+        'checkpoints': coalescer.checkpoints,
+        'bytes': sum(sizes),
+        'max_message_bytes': max(sizes, default=0),
+        'chunks_per_message': coalescer.get_stats()['chunks_per_message'],
+        'wall_seconds': round(wall, 3),
+        'reconstructed': in_order and rebuilt == expected
+    }
+
+
+def run_benchmark(thinking_tokens: int, content_tokens: int, token_ms: float, windows: List[int],
+                  max_chars: int, checkpoint_seconds: float, seed: int = 0) -> Dict[str, Any]:
+    stream = _synthetic_stream(thinking_tokens, content_tokens, seed)
+    legacy = run_legacy(stream)
+    results = []
+    for window in windows:
+        result = run_coalesced(stream, token_ms, window, max_chars, checkpoint_seconds)
+        result['bytes_ratio'] = round(result['bytes'] / legacy['bytes'], 5) if legacy['bytes'] else None
+        result['messages_ratio'] = round(result['messages'] / legacy['messages'], 4) if legacy['messages'] else None
+        results.append(result)
+
+    return {
+        'config': {
+            'thinking_tokens': thinking_tokens,
+            'content_tokens': content_tokens,
+            'response_chars': sum(len(t) for _, t in stream),
+            'token_ms': token_ms,
+            'max_chars': max_chars,
+            'checkpoint_seconds': checkpoint_seconds
+        },
+        'legacy': legacy,
+        'coalesced': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI stream protocol benchmark")
+    parser.add_argument('--thinking-tokens', type=int, default=1500, help="Reasoning chunks in the synthetic response")
+    parser.add_argument('--content-tokens', type=int, default=400, help="Answer chunks in the synthetic response")
+    parser.add_argument('--token-ms', type=float, default=5.0, help="Interval between provider chunks")
+    parser.add_argument('--windows', default='0,30,50', help="Comma-separated coalescing windows in ms")
+    parser.add_argument('--max-chars', type=int, default=getenv_int("AI_STREAM_COALESCE_MAX_CHARS", 512), help="Flush early at this many pending characters")
+    parser.add_argument('--checkpoint-seconds', type=float, default=getenv_float("AI_STREAM_CHECKPOINT_SECONDS", 2.0), help="Full-text checkpoint interval")
+    parser.add_argument('--output', default=None, help="Write JSON report to file instead of stdout")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.thinking_tokens,
+        args.content_tokens,
+        args.token_ms,
+        [int(w) for w in args.windows.split(',') if w.strip()],
+        args.max_chars,
+        args.checkpoint_seconds
+    )
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    else:
+        print(data)
+
+
+if __name__ == '__main__':
+    main()
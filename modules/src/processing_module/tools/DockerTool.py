@@ -8,6 +8,23 @@ class DockerTool(ITool):
 
     name = 'Docker Tools Pack'
 
+    side_effects = [
+        'run_container_tool',
+        'start_container_tool',
+        'stop_container_tool'
+    ]
+
+    cache_ttls = {
+        'get_all_images_tool': 60,
+        'get_all_containers_tool': 15
+    }
+
+    invalidates = {
+        'run_container_tool': ['get_all_containers_tool', 'get_all_images_tool'],
+        'start_container_tool': ['get_all_containers_tool'],
+        'stop_container_tool': ['get_all_containers_tool']
+    }
+
     try:
         client = docker.from_env()
         client.ping()
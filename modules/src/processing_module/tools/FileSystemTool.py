@@ -9,6 +9,24 @@ class FileSystemTool(ITool):
 
     name = 'FileSystem Tools Pack'
 
+    side_effects = [
+        'write_file_content_tool',
+        'move_file_tool',
+        'open_app_tool'
+    ]
+
+    cache_ttls = {
+        'get_apps_tool': 300,
+        'search_apps_tool': 300,
+        'get_notes_tool': 30,
+        'read_file_content_tool': 30
+    }
+
+    invalidates = {
+        'write_file_content_tool': ['read_file_content_tool', 'get_notes_tool'],
+        'move_file_tool': ['read_file_content_tool', 'get_notes_tool']
+    }
+
     allowed_paths_to_write = [
         path_resolver['notes_path']
     ]
@@ -13,6 +13,11 @@ class GitHubTool(ITool):
         'gh-link'
     ]
 
+    cache_ttls = {
+        'get_repo_info_tool': 300,
+        'get_list_repos_tool': 300
+    }
+
     _base_url: str = "https://api.github.com"
     _headers: Dict[str, str] = {
         'Accept': 'application/vnd.github.v3+json',
@@ -27,7 +32,7 @@ class GitHubTool(ITool):
 
         try:
             if method.upper() == 'GET':
-                response = requests.get(url, headers=GitHubTool._headers, params=params)
+                response = requests.get(url, headers=GitHubTool._headers, params=params, timeout=GitHubTool.request_timeout)
             else:
                 return {"error": f"Unsupported HTTP method: {method}"}
             
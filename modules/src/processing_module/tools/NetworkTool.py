@@ -8,6 +8,10 @@ class NetworkTool(ITool):
 
     name = 'Network Tools Pack'
 
+    cache_ttls = {
+        'get_network_info_tool': 30
+    }
+
     @staticmethod
     def setup_get_network_info_tool():
         return {
@@ -11,6 +11,22 @@ class SystemManagementTool(ITool):
 
     name = 'System Management Tools Pack'
 
+    side_effects = [
+        'set_system_volume_tool',
+        'set_system_brightness_tool'
+    ]
+
+    cache_ttls = {
+        'get_system_info_tool': 10,
+        'get_system_volume_tool': 30,
+        'get_system_brightness_tool': 30
+    }
+
+    invalidates = {
+        'set_system_volume_tool': ['get_system_volume_tool'],
+        'set_system_brightness_tool': ['get_system_brightness_tool']
+    }
+
     @staticmethod
     def setup_get_system_info_tool():
         return {
@@ -7,6 +7,20 @@ class ToolManagementTool(ITool):
 
     name = 'Tool Management Tools Pack'
 
+    side_effects = [
+        'turn_off_tool_packs_tool',
+        'turn_on_tool_packs_tool'
+    ]
+
+    cache_ttls = {
+        'get_all_available_tool_packs_tool': 300
+    }
+
+    invalidates = {
+        'turn_off_tool_packs_tool': ['get_all_available_tool_packs_tool'],
+        'turn_on_tool_packs_tool': ['get_all_available_tool_packs_tool']
+    }
+
     @staticmethod
     def setup_get_tools_packs_tool():
         return {
@@ -10,6 +10,10 @@ class WebTool(ITool):
         'search-api-key'
     ]
 
+    cache_ttls = {
+        'web_search_tool': 600
+    }
+
     @staticmethod
     def setup_web_search_tool():
         return {
@@ -31,7 +35,7 @@ class WebTool(ITool):
                 "engine": "duckduckgo",
                 "q": query,
             }
-            response = requests.get(url, params=params, headers={"User-Agent": "Mozilla/5.0"})
+            response = requests.get(url, params=params, headers={"User-Agent": "Mozilla/5.0"}, timeout=WebTool.request_timeout)
             data = response.json()
 
             results = []
@@ -0,0 +1,73 @@
+import threading
+import time
+from typing import Callable, Optional
+from .AudioRingBuffer import AudioRingBuffer
+from .SharedFrameRing import SharedFrameRing
+
+
+class AudioCapture:
+    """
+    Отдельный поток захвата: читает кадры из источника и складывает их
+    в кольцевой буфер, не дожидаясь распознавателя.
+
+    EOFError из read_fn означает, что источник исчерпан: поток завершается
+    и выставляет `finished`, а не `error`.
+    """
+
+    def __init__(self, read_fn: Callable[[int], bytes], ring: AudioRingBuffer, chunk_frames: int = 1024, blocking: bool = False,
+                 bus: Optional[SharedFrameRing] = None):
+        """
+        Args:
+            read_fn (Callable[[int], bytes]): Функция чтения N кадров из источника
+            ring (AudioRingBuffer): Буфер, в который пишутся кадры
+            chunk_frames (int): Размер одного чтения из источника в кадрах
+            blocking (bool): Ждать места в буфере вместо перезаписи (для не-живых источников)
+            bus (Optional[SharedFrameRing]): Общая шина, в которую захваченные кадры публикуются для других читателей
+        """
+        self.read_fn = read_fn
+        self.ring = ring
+        self.chunk_frames = chunk_frames
+        self.blocking = blocking
+        self.bus = bus
+
+        self.error: Optional[Exception] = None
+        self.finished = False
+        self.last_data_at: Optional[float] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self.error = None
+        self.finished = False
+        self.last_data_at = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="AudioCapture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self.error is None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                data = self.read_fn(self.chunk_frames)
+            except EOFError:
+                self.finished = True
+                break
+            except Exception as e:
+                self.error = e
+                break
+            if data:
+                self.last_data_at = time.monotonic()
+                self.ring.write(data, block=self.blocking, stop_event=self._stop)
+                if self.bus is not None:
+                    self.bus.write(data)
@@ -0,0 +1,180 @@
+import threading
+import time
+from typing import Dict, Optional
+
+
+class AudioRingBuffer:
+    """
+    Кольцевой буфер фиксированного размера для int16 PCM кадров.
+
+    Один поток захвата пишет, один декодер читает. Память выделяется один раз
+    при создании, чтение отдаёт memoryview без лишних копий (копирование
+    происходит только в заранее выделенный scratch, если запрошенный кусок
+    переходит через конец кольца). Место под последним выданным куском
+    не отдаётся писателю до следующего read(), release() или clear().
+    """
+
+    def __init__(self, capacity_frames: int, sample_width: int = 2, channels: int = 1):
+        self.frame_size = sample_width * channels
+        self.capacity_frames = capacity_frames
+        self.capacity = capacity_frames * self.frame_size
+
+        self._buffer = bytearray(self.capacity)
+        self._view = memoryview(self._buffer)
+        self._scratch = bytearray(self.capacity)
+        self._scratch_view = memoryview(self._scratch)
+
+        self._write_pos = 0
+        self._read_pos = 0
+        self._size = 0
+        # Прочитанный, но ещё не отпущенный читателем кусок: писатель его не трогает
+        self._held = 0
+
+        self._lock = threading.Lock()
+        self._data_ready = threading.Condition(self._lock)
+        self._space_ready = threading.Condition(self._lock)
+
+        self.overruns = 0
+        self.dropped_frames = 0
+        self.underruns = 0
+        self.written_frames = 0
+        self.read_frames = 0
+
+    def write(self, data: bytes, block: bool = False, stop_event: Optional[threading.Event] = None) -> int:
+        """
+        Записывает кадры в буфер. Если читатель не успевает, самые старые
+        кадры перезаписываются. С block=True писатель вместо этого ждёт
+        свободного места (для источников, которые можно притормозить).
+
+        Returns:
+            int: Количество потерянных (перезаписанных) кадров
+        """
+        length = len(data) - len(data) % self.frame_size
+        if length <= 0:
+            return 0
+
+        src = memoryview(data)
+        if length > self.capacity:
+            src = src[length - self.capacity:length]
+            skipped = length - self.capacity
+            length = self.capacity
+        else:
+            src = src[:length]
+            skipped = 0
+
+        with self._lock:
+            while block and self._size + self._held + length > self.capacity:
+                if stop_event is not None and stop_event.is_set():
+                    return 0
+                self._space_ready.wait(0.1)
+
+            # Кусок, который держит читатель, не перезаписывается даже при переполнении
+            writable = self.capacity - self._held
+            if length > writable:
+                src = src[length - writable:]
+                skipped += length - writable
+                length = writable
+
+            dropped = skipped
+            overflow = self._size + length - writable
+            if overflow > 0:
+                self._read_pos = (self._read_pos + overflow) % self.capacity
+                self._size -= overflow
+                dropped += overflow
+
+            first = min(length, self.capacity - self._write_pos)
+            self._view[self._write_pos:self._write_pos + first] = src[:first]
+            if first < length:
+                self._view[0:length - first] = src[first:]
+            self._write_pos = (self._write_pos + length) % self.capacity
+            self._size += length
+
+            dropped_frames = dropped // self.frame_size
+            if dropped_frames:
+                self.overruns += 1
+                self.dropped_frames += dropped_frames
+            # Пропущенные кадры тоже в счёте: read_index остаётся абсолютной позицией в потоке
+            self.written_frames += (length + skipped) // self.frame_size
+
+            self._data_ready.notify_all()
+
+        return dropped_frames
+
+    def read(self, frames: int, timeout: Optional[float] = None) -> Optional[memoryview]:
+        """
+        Читает ровно `frames` кадров. Предыдущий выданный кусок при этом
+        отпускается.
+
+        Возвращённый memoryview действителен до следующего вызова read(),
+        release() или clear(): до тех пор писатель не пишет в его место,
+        ни в блокирующем режиме, ни при переполнении.
+
+        Returns:
+            Optional[memoryview]: Данные или None, если кадров не набралось за timeout
+        """
+        length = min(frames * self.frame_size, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._lock:
+            self._release_locked()
+            while self._size < length:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.underruns += 1
+                    return None
+                self._data_ready.wait(remaining)
+
+            start = self._read_pos
+            if start + length <= self.capacity:
+                chunk = self._view[start:start + length]
+            else:
+                first = self.capacity - start
+                self._scratch_view[:first] = self._view[start:]
+                self._scratch_view[first:length] = self._view[:length - first]
+                chunk = self._scratch_view[:length]
+
+            self._read_pos = (self._read_pos + length) % self.capacity
+            self._size -= length
+            self._held = length
+            self.read_frames += length // self.frame_size
+
+        return chunk
+
+    def _release_locked(self):
+        if self._held:
+            self._held = 0
+            self._space_ready.notify_all()
+
+    def release(self):
+        """Отпускает последний выданный read() кусок, если читатель с ним закончил"""
+        with self._lock:
+            self._release_locked()
+
+    @property
+    def read_index(self) -> int:
+        """Абсолютный номер следующего непрочитанного кадра в счёте written_frames"""
+        with self._lock:
+            return self.written_frames - self._size // self.frame_size
+
+    def available(self) -> int:
+        with self._lock:
+            return self._size // self.frame_size
+
+    def clear(self):
+        with self._lock:
+            self._read_pos = self._write_pos
+            self._size = 0
+            self._held = 0
+            self._space_ready.notify_all()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'capacity_frames': self.capacity_frames,
+                'buffered_frames': self._size // self.frame_size,
+                'overruns': self.overruns,
+                'dropped_frames': self.dropped_frames,
+                'underruns': self.underruns,
+                'written_frames': self.written_frames,
+                'read_frames': self.read_frames
+            }
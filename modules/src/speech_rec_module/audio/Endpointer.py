@@ -0,0 +1,166 @@
+import numpy as np
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from utils.EnvHelper import getenv_int, getenv_float
+from .VoiceActivityDetector import VoiceActivityDetector
+
+
+class Endpointer:
+    """
+    Определение конца фразы быстрее встроенного эндпоинтера Kaldi.
+
+    Тишина в хвосте фразы считается по речевым окнам детектора, стабильность -
+    по тому, сколько чанков подряд промежуточная гипотеза не менялась.
+    Фраза закрывается, если после речи набралось `silence_ms` тишины, либо
+    гипотеза стабильна `stable_chunks` чанков и тишины уже `stable_silence_ms`.
+
+    Выигрыш считается относительно тишины, которую ждал сам Kaldi в фразах,
+    закрытых им раньше нас (пока таких нет - относительно `kaldi_silence_ms`).
+    """
+
+    TRIGGERS = ('silence', 'stable', 'max_length', 'kaldi')
+
+    def __init__(self,
+                 detector: VoiceActivityDetector,
+                 rate: int = 16000,
+                 chunk_ms: int = 100,
+                 silence_ms: int = 500,
+                 stable_chunks: int = 3,
+                 stable_silence_ms: int = 250,
+                 max_utterance_seconds: float = 15.0,
+                 kaldi_silence_ms: int = 1000,
+                 history_size: int = 50):
+        """
+        Args:
+            detector (VoiceActivityDetector): Детектор речевых окон
+            rate (int): Частота дискретизации
+            chunk_ms (int): Размер чанка, которым стоит подавать звук
+            silence_ms (int): Тишина после речи, закрывающая фразу
+            stable_chunks (int): Сколько чанков подряд гипотеза должна не меняться
+            stable_silence_ms (int): Минимальная тишина для закрытия по стабильной гипотезе
+            max_utterance_seconds (float): Принудительное закрытие слишком длинной фразы
+            kaldi_silence_ms (int): Оценка тишины, которую ждёт Kaldi, до первых измерений
+            history_size (int): Сколько последних фраз хранить в метриках
+        """
+        self.detector = detector
+        self.rate = rate
+        self.chunk_frames = max(1, rate * chunk_ms // 1000)
+        self.silence_frames = rate * silence_ms // 1000
+        self.stable_chunks = stable_chunks
+        self.stable_silence_frames = rate * stable_silence_ms // 1000
+        self.max_utterance_frames = int(rate * max_utterance_seconds)
+        self.kaldi_silence_ms = kaldi_silence_ms
+
+        self.utterances: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.triggers = {t: 0 for t in self.TRIGGERS}
+        self._kaldi_silence_total_ms = 0.0
+        self._kaldi_measured = 0
+
+        self.start()
+
+    @classmethod
+    def from_env(cls, detector: VoiceActivityDetector, rate: int) -> 'Endpointer':
+        """Эндпоинтер с настройками из init.properties (VOICE_RECOGNITION_ENDPOINT_*)"""
+        return cls(
+            detector=detector,
+            rate=rate,
+            chunk_ms=getenv_int("VOICE_RECOGNITION_ENDPOINT_CHUNK_MS", 100),
+            silence_ms=getenv_int("VOICE_RECOGNITION_ENDPOINT_SILENCE_MS", 500),
+            stable_chunks=getenv_int("VOICE_RECOGNITION_ENDPOINT_STABLE_CHUNKS", 3),
+            stable_silence_ms=getenv_int("VOICE_RECOGNITION_ENDPOINT_STABLE_SILENCE_MS", 250),
+            max_utterance_seconds=getenv_float("VOICE_RECOGNITION_ENDPOINT_MAX_UTTERANCE_SECONDS", 15.0),
+            kaldi_silence_ms=getenv_int("VOICE_RECOGNITION_ENDPOINT_KALDI_SILENCE_MS", 1000)
+        )
+
+    def start(self):
+        """Начало новой фразы"""
+        self.frames = 0
+        self.speech_windows = 0
+        self.trailing_silence = 0
+        self._last_partial = ''
+        self._stable_count = 0
+
+    @property
+    def heard_speech(self) -> bool:
+        return self.speech_windows >= self.detector.min_speech_windows
+
+    def observe(self, chunk) -> None:
+        """Учитывает звук, поданный распознавателю"""
+        mask = self.detector.speech_mask(chunk)
+        frames = len(chunk) // self.detector.frame_bytes
+        self.frames += frames
+
+        speech = np.flatnonzero(mask)
+        if speech.size:
+            self.speech_windows += int(speech.size)
+            self.trailing_silence = frames - int(speech[-1] + 1) * self.detector.window
+        else:
+            self.trailing_silence += frames
+
+    def check(self, partial: str) -> Optional[str]:
+        """
+        Проверяет, закончилась ли фраза, после очередного чанка.
+
+        Args:
+            partial (str): Текущая промежуточная гипотеза распознавателя
+
+        Returns:
+            Optional[str]: Причина закрытия фразы или None
+        """
+        if partial and partial == self._last_partial:
+            self._stable_count += 1
+        else:
+            self._stable_count = 0
+        self._last_partial = partial
+
+        if not partial or not self.heard_speech:
+            return None
+        if self.trailing_silence >= self.silence_frames:
+            return 'silence'
+        if self._stable_count >= self.stable_chunks and self.trailing_silence >= self.stable_silence_frames:
+            return 'stable'
+        if self.frames >= self.max_utterance_frames:
+            return 'max_length'
+        return None
+
+    def finish(self, trigger: str) -> Dict[str, Any]:
+        """
+        Фиксирует метрики закрытой фразы.
+
+        Args:
+            trigger (str): Кто закрыл фразу - одна из причин check() или 'kaldi'
+        """
+        silence_ms = self.trailing_silence * 1000 / self.rate
+        if trigger == 'kaldi':
+            self._kaldi_silence_total_ms += silence_ms
+            self._kaldi_measured += 1
+            saved_ms = 0.0
+        else:
+            saved_ms = max(self.kaldi_baseline_ms - silence_ms, 0.0)
+
+        record = {
+            'trigger': trigger,
+            'utterance_ms': round(self.frames * 1000 / self.rate, 1),
+            'trailing_silence_ms': round(silence_ms, 1),
+            'saved_ms': round(saved_ms, 1)
+        }
+        self.triggers[trigger] = self.triggers.get(trigger, 0) + 1
+        self.utterances.append(record)
+        self.start()
+        return record
+
+    @property
+    def kaldi_baseline_ms(self) -> float:
+        if self._kaldi_measured:
+            return self._kaldi_silence_total_ms / self._kaldi_measured
+        return float(self.kaldi_silence_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        forced = [u for u in self.utterances if u['trigger'] != 'kaldi']
+        return {
+            'triggers': dict(self.triggers),
+            'kaldi_baseline_ms': round(self.kaldi_baseline_ms, 1),
+            'kaldi_baseline_measured': self._kaldi_measured,
+            'mean_saved_ms': round(sum(u['saved_ms'] for u in forced) / len(forced), 1) if forced else 0.0,
+            'utterances': list(self.utterances)
+        }
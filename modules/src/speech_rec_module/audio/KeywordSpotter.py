@@ -0,0 +1,174 @@
+import time
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from .MfccExtractor import MfccExtractor
+
+
+class KeywordSpotter:
+    """
+    Лёгкий детектор имени ассистента: MFCC + DTW по нескольким записанным образцам.
+
+    Признаки считаются потоково, и раз в `check_interval_ms` хвост потока
+    сравнивается с каждым образцом через DTW с незакреплённым началом
+    (слово может начаться где угодно в буфере). Шаги пути ограничены
+    наклоном от 1/2 до 2, поэтому строки пути обновляются векторно.
+    Расстояние - средняя косинусная дистанция MFCC вдоль пути, так что
+    порог не зависит от длины образца.
+
+    Срабатывание - только кандидат: подтверждает его распознаватель Vosk.
+    """
+
+    def __init__(self,
+                 templates: List[np.ndarray],
+                 threshold: float,
+                 rate: int = 16000,
+                 check_interval_ms: int = 100,
+                 extractor: Optional[MfccExtractor] = None):
+        """
+        Args:
+            templates (List[np.ndarray]): MFCC образцов (frames x n_mfcc)
+            threshold (float): Порог расстояния DTW, ниже которого слово считается найденным
+            rate (int): Частота дискретизации
+            check_interval_ms (int): Как часто сравнивать хвост потока с образцами
+            extractor (Optional[MfccExtractor]): Извлекатель признаков с теми же параметрами, что при записи образцов
+        """
+        if not templates:
+            raise ValueError("At least one keyword template is required")
+
+        self.extractor = extractor or MfccExtractor(rate)
+        self.rate = rate
+        self.threshold = threshold
+        self.templates = [self._normalize(t) for t in templates]
+
+        longest = max(len(t) for t in self.templates)
+        self.check_frames = max(1, int(check_interval_ms * self.extractor.frames_per_second / 1000))
+        self.buffer_frames = 2 * longest + self.check_frames
+        self.min_frames = min(len(t) for t in self.templates) // 2
+
+        self._buffer = np.zeros((0, self.extractor.n_mfcc), dtype=np.float32)
+        self._pending = 0
+
+        self.checks = 0
+        self.detections = 0
+        self.match_seconds = 0.0
+        self.best_score: Optional[float] = None
+
+    @staticmethod
+    def _normalize(features: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        return (features / np.maximum(norms, 1e-6)).astype(np.float32)
+
+    @staticmethod
+    def distance(template: np.ndarray, features: np.ndarray, end_frames: int = 1) -> float:
+        """
+        DTW с незакреплённым началом: лучшее выравнивание всего образца на
+        участок features, заканчивающийся в последних `end_frames` кадрах.
+        Оба массива должны быть нормированы по строкам.
+        """
+        n, m = len(template), len(features)
+        if n == 0 or m == 0:
+            return float('inf')
+
+        cost = 1.0 - template @ features.T
+        prev2 = np.full(m, np.inf, dtype=np.float32)
+        prev = cost[0].copy()
+        for i in range(1, n):
+            best = np.full(m, np.inf, dtype=np.float32)
+            best[1:] = prev[:-1]
+            if m > 2:
+                best[2:] = np.minimum(best[2:], prev[:-2])
+            # Пропуск кадра образца: его стоимость всё равно входит в путь
+            best[1:] = np.minimum(best[1:], prev2[:-1] + cost[i - 1, 1:])
+            prev2, prev = prev, cost[i] + best
+        return float(prev[max(m - end_frames, 0):].min()) / n
+
+    def score(self, features: np.ndarray, end_frames: int = 1) -> float:
+        """Минимальное по образцам расстояние DTW"""
+        features = self._normalize(features)
+        return min(self.distance(t, features, end_frames) for t in self.templates)
+
+    def process(self, chunk) -> Optional[float]:
+        """
+        Добавляет звук и, если пора, проверяет хвост потока.
+
+        Returns:
+            Optional[float]: Расстояние до ближайшего образца, если оно ниже порога
+        """
+        features = self.extractor.process(chunk)
+        if len(features):
+            self._buffer = np.concatenate([self._buffer, features])[-self.buffer_frames:]
+            self._pending += len(features)
+        if self._pending < self.check_frames:
+            return None
+        return self.check()
+
+    def check(self) -> Optional[float]:
+        """Сравнивает накопленный хвост с образцами прямо сейчас (например, когда VAD закрыл речь)"""
+        end_frames, self._pending = max(self._pending, 1), 0
+        if len(self._buffer) < self.min_frames:
+            return None
+
+        start = time.perf_counter()
+        score = self.score(self._buffer, end_frames)
+        self.match_seconds += time.perf_counter() - start
+        self.checks += 1
+        self.best_score = score if self.best_score is None else min(self.best_score, score)
+
+        if score <= self.threshold:
+            self.detections += 1
+            return score
+        return None
+
+    def reset(self):
+        self.extractor.reset()
+        self._buffer = self._buffer[:0]
+        self._pending = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'templates': len(self.templates),
+            'threshold': round(self.threshold, 4),
+            'checks': self.checks,
+            'detections': self.detections,
+            'best_score': round(self.best_score, 4) if self.best_score is not None else None,
+            'mean_match_ms': round(self.match_seconds * 1000 / self.checks, 3) if self.checks else 0.0
+        }
+
+    @classmethod
+    def load(cls, path: str, rate: int, threshold: float = 0.0, check_interval_ms: int = 100) -> 'KeywordSpotter':
+        """
+        Загружает образцы, записанные enroll.py.
+
+        Args:
+            threshold (float): Порог вместо подобранного при записи (0 - взять из файла)
+        """
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Keyword templates not found: {path}")
+
+        with np.load(path) as data:
+            if int(data['rate']) != rate:
+                raise ValueError(f"Keyword templates were recorded at {int(data['rate'])} Hz, expected {rate} Hz")
+            extractor = MfccExtractor(rate, n_mels=int(data['n_mels']), n_mfcc=int(data['n_mfcc']))
+            templates = np.split(data['features'], np.cumsum(data['lengths'])[:-1])
+            return cls(
+                templates=templates,
+                threshold=threshold or float(data['threshold']),
+                rate=rate,
+                check_interval_ms=check_interval_ms,
+                extractor=extractor
+            )
+
+    @staticmethod
+    def save(path: str, templates: List[np.ndarray], threshold: float, extractor: MfccExtractor, name: str = ''):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            features=np.concatenate(templates).astype(np.float32),
+            lengths=np.array([len(t) for t in templates]),
+            threshold=threshold,
+            rate=extractor.rate,
+            n_mels=extractor.n_mels,
+            n_mfcc=extractor.n_mfcc,
+            name=name
+        )
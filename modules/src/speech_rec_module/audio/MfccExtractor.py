@@ -0,0 +1,101 @@
+import numpy as np
+from typing import Optional
+
+
+class MfccExtractor:
+    """
+    Лог-мел спектр и MFCC для int16 PCM на чистом NumPy.
+
+    Работает потоково: хвост, не набравший целого окна, остаётся до следующего
+    чанка, так что признаки нарезанного звука совпадают с признаками цельного.
+    Нулевой коэффициент (энергия) отбрасывается, поэтому признаки не зависят
+    от громкости.
+    """
+
+    def __init__(self,
+                 rate: int = 16000,
+                 window_ms: int = 25,
+                 hop_ms: int = 10,
+                 n_mels: int = 40,
+                 n_mfcc: int = 13,
+                 fmin: float = 60.0,
+                 fmax: Optional[float] = None):
+        """
+        Args:
+            rate (int): Частота дискретизации
+            window_ms (int): Длина окна анализа в мс
+            hop_ms (int): Шаг окна в мс
+            n_mels (int): Число мел-фильтров
+            n_mfcc (int): Число кепстральных коэффициентов (без нулевого)
+            fmin (float): Нижняя частота мел-шкалы
+            fmax (Optional[float]): Верхняя частота мел-шкалы (по умолчанию rate / 2)
+        """
+        self.rate = rate
+        self.window = rate * window_ms // 1000
+        self.hop = rate * hop_ms // 1000
+        self.n_mels = n_mels
+        self.n_mfcc = n_mfcc
+        self.n_fft = 1 << (self.window - 1).bit_length()
+
+        self._hamming = np.hamming(self.window).astype(np.float32)
+        self._mel = self._mel_filterbank(fmin, fmax or rate / 2)
+        self._dct = self._dct_matrix()[1:n_mfcc + 1]
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    @property
+    def frames_per_second(self) -> float:
+        return self.rate / self.hop
+
+    def _mel_filterbank(self, fmin: float, fmax: float) -> np.ndarray:
+        to_mel = lambda f: 2595.0 * np.log10(1.0 + f / 700.0)
+        to_hz = lambda m: 700.0 * (10 ** (m / 2595.0) - 1.0)
+
+        bins = np.floor((self.n_fft + 1) * to_hz(np.linspace(to_mel(fmin), to_mel(fmax), self.n_mels + 2)) / self.rate).astype(int)
+        bank = np.zeros((self.n_mels, self.n_fft // 2 + 1), dtype=np.float32)
+        for m in range(1, self.n_mels + 1):
+            left, center, right = bins[m - 1], bins[m], bins[m + 1]
+            if center > left:
+                bank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+            if right > center:
+                bank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+        return bank
+
+    def _dct_matrix(self) -> np.ndarray:
+        n = np.arange(self.n_mels)
+        k = np.arange(self.n_mels)[:, None]
+        dct = np.cos(np.pi / self.n_mels * (n + 0.5) * k) * np.sqrt(2.0 / self.n_mels)
+        dct[0] /= np.sqrt(2.0)
+        return dct.astype(np.float32)
+
+    def _frames(self, samples: np.ndarray) -> np.ndarray:
+        count = 1 + (len(samples) - self.window) // self.hop
+        if count <= 0:
+            return np.zeros((0, self.window), dtype=np.float32)
+        return np.lib.stride_tricks.as_strided(
+            samples,
+            shape=(count, self.window),
+            strides=(samples.strides[0] * self.hop, samples.strides[0])
+        )
+
+    def log_mel(self, frames: np.ndarray) -> np.ndarray:
+        """Лог-мел энергии окон (frames x window) -> (frames x n_mels)"""
+        if not len(frames):
+            return np.zeros((0, self.n_mels), dtype=np.float32)
+        emphasized = frames - 0.97 * np.concatenate([frames[:, :1], frames[:, :-1]], axis=1)
+        spectrum = np.abs(np.fft.rfft(emphasized * self._hamming, n=self.n_fft)) ** 2
+        return np.log(spectrum.astype(np.float32) @ self._mel.T + 1e-6)
+
+    def mfcc(self, pcm) -> np.ndarray:
+        """MFCC цельного фрагмента (без учёта хвоста потока)"""
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        return self.log_mel(self._frames(samples)) @ self._dct.T
+
+    def process(self, chunk) -> np.ndarray:
+        """Потоковый вариант mfcc(): признаки всех окон, которые закончились в этом чанке"""
+        samples = np.concatenate([self._tail, np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0])
+        frames = self._frames(samples)
+        self._tail = samples[len(frames) * self.hop:].copy()
+        return self.log_mel(frames) @ self._dct.T
+
+    def reset(self):
+        self._tail = np.zeros(0, dtype=np.float32)
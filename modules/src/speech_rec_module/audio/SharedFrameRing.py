@@ -0,0 +1,255 @@
+import os
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .SharedRingConsumer import SharedRingConsumer
+
+
+class SharedFrameRing:
+    """
+    Кольцо PCM кадров в multiprocessing.shared_memory: один писатель, много читателей.
+
+    Сегмент состоит из заголовка (int64 поля, курсоры читателей), таблицы
+    имён читателей и области данных. Первые `overhang_frames` кадров кольца
+    дублируются за его концом, поэтому любое чтение не длиннее overhang
+    отдаётся одним непрерывным memoryview прямо из общей памяти, без копий.
+
+    Писатель не ждёт читателей: отставший больше чем на ёмкость читатель
+    перескакивает вперёд, потерянные кадры попадают в его статистику.
+    Другие процессы подключаются по имени сегмента через attach().
+    В заголовке хранится pid писателя: по нему новый писатель отличает
+    сегмент упавшего процесса от шины, которую ещё кто-то публикует.
+    """
+
+    MAGIC = 0x5641425553  # "VABUS"
+    NAME_SIZE = 32
+    CONSUMER_FIELDS = 8
+
+    # Поля заголовка
+    H_MAGIC, H_CAPACITY, H_FRAME_SIZE, H_OVERHANG, H_MAX_CONSUMERS, H_WRITE_INDEX, H_PRODUCER_ALIVE, H_PRODUCER_PID = range(8)
+    HEADER_FIELDS = 8
+
+    # Поля слота читателя
+    C_ACTIVE, C_READ_INDEX, C_OVERRUNS, C_DROPPED, C_READ_FRAMES = range(5)
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+
+        header = np.ndarray((self.HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        if int(header[self.H_MAGIC]) != self.MAGIC:
+            raise ValueError(f"Shared memory '{shm.name}' is not an audio frame ring")
+
+        self.capacity_frames = int(header[self.H_CAPACITY])
+        self.frame_size = int(header[self.H_FRAME_SIZE])
+        self.overhang_frames = int(header[self.H_OVERHANG])
+        self.max_consumers = int(header[self.H_MAX_CONSUMERS])
+        self._map(header)
+
+    def _map(self, header: np.ndarray):
+        self._header = header
+        slots_offset = self.HEADER_FIELDS * 8
+        self._slots = np.ndarray(
+            (self.max_consumers, self.CONSUMER_FIELDS), dtype=np.int64,
+            buffer=self.shm.buf, offset=slots_offset
+        )
+        names_offset = slots_offset + self.max_consumers * self.CONSUMER_FIELDS * 8
+        self._names = self.shm.buf[names_offset:names_offset + self.max_consumers * self.NAME_SIZE]
+
+        data_offset = self._data_offset(self.max_consumers)
+        self.capacity = self.capacity_frames * self.frame_size
+        self._data = self.shm.buf[data_offset:data_offset + self.capacity + self.overhang_frames * self.frame_size]
+
+    @classmethod
+    def _data_offset(cls, max_consumers: int) -> int:
+        size = cls.HEADER_FIELDS * 8 + max_consumers * (cls.CONSUMER_FIELDS * 8 + cls.NAME_SIZE)
+        return (size + 63) // 64 * 64
+
+    @classmethod
+    def create(cls,
+               name: Optional[str],
+               capacity_frames: int,
+               frame_size: int = 2,
+               max_consumers: int = 8,
+               overhang_frames: int = 8192) -> 'SharedFrameRing':
+        """
+        Создаёт сегмент (писатель). Владелец удаляет его в close().
+
+        Args:
+            name (Optional[str]): Имя сегмента; None - сгенерировать
+            capacity_frames (int): Ёмкость кольца в кадрах
+            frame_size (int): Байт на кадр (sample_width * channels)
+            max_consumers (int): Максимум одновременно подключённых читателей
+            overhang_frames (int): Максимальный размер одного чтения без копирования
+        """
+        overhang_frames = min(overhang_frames, capacity_frames)
+        size = cls._data_offset(max_consumers) + (capacity_frames + overhang_frames) * frame_size
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        header = np.ndarray((cls.HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[cls.H_CAPACITY] = capacity_frames
+        header[cls.H_FRAME_SIZE] = frame_size
+        header[cls.H_OVERHANG] = overhang_frames
+        header[cls.H_MAX_CONSUMERS] = max_consumers
+        header[cls.H_PRODUCER_ALIVE] = 1
+        header[cls.H_PRODUCER_PID] = os.getpid()
+        np.ndarray((max_consumers * cls.CONSUMER_FIELDS,), dtype=np.int64, buffer=shm.buf, offset=cls.HEADER_FIELDS * 8)[:] = 0
+        header[cls.H_MAGIC] = cls.MAGIC
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedFrameRing':
+        """Подключается к существующему сегменту по имени (читатель, в том числе из другого процесса)"""
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+        except TypeError:
+            # До Python 3.13 подключившийся процесс регистрирует сегмент в resource_tracker и удаляет его при выходе
+            shm = shared_memory.SharedMemory(name=name)
+            try:
+                resource_tracker.unregister(shm._name, 'shared_memory')  # type: ignore[attr-defined]
+            except Exception:
+                pass
+        return cls(shm, owner=False)
+
+    @property
+    def write_index(self) -> int:
+        """Сколько кадров записано с момента создания"""
+        return int(self._header[self.H_WRITE_INDEX])
+
+    @property
+    def producer_alive(self) -> bool:
+        return bool(self._header[self.H_PRODUCER_ALIVE])
+
+    @property
+    def producer_pid(self) -> int:
+        return int(self._header[self.H_PRODUCER_PID])
+
+    def is_abandoned(self) -> bool:
+        """Писатель закрыл сегмент или его процесса больше нет"""
+        if not self.producer_alive:
+            return True
+        pid = self.producer_pid
+        if pid <= 0:
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def write(self, data) -> int:
+        """
+        Дописывает кадры. Индекс записи публикуется после копирования данных,
+        поэтому читатель не увидит наполовину записанный чанк.
+
+        Returns:
+            int: Количество записанных кадров
+        """
+        view = memoryview(data).cast('B')
+        length = len(view) - len(view) % self.frame_size
+        if length <= 0:
+            return 0
+        if length > self.capacity:
+            view = view[length - self.capacity:length]
+            skipped = (length - self.capacity) // self.frame_size
+            length = self.capacity
+        else:
+            view = view[:length]
+            skipped = 0
+
+        write_index = self.write_index + skipped
+        pos = (write_index % self.capacity_frames) * self.frame_size
+
+        first = min(length, self.capacity - pos)
+        self._data[pos:pos + first] = view[:first]
+        if first < length:
+            self._data[0:length - first] = view[first:]
+
+        # Зеркалим начало кольца за его конец, чтобы чтения через границу были непрерывными
+        overhang = self.overhang_frames * self.frame_size
+        if pos < overhang:
+            end = min(pos + first, overhang)
+            self._data[self.capacity + pos:self.capacity + end] = self._data[pos:end]
+        if first < length:
+            end = min(length - first, overhang)
+            self._data[self.capacity:self.capacity + end] = self._data[0:end]
+
+        self._header[self.H_WRITE_INDEX] = write_index + length // self.frame_size
+        return length // self.frame_size
+
+    def consumer(self, name: str, from_latest: bool = True) -> 'SharedRingConsumer':
+        """
+        Регистрирует читателя (или возвращает слот читателя с тем же именем).
+
+        Args:
+            name (str): Имя читателя, до 32 байт в UTF-8
+            from_latest (bool): Начинать с текущей позиции записи, а не с самого старого кадра в кольце
+        """
+        from .SharedRingConsumer import SharedRingConsumer
+
+        encoded = name.encode('utf-8')[:self.NAME_SIZE]
+        free_slot = None
+        for slot in range(self.max_consumers):
+            if self._slots[slot, self.C_ACTIVE]:
+                if self._slot_name(slot) == encoded:
+                    return SharedRingConsumer(self, slot, name)
+            elif free_slot is None:
+                free_slot = slot
+
+        if free_slot is None:
+            raise RuntimeError(f"No free consumer slots in '{self.name}' (max {self.max_consumers})")
+
+        start = self.write_index if from_latest else max(self.write_index - self.capacity_frames, 0)
+        self._slots[free_slot, :] = 0
+        self._slots[free_slot, self.C_READ_INDEX] = start
+        self._names[free_slot * self.NAME_SIZE:(free_slot + 1) * self.NAME_SIZE] = encoded.ljust(self.NAME_SIZE, b'\0')
+        self._slots[free_slot, self.C_ACTIVE] = 1
+        return SharedRingConsumer(self, free_slot, name)
+
+    def _slot_name(self, slot: int) -> bytes:
+        return bytes(self._names[slot * self.NAME_SIZE:(slot + 1) * self.NAME_SIZE]).rstrip(b'\0')
+
+    def get_stats(self) -> Dict[str, Any]:
+        write_index = self.write_index
+        consumers: List[Dict[str, Any]] = []
+        for slot in range(self.max_consumers):
+            if not self._slots[slot, self.C_ACTIVE]:
+                continue
+            consumers.append({
+                'name': self._slot_name(slot).decode('utf-8', errors='replace'),
+                'lag_frames': write_index - int(self._slots[slot, self.C_READ_INDEX]),
+                'overruns': int(self._slots[slot, self.C_OVERRUNS]),
+                'dropped_frames': int(self._slots[slot, self.C_DROPPED]),
+                'read_frames': int(self._slots[slot, self.C_READ_FRAMES])
+            })
+        return {
+            'name': self.name,
+            'capacity_frames': self.capacity_frames,
+            'write_index': write_index,
+            'consumers': consumers
+        }
+
+    def close(self):
+        """Отключается от сегмента; владелец (писатель) ещё и удаляет его"""
+        if self.owner:
+            self._header[self.H_PRODUCER_ALIVE] = 0
+        self._header = None  # type: ignore
+        self._slots = None  # type: ignore
+        self._names.release()
+        self._data.release()
+        try:
+            self.shm.close()
+        except BufferError:
+            # Кто-то ещё держит view из read(); отображение снимется вместе с ним
+            print(f"[SharedFrameRing] '{self.name}' closed while consumer views are still alive")
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
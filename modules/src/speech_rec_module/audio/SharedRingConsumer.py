@@ -0,0 +1,97 @@
+import time
+from typing import Any, Dict, Optional
+
+
+class SharedRingConsumer:
+    """
+    Курсор одного читателя SharedFrameRing. Позиция и счётчики хранятся
+    в общей памяти, так что их видит и писатель, и get_stats() из любого процесса.
+    """
+
+    def __init__(self, ring, slot: int, name: str):
+        self.ring = ring
+        self.slot = slot
+        self.name = name
+
+    def _get(self, field: int) -> int:
+        return int(self.ring._slots[self.slot, field])
+
+    def _add(self, field: int, value: int):
+        self.ring._slots[self.slot, field] += value
+
+    @property
+    def read_index(self) -> int:
+        return self._get(self.ring.C_READ_INDEX)
+
+    def available(self) -> int:
+        return self.ring.write_index - self.read_index
+
+    @property
+    def lag_frames(self) -> int:
+        return self.available()
+
+    def _catch_up(self, write_index: int) -> int:
+        """Если писатель обогнал читателя на круг, перескакивает на самый старый целый кадр"""
+        read_index = self.read_index
+        oldest = write_index - self.ring.capacity_frames
+        if read_index < oldest:
+            self._add(self.ring.C_OVERRUNS, 1)
+            self._add(self.ring.C_DROPPED, oldest - read_index)
+            self.ring._slots[self.slot, self.ring.C_READ_INDEX] = oldest
+            return oldest
+        return read_index
+
+    def read(self, frames: int, timeout: Optional[float] = None, poll_interval: float = 0.002) -> Optional[memoryview]:
+        """
+        Возвращает ровно `frames` кадров. Чтение не длиннее overhang_frames
+        отдаётся memoryview прямо на общую память, без копии; view действителен,
+        пока писатель не сделал круг (см. is_intact()). Более длинное чтение
+        через границу кольца собирается в копию.
+
+        Returns:
+            Optional[memoryview]: Данные или None, если кадров не набралось за timeout
+                                  или писатель закрыл кольцо
+        """
+        if frames > self.ring.capacity_frames:
+            raise ValueError(f"Cannot read {frames} frames from ring of {self.ring.capacity_frames} frames")
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            write_index = self.ring.write_index
+            read_index = self._catch_up(write_index)
+            if write_index - read_index >= frames:
+                break
+            if not self.ring.producer_alive:
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+        frame_size = self.ring.frame_size
+        pos = (read_index % self.ring.capacity_frames) * frame_size
+        length = frames * frame_size
+        if frames <= self.ring.overhang_frames:
+            view = self.ring._data[pos:pos + length]
+        else:
+            first = min(length, self.ring.capacity - pos)
+            view = memoryview(bytes(self.ring._data[pos:pos + first]) + bytes(self.ring._data[0:length - first]))
+        self.ring._slots[self.slot, self.ring.C_READ_INDEX] = read_index + frames
+        self._add(self.ring.C_READ_FRAMES, frames)
+        return view
+
+    def is_intact(self, frames_back: int) -> bool:
+        """Не перезаписаны ли ещё последние `frames_back` прочитанных кадров"""
+        return self.ring.write_index - (self.read_index - frames_back) <= self.ring.capacity_frames
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'lag_frames': self.lag_frames,
+            'overruns': self._get(self.ring.C_OVERRUNS),
+            'dropped_frames': self._get(self.ring.C_DROPPED),
+            'read_frames': self._get(self.ring.C_READ_FRAMES)
+        }
+
+    def close(self):
+        """Освобождает слот читателя"""
+        self.ring._slots[self.slot, self.ring.C_ACTIVE] = 0
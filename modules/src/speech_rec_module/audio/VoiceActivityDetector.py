@@ -0,0 +1,184 @@
+import numpy as np
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from utils.EnvHelper import getenv_int, getenv_float
+
+
+class VoiceActivityDetector:
+    """
+    Энергетический детектор речи для int16 PCM.
+
+    Чанк режется на короткие окна, по каждому окну векторно считаются RMS и
+    доля переходов через ноль. Окно считается речью, если энергия выше
+    адаптивного уровня шума и ZCR не похож на шипение. После окончания речи
+    гейт держится открытым ещё `hangover_ms`, а перед началом речи в распознаватель
+    отдаётся `preroll_ms` накопленного звука, чтобы не срезать начало слова.
+
+    Уровень шума подстраивается по окнам тишины, а чтобы ровный рост шума
+    (гул, вентилятор) не держал гейт открытым навсегда, дополнительно
+    отслеживается минимум RMS за последние `noise_window_ms`: если даже самое
+    тихое окно громче текущего уровня, уровень тянется к этому минимуму.
+    Многоканальный звук перед анализом сводится в моно.
+    """
+
+    def __init__(self,
+                 rate: int = 16000,
+                 window_ms: int = 20,
+                 energy_ratio: float = 3.0,
+                 min_rms: float = 150.0,
+                 zcr_max: float = 0.4,
+                 min_speech_windows: int = 2,
+                 hangover_ms: int = 400,
+                 preroll_ms: int = 300,
+                 noise_adapt_rate: float = 0.05,
+                 noise_window_ms: int = 2000,
+                 channels: int = 1):
+        """
+        Args:
+            rate (int): Частота дискретизации
+            window_ms (int): Длина окна анализа в мс
+            energy_ratio (float): Во сколько раз RMS окна должен превышать уровень шума
+            min_rms (float): Абсолютный нижний порог RMS для речи
+            zcr_max (float): Максимальная доля переходов через ноль для речи
+            min_speech_windows (int): Сколько речевых окон нужно в чанке, чтобы открыть гейт
+            hangover_ms (int): Сколько держать гейт открытым после конца речи
+            preroll_ms (int): Сколько звука до начала речи отдать распознавателю
+            noise_adapt_rate (float): Скорость адаптации уровня шума (0..1)
+            noise_window_ms (int): Окно минимальной статистики для роста уровня шума
+            channels (int): Число каналов int16 PCM
+        """
+        self.rate = rate
+        self.window = max(1, rate * window_ms // 1000)
+        self.energy_ratio = energy_ratio
+        self.min_rms = min_rms
+        self.zcr_max = zcr_max
+        self.min_speech_windows = min_speech_windows
+        self.hangover_frames = rate * hangover_ms // 1000
+        self.preroll_frames = rate * preroll_ms // 1000
+        self.noise_adapt_rate = noise_adapt_rate
+        self.noise_window_frames = rate * noise_window_ms // 1000
+        self.channels = max(1, channels)
+        self.frame_bytes = 2 * self.channels
+
+        self.noise_floor: Optional[float] = None
+        self._window_minimums: Deque[Tuple[int, float]] = deque()
+        self._window_minimums_frames = 0
+        self.in_speech = False
+        self._hangover_left = 0
+
+        self._preroll: Deque[bytes] = deque()
+        self._preroll_size = 0
+
+        self.total_frames = 0
+        self.passed_frames = 0
+        self.speech_segments = 0
+
+    @classmethod
+    def from_env(cls, rate: int, channels: int = 1) -> 'VoiceActivityDetector':
+        """Детектор с порогами из init.properties (VOICE_RECOGNITION_VAD_*)"""
+        return cls(
+            rate=rate,
+            channels=channels,
+            noise_window_ms=getenv_int("VOICE_RECOGNITION_VAD_NOISE_WINDOW_MS", 2000),
+            energy_ratio=getenv_float("VOICE_RECOGNITION_VAD_ENERGY_RATIO", 3.0),
+            min_rms=getenv_float("VOICE_RECOGNITION_VAD_MIN_RMS", 150.0),
+            zcr_max=getenv_float("VOICE_RECOGNITION_VAD_ZCR_MAX", 0.4),
+            hangover_ms=getenv_int("VOICE_RECOGNITION_VAD_HANGOVER_MS", 400),
+            preroll_ms=getenv_int("VOICE_RECOGNITION_VAD_PREROLL_MS", 300)
+        )
+
+    def is_speech(self, chunk) -> bool:
+        """Анализирует чанк и обновляет уровень шума. Не меняет состояние гейта."""
+        return int(np.count_nonzero(self.speech_mask(chunk))) >= self.min_speech_windows
+
+    def speech_mask(self, chunk) -> np.ndarray:
+        """Речевые окна чанка (по одному bool на окно); обновляет уровень шума"""
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        if self.channels > 1:
+            samples = samples[:len(samples) // self.channels * self.channels].reshape(-1, self.channels).mean(axis=1)
+        windows_count = len(samples) // self.window
+        if windows_count == 0:
+            return np.zeros(0, dtype=bool)
+
+        x = samples[:windows_count * self.window].reshape(windows_count, self.window).astype(np.float32)
+        rms = np.sqrt(np.mean(x * x, axis=1))
+        signs = np.signbit(x)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        if self.noise_floor is None:
+            self.noise_floor = float(np.median(rms))
+
+        threshold = max(self.min_rms, self.noise_floor * self.energy_ratio)
+        speech_mask = (rms > threshold) & (zcr < self.zcr_max)
+
+        noise_rms = rms[~speech_mask]
+        if noise_rms.size:
+            self.noise_floor += self.noise_adapt_rate * (float(np.median(noise_rms)) - self.noise_floor)
+
+        # Минимальная статистика по всем окнам: в речи есть паузы, а ровный шум не опускается ниже себя
+        self._window_minimums.append((windows_count * self.window, float(rms.min())))
+        self._window_minimums_frames += windows_count * self.window
+        while len(self._window_minimums) > 1 and \
+                self._window_minimums_frames - self._window_minimums[0][0] >= self.noise_window_frames:
+            self._window_minimums_frames -= self._window_minimums.popleft()[0]
+        recent_minimum = min(m for _, m in self._window_minimums)
+        if self._window_minimums_frames >= self.noise_window_frames and recent_minimum > self.noise_floor:
+            self.noise_floor += self.noise_adapt_rate * (recent_minimum - self.noise_floor)
+
+        return speech_mask
+
+    def process(self, chunk) -> List[bytes]:
+        """
+        Пропускает чанк через гейт.
+
+        Returns:
+            List[bytes]: Чанки для распознавателя (пусто, если это тишина)
+        """
+        frames = len(chunk) // self.frame_bytes
+        self.total_frames += frames
+
+        if self.is_speech(chunk):
+            self._hangover_left = self.hangover_frames
+            out: List[bytes] = []
+            if not self.in_speech:
+                self.in_speech = True
+                self.speech_segments += 1
+                out.extend(self._preroll)
+                self.passed_frames += self._preroll_size
+                self._preroll.clear()
+                self._preroll_size = 0
+            out.append(bytes(chunk))
+            self.passed_frames += frames
+            return out
+
+        if self.in_speech and self._hangover_left > 0:
+            self._hangover_left -= frames
+            self.passed_frames += frames
+            return [bytes(chunk)]
+
+        self.in_speech = False
+        self._push_preroll(bytes(chunk))
+        return []
+
+    def _push_preroll(self, chunk: bytes):
+        self._preroll.append(chunk)
+        self._preroll_size += len(chunk) // self.frame_bytes
+        while self._preroll and self._preroll_size - len(self._preroll[0]) // self.frame_bytes >= self.preroll_frames:
+            self._preroll_size -= len(self._preroll.popleft()) // self.frame_bytes
+
+    def reset(self):
+        self.in_speech = False
+        self._hangover_left = 0
+        self._preroll.clear()
+        self._preroll_size = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        skipped = max(self.total_frames - self.passed_frames, 0)
+        return {
+            'total_frames': self.total_frames,
+            'passed_frames': self.passed_frames,
+            'skipped_frames': skipped,
+            'skipped_ratio': round(skipped / self.total_frames, 4) if self.total_frames else 0.0,
+            'speech_segments': self.speech_segments,
+            'noise_floor': round(self.noise_floor or 0.0, 2)
+        }
@@ -0,0 +1,64 @@
+from collections import deque
+from typing import Deque, Iterable, Optional, Tuple
+
+
+class WakeAudioHistory:
+    """
+    Последние секунды звука, скормленного wake-распознавателю.
+
+    Нужна, чтобы после срабатывания имени отдать полному распознавателю то,
+    что сказано сразу за именем в той же фразе. Тайминги слов Vosk считает
+    от создания распознавателя, поэтому позиции чанков хранятся в том же
+    абсолютном счёте кадров (он не сбрасывается вместе с историей).
+    """
+
+    def __init__(self, rate: int, frame_size: int, history_frames: int, wake_tokens: Iterable[str]):
+        """
+        Args:
+            rate (int): Частота дискретизации
+            frame_size (int): Байт на кадр
+            history_frames (int): Сколько последних кадров хранить
+            wake_tokens (Iterable[str]): Последние слова имён; по концу такого слова режется звук
+        """
+        self.rate = rate
+        self.frame_size = frame_size
+        self.history_frames = history_frames
+        self.wake_tokens = set(wake_tokens)
+
+        self._chunks: Deque[Tuple[int, bytes]] = deque()
+        self._frames = 0
+        self._fed_frames = 0
+
+    def remember(self, chunk: bytes):
+        frames = len(chunk) // self.frame_size
+        self._chunks.append((self._fed_frames, chunk))
+        self._frames += frames
+        self._fed_frames += frames
+        while self._chunks and self._frames - len(self._chunks[0][1]) // self.frame_size >= self.history_frames:
+            self._frames -= len(self._chunks.popleft()[1]) // self.frame_size
+
+    def forget(self):
+        self._chunks.clear()
+        self._frames = 0
+
+    def after_wake_word(self, words: Optional[list]) -> bytes:
+        """
+        Вырезает из запомненного звука всё, что идёт после имени.
+        Если таймингов нет, ничего не отдаём, чтобы не скормить хвост имени.
+        """
+        end_frame = None
+        for w in words or []:
+            if (w.get('word') or '').lower() in self.wake_tokens:
+                end_frame = int(float(w.get('end', 0)) * self.rate)
+                break
+
+        if end_frame is None or not self._chunks or end_frame < self._chunks[0][0]:
+            return b''
+
+        parts = []
+        for start, chunk in self._chunks:
+            stop = start + len(chunk) // self.frame_size
+            if stop <= end_frame:
+                continue
+            parts.append(chunk[max(end_frame - start, 0) * self.frame_size:])
+        return b''.join(parts)
@@ -0,0 +1,21 @@
+from .AudioRingBuffer import AudioRingBuffer
+from .AudioCapture import AudioCapture
+from .VoiceActivityDetector import VoiceActivityDetector
+from .Endpointer import Endpointer
+from .SharedFrameRing import SharedFrameRing
+from .SharedRingConsumer import SharedRingConsumer
+from .MfccExtractor import MfccExtractor
+from .KeywordSpotter import KeywordSpotter
+from .WakeAudioHistory import WakeAudioHistory
+
+__all__ = [
+    "AudioRingBuffer",
+    "AudioCapture",
+    "VoiceActivityDetector",
+    "Endpointer",
+    "SharedFrameRing",
+    "SharedRingConsumer",
+    "MfccExtractor",
+    "KeywordSpotter",
+    "WakeAudioHistory"
+]
@@ -0,0 +1,277 @@
+"""
+Бенчмарк конвейера распознавания речи на размеченных WAV.
+
+Рядом с каждым `<file>.wav` может лежать `<file>.json` с разметкой:
+    {"wake_end": 0.82, "speech_end": 2.9, "text": "открой браузер"}
+
+Запуск из каталога modules:
+    python -m src.speech_rec_module.benchmark --dir corpus/ --output report.json \
+        --set VOICE_RECOGNITION_FULL_DETECTION_BUFFER=4096
+
+В режиме --realtime файлы проигрываются со скоростью записи, и задержки
+считаются по настенным часам. Без него звук подаётся так быстро, как успевает
+декодер, а задержки считаются по позиции в аудио, которую декодер успел
+забрать к моменту события (то есть показывают вклад размеров буферов и
+эндпоинтинга, без времени вычислений).
+
+--compare-wake прогоняет корпус дважды, с распознаванием имени через Kaldi
+и через KeywordSpotter, и сравнивает процессорное время, потраченное на
+ожидание имени. На записях фона комнаты без обращений это и есть простой.
+"""
+import os
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import sys
+import json
+import time
+import argparse
+import statistics
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from paths import path_resolver
+from utils.EnvHelper import getenv, getenv_int, getenv_bool, setenv
+from enums.Events import EventsTopic
+from src.speech_rec_module.services import Recognizer
+from src.speech_rec_module.providers.audio import FileSource
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 2)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return round(getattr(info, 'peak_wset', info.rss) / (1024 * 1024), 2)
+    except Exception:
+        return None
+
+
+def _word_error_rate(reference: str, hypothesis: str) -> Optional[float]:
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return None
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return round(prev[-1] / len(ref), 4)
+
+
+def _percentiles(values: List[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+    return {
+        'count': len(ordered),
+        'mean': round(statistics.fmean(ordered), 4),
+        'p50': round(pick(0.5), 4),
+        'p95': round(pick(0.95), 4),
+        'max': round(ordered[-1], 4)
+    }
+
+
+def _load_label(wav_path: Path) -> Dict[str, Any]:
+    label_path = wav_path.with_suffix('.json')
+    if not label_path.exists():
+        return {}
+    with open(label_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _make_source(path: Path, realtime: bool) -> FileSource:
+    return FileSource(
+        rate=getenv_int("VOICE_RECOGNITION_DISCRETIZATION_RATE", 16000),
+        channels=getenv_int("VOICE_RECOGNITION_CHANNELS", 1),
+        frames_per_buffer=getenv_int("VOICE_RECOGNITION_FULL_DETECTION_BUFFER", 8192),
+        path=str(path),
+        realtime=realtime
+    )
+
+
+def run_file(recognizer: Recognizer, path: Path, realtime: bool, first: bool) -> Dict[str, Any]:
+    service = recognizer.services['speech_recognition']
+    source = _make_source(path, realtime)
+    duration = source.duration
+    label = _load_label(path)
+
+    if not first:
+        recognizer.set_audio_source(source)
+
+    position_start = service.get_audio_position()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    def timeline() -> float:
+        if realtime:
+            return time.perf_counter() - wall_start
+        return service.get_audio_position() - position_start  # type: ignore
+
+    wake_at: Optional[float] = None
+    final_at: Optional[float] = None
+    transcripts: List[str] = []
+    endpoints: List[Dict[str, Any]] = []
+
+    for item in recognizer.run(threading.Event()):
+        topic = item.get('topic')
+        if topic == EventsTopic.ACTION_WAKE.value and wake_at is None:
+            wake_at = timeline()
+        elif topic == EventsTopic.RAW_TEXT_DATA_RECOGNIZED.value:
+            if final_at is None:
+                final_at = timeline()
+            transcripts.append(item.get('payload', {}).get('text', ''))
+            if item.get('payload', {}).get('endpoint'):
+                endpoints.append(item['payload']['endpoint'])
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    transcript = ' '.join(t for t in transcripts if t)
+
+    result: Dict[str, Any] = {
+        'file': path.name,
+        'audio_seconds': round(duration, 3),
+        'wall_seconds': round(wall, 3),
+        'real_time_factor': round(wall / duration, 4) if duration else None,
+        'cpu_seconds_per_audio_second': round(cpu / duration, 4) if duration else None,
+        'wake_detected': wake_at is not None,
+        'wake_event_at': round(wake_at, 3) if wake_at is not None else None,
+        'final_event_at': round(final_at, 3) if final_at is not None else None,
+        'wake_latency': None,
+        'end_of_utterance_latency': None,
+        'endpoints': endpoints,
+        'transcript': transcript,
+        'reference': label.get('text'),
+        'wer': _word_error_rate(label['text'], transcript) if label.get('text') else None
+    }
+    if wake_at is not None and label.get('wake_end') is not None:
+        result['wake_latency'] = round(wake_at - float(label['wake_end']), 4)
+    if final_at is not None and label.get('speech_end') is not None:
+        result['end_of_utterance_latency'] = round(final_at - float(label['speech_end']), 4)
+    return result
+
+
+def run_benchmark(corpus_dir: str, realtime: bool = False, model_path: Optional[str] = None) -> Dict[str, Any]:
+    files = sorted(Path(corpus_dir).glob('*.wav'))
+    if not files:
+        raise FileNotFoundError(f"No .wav files found in {corpus_dir}")
+
+    model_path = model_path or path_resolver['voice_model_path']
+    assistant_name = getenv('ASSISTANT_NAME', 'Ассистент').strip('"')
+
+    load_start = time.perf_counter()
+    recognizer = Recognizer(
+        name=assistant_name,
+        VOICE_RECOGNITION_MODEL_DIR_PATH=model_path,
+        audio_source=_make_source(files[0], realtime)
+    )
+    load_seconds = time.perf_counter() - load_start
+
+    results = [run_file(recognizer, path, realtime, first=(i == 0)) for i, path in enumerate(files)]
+    recognizer.cleanup()
+
+    audio_total = sum(r['audio_seconds'] for r in results)
+    wall_total = sum(r['wall_seconds'] for r in results)
+    wers = [r['wer'] for r in results if r['wer'] is not None]
+
+    return {
+        'config': {
+            'model_path': model_path,
+            'realtime': realtime,
+            'timeline': 'wall' if realtime else 'audio',
+            'rate': getenv_int("VOICE_RECOGNITION_DISCRETIZATION_RATE", 16000),
+            'name_detection_buffer': getenv_int("VOICE_RECOGNITION_NAME_DETECTION_BUFFER", 1024),
+            'full_detection_buffer': getenv_int("VOICE_RECOGNITION_FULL_DETECTION_BUFFER", 8192),
+            'vad_enabled': getenv_bool("VOICE_RECOGNITION_VAD_ENABLED", True),
+            'wake_grammar_enabled': getenv_bool("VOICE_RECOGNITION_WAKE_GRAMMAR_ENABLED", True),
+            'wake_engine': getenv("VOICE_RECOGNITION_WAKE_ENGINE", "kaldi"),
+            'second_pass_engine': getenv("VOICE_RECOGNITION_SECOND_PASS_ENGINE", "") or None,
+            'endpoint_enabled': getenv_bool("VOICE_RECOGNITION_ENDPOINT_ENABLED", True)
+        },
+        'summary': {
+            'files': len(results),
+            'model_load_seconds': round(load_seconds, 3),
+            'audio_seconds': round(audio_total, 3),
+            'wall_seconds': round(wall_total, 3),
+            'real_time_factor': round(wall_total / audio_total, 4) if audio_total else None,
+            'cpu_seconds_per_audio_second': round(
+                sum(r['cpu_seconds_per_audio_second'] * r['audio_seconds'] for r in results) / audio_total, 4
+            ) if audio_total else None,
+            'peak_rss_mb': _peak_rss_mb(),
+            'wake_detection_rate': round(sum(r['wake_detected'] for r in results) / len(results), 4),
+            'wake_latency': _percentiles([r['wake_latency'] for r in results if r['wake_latency'] is not None]),
+            'end_of_utterance_latency': _percentiles([r['end_of_utterance_latency'] for r in results if r['end_of_utterance_latency'] is not None]),
+            'mean_wer': round(statistics.fmean(wers), 4) if wers else None,
+            'wake_cpu_seconds_per_audio_second': recognizer.get_stats()['wake']['cpu_seconds_per_audio_second']
+        },
+        'stats': recognizer.get_stats(),
+        'files': results
+    }
+
+
+def compare_wake_engines(corpus_dir: str, realtime: bool = False, model_path: Optional[str] = None) -> Dict[str, Any]:
+    """Цена ожидания имени: постоянный Kaldi против KeywordSpotter с подтверждением через Vosk"""
+    reports = {}
+    for engine in ('kaldi', 'kws'):
+        setenv('VOICE_RECOGNITION_WAKE_ENGINE', engine)
+        reports[engine] = run_benchmark(corpus_dir, realtime=realtime, model_path=model_path)
+
+    wake = {engine: report['stats']['wake'] for engine, report in reports.items()}
+    if wake['kws']['engine'] != 'kws':
+        raise RuntimeError("Keyword spotter did not load, run enroll.py first")
+
+    kaldi_cpu = wake['kaldi']['cpu_seconds_per_audio_second']
+    kws_cpu = wake['kws']['cpu_seconds_per_audio_second']
+    return {
+        'summary': {
+            engine: {
+                'wake_cpu_seconds_per_audio_second': wake[engine]['cpu_seconds_per_audio_second'],
+                'cpu_seconds_per_audio_second': report['summary']['cpu_seconds_per_audio_second'],
+                'wake_detection_rate': report['summary']['wake_detection_rate'],
+                'wake_latency': report['summary']['wake_latency']
+            }
+            for engine, report in reports.items()
+        },
+        'wake_cpu_ratio': round(kws_cpu / kaldi_cpu, 4) if kaldi_cpu and kws_cpu is not None else None,
+        'kws': wake['kws'].get('kws'),
+        'reports': reports
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speech pipeline benchmark")
+    parser.add_argument('--dir', required=True, help="Directory with labelled .wav files")
+    parser.add_argument('--model', default=None, help="Vosk model path (defaults to voice_model_path)")
+    parser.add_argument('--realtime', action='store_true', help="Replay audio at real-time speed")
+    parser.add_argument('--compare-wake', action='store_true', help="Compare idle CPU of Kaldi and keyword spotter wake detection")
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE', help="Override an init.properties value")
+    parser.add_argument('--output', default=None, help="Write JSON report to file instead of stdout")
+    args = parser.parse_args()
+
+    for override in args.set:
+        key, _, value = override.partition('=')
+        setenv(key.strip(), value.strip())
+
+    if args.compare_wake:
+        report = compare_wake_engines(args.dir, realtime=args.realtime, model_path=args.model)
+    else:
+        report = run_benchmark(args.dir, realtime=args.realtime, model_path=args.model)
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    else:
+        print(data)
+
+
+if __name__ == '__main__':
+    main()
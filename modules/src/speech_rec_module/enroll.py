@@ -0,0 +1,130 @@
+"""
+Запись образцов имени ассистента для детектора KeywordSpotter.
+
+Запуск из каталога modules:
+    python -m src.speech_rec_module.enroll --takes 5
+    python -m src.speech_rec_module.enroll --wav take1.wav take2.wav take3.wav
+
+Каждая запись обрезается по речи (VAD), из неё считаются MFCC. Порог
+подбирается по образцам: каждый сравнивается с остальными, и к худшему
+из лучших совпадений добавляется запас --margin. Файл сохраняется в
+wake_templates_path (или в --output); включается детектор через
+VOICE_RECOGNITION_WAKE_ENGINE=kws.
+"""
+import os
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import sys
+import time
+import wave
+import argparse
+import numpy as np
+from typing import List, Optional
+
+from paths import path_resolver
+from utils.EnvHelper import getenv, getenv_int
+from src.speech_rec_module.audio import VoiceActivityDetector, MfccExtractor, KeywordSpotter
+from src.speech_rec_module.providers.audio import AudioSourceFactory
+
+
+def _read_wav(path: str, rate: int) -> bytes:
+    with wave.open(path, 'rb') as wav:
+        if wav.getframerate() != rate or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit mono {rate} Hz WAV")
+        return wav.readframes(wav.getnframes())
+
+
+def _record(seconds: float, rate: int) -> bytes:
+    device_index = getenv_int("VOICE_RECOGNITION_INPUT_DEVICE_INDEX", -1)
+    source = AudioSourceFactory.get_source(
+        'microphone',
+        rate=rate,
+        channels=1,
+        frames_per_buffer=1024,
+        device_index=device_index if device_index >= 0 else None
+    )
+    source.open()
+    try:
+        frames = int(seconds * rate)
+        parts = []
+        while frames > 0:
+            data = source.read(min(1024, frames))
+            parts.append(data)
+            frames -= len(data) // 2
+        return b''.join(parts)
+    finally:
+        source.close()
+
+
+def _trim(pcm: bytes, rate: int, padding_ms: int = 100) -> Optional[bytes]:
+    """Оставляет участок от первого до последнего речевого окна с небольшим запасом"""
+    vad = VoiceActivityDetector.from_env(rate)
+    mask = vad.speech_mask(pcm)
+    speech = np.flatnonzero(mask)
+    if speech.size < vad.min_speech_windows:
+        return None
+    padding = rate * padding_ms // 1000
+    start = max(int(speech[0]) * vad.window - padding, 0)
+    end = min((int(speech[-1]) + 1) * vad.window + padding, len(pcm) // 2)
+    return pcm[start * 2:end * 2]
+
+
+def _threshold(templates: List[np.ndarray], margin: float, default: float) -> float:
+    if len(templates) < 2:
+        return default
+    normalized = [KeywordSpotter._normalize(t) for t in templates]
+    worst = 0.0
+    for i, template in enumerate(normalized):
+        best = min(
+            KeywordSpotter.distance(template, other, end_frames=max(1, len(other) // 10))
+            for j, other in enumerate(normalized) if j != i
+        )
+        worst = max(worst, best)
+    return worst * margin
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enroll wake word templates for the keyword spotter")
+    parser.add_argument('--wav', nargs='*', default=[], help="16-bit mono WAV recordings of the assistant name")
+    parser.add_argument('--takes', type=int, default=0, help="Record this many takes from the microphone")
+    parser.add_argument('--seconds', type=float, default=2.5, help="Length of one microphone take")
+    parser.add_argument('--margin', type=float, default=1.25, help="Threshold margin over the worst template match")
+    parser.add_argument('--output', default=None, help="Templates file (defaults to wake_templates_path)")
+    args = parser.parse_args()
+
+    rate = getenv_int("VOICE_RECOGNITION_DISCRETIZATION_RATE", 16000)
+    name = getenv('ASSISTANT_NAME', 'Ассистент').strip('"')
+    output = args.output or path_resolver['wake_templates_path']
+
+    recordings = [(path, _read_wav(path, rate)) for path in args.wav]
+    for take in range(args.takes):
+        input(f"[{take + 1}/{args.takes}] Press Enter and say '{name}'...")
+        recordings.append((f"take {take + 1}", _record(args.seconds, rate)))
+        time.sleep(0.2)
+
+    if not recordings:
+        parser.error("nothing to enroll: pass --wav files or --takes")
+
+    extractor = MfccExtractor(rate)
+    templates = []
+    for label, pcm in recordings:
+        speech = _trim(pcm, rate)
+        if speech is None:
+            print(f"{label}: no speech detected, skipped")
+            continue
+        templates.append(extractor.mfcc(speech))
+        print(f"{label}: {len(speech) / 2 / rate:.2f}s of speech")
+
+    if not templates:
+        print("No usable recordings")
+        sys.exit(1)
+
+    threshold = _threshold(templates, args.margin, default=0.3)
+    KeywordSpotter.save(output, templates, threshold, extractor, name)
+    print(f"Saved {len(templates)} templates to {output} (threshold {threshold:.4f})")
+    if len(templates) < 3:
+        print("Fewer than 3 templates: threshold is a rough default, consider recording more takes")
+
+
+if __name__ == '__main__':
+    main()
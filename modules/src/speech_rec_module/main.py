@@ -1,11 +1,14 @@
 from clients import ModuleClient
-from src.speech_rec_module.services import Recognizer
+import base64
+import threading
+from src.speech_rec_module.services import Recognizer, RecognitionPool, BatchTranscriber
 from paths import path_resolver
-from utils.EnvHelper import getenv
+from utils.EnvHelper import getenv, getenv_bool
 from utils.LogService import get_logger, log_crash, log_error, log_info
+from utils.ResourceRegistry import ResourceRegistry
 from enums.Events import EventsType, EventsTopic
 
-def run(stop_event):
+def run(stop_event, resources: ResourceRegistry):
     logger = get_logger()
     module_name = "speech_rec_module"
     
@@ -38,11 +41,18 @@ def run(stop_event):
         logger.info(f"Initializing recognizer...", module_name)
         
         _active_dialog_id = {'value': None}
+        pool_enabled = getenv_bool('VOICE_RECOGNITION_POOL_ENABLED', False)
+
+        subscribes = [EventsTopic.ACTION_ACTIVE_DIALOG_SET.value, EventsTopic.ACTION_BATCH_TRANSCRIBE.value]
+        if getenv_bool('VOICE_RECOGNITION_FOLLOW_UP_ENABLED', False):
+            subscribes.append(EventsTopic.ACTION_AI_STREAM_END.value)
+        if pool_enabled:
+            subscribes.append(EventsTopic.RAW_AUDIO_DATA_CHUNK.value)
 
         client = ModuleClient(
             service_name='speech_rec_module',
             manifest_file='manifest.json',
-            subscribes=[EventsTopic.ACTION_ACTIVE_DIALOG_SET.value],
+            subscribes=subscribes,
             heartbeat_interval=5.0,
             max_reconnect_attempts=10,
             log_prefix='speech'
@@ -58,9 +68,54 @@ def run(stop_event):
         recognizer = Recognizer(
             name=assistant_name,
             VOICE_RECOGNITION_MODEL_DIR_PATH=model_path,
+            resources=resources
         )
         
         logger.info("Recognizer initialized successfully", module_name)
+
+        client.on(EventsTopic.ACTION_AI_STREAM_END.value, lambda msg: recognizer.open_follow_up())
+
+        transcriber = BatchTranscriber.from_env()
+        transcribe_lock = threading.Lock()
+
+        def handle_batch_transcribe(msg: dict):
+            payload = msg.get('payload') or {}
+            paths = [p for p in payload.get('paths') or [] if p]
+            if not paths:
+                return
+
+            def transcribe():
+                # Пакеты идут по очереди; параллельность - внутри пакета, на пуле процессов
+                with transcribe_lock:
+                    try:
+                        for item in transcriber.transcribe(paths, bool(payload.get('write_notes')), payload.get('batch_id')):
+                            emit_item(item)
+                    except Exception as e:
+                        log_error(f"Batch transcription failed: {e}", module_name, e)
+
+            threading.Thread(target=transcribe, name="BatchTranscription", daemon=True).start()
+
+        client.on(EventsTopic.ACTION_BATCH_TRANSCRIBE.value, handle_batch_transcribe)
+
+        pool = None
+        if pool_enabled:
+            pool = RecognitionPool.from_env(assistant_name, model_path, resources)
+            logger.info(f"Recognition pool started with {pool.workers} workers and {len(pool.streams)} local streams", module_name)
+
+            def handle_audio_chunk(msg: dict):
+                payload = msg.get('payload') or {}
+                stream_id = payload.get('stream_id')
+                if not stream_id:
+                    return
+                if payload.get('rate') and int(payload['rate']) != pool.rate:
+                    logger.warning(f"Dropping audio from '{stream_id}': rate {payload['rate']} != {pool.rate}", module_name)
+                    return
+                if payload.get('pcm'):
+                    pool.push_audio(stream_id, base64.b64decode(payload['pcm']))
+                if payload.get('final'):
+                    pool.finish_stream(stream_id)
+
+            client.on(EventsTopic.RAW_AUDIO_DATA_CHUNK.value, handle_audio_chunk)
         
     except Exception as e:
         log_crash(
@@ -75,27 +130,49 @@ def run(stop_event):
         )
         return
 
+    def emit_item(item):
+        if isinstance(item, dict):
+            payload = dict(item.get('payload') or {})
+            if _active_dialog_id['value'] and 'dialog_id' not in payload:
+                payload['dialog_id'] = _active_dialog_id['value']
+            client.emit({
+                'type': item.get('type'),
+                'topic': item.get('topic'),
+                'from': 'speech_rec_module',
+                'payload': payload
+            })
+
+    def pool_loop():
+        try:
+            for item in pool.run(stop_event): # type: ignore
+                emit_item(item)
+        except Exception as e:
+            log_crash("Error in recognition pool loop", module_name, e)
+
     client.start(stop_event, block=False)
     logger.info("Client started, beginning recognition loop", module_name)
 
+    if pool is not None:
+        threading.Thread(target=pool_loop, name="RecognitionPoolLoop", daemon=True).start()
+
     try:
         for item in recognizer.run(stop_event):
             if stop_event.is_set():
                 break
-            if isinstance(item, dict):
-                payload = dict(item.get('payload') or {})
-                if _active_dialog_id['value'] and 'dialog_id' not in payload:
-                    payload['dialog_id'] = _active_dialog_id['value']
-                client.emit({
-                    'type': item.get('type'),
-                    'topic': item.get('topic'),
-                    'from': 'speech_rec_module',
-                    'payload': payload
-                })
+            emit_item(item)
     except Exception as e:
         log_crash("Error in main recognition loop", module_name, e)
     finally:
         logger.info("Cleaning up speech recognition module", module_name)
+        try:
+            transcriber.cleanup()
+        except Exception as e5:
+            log_error(f"Error during transcription pool cleanup: {e5}", module_name, e5)
+        if pool is not None:
+            try:
+                pool.cleanup()
+            except Exception as e4:
+                log_error(f"Error during recognition pool cleanup: {e4}", module_name, e4)
         try:
             recognizer.cleanup()
             logger.info("Recognizer cleanup completed", module_name)
@@ -110,6 +187,8 @@ def run(stop_event):
 
 ORC_STOP = globals().get('ORC_STOP')
 if ORC_STOP is None:
-    import threading
     ORC_STOP = threading.Event()
-run(ORC_STOP)
+ORC_RESOURCES = globals().get('ORC_RESOURCES')
+if ORC_RESOURCES is None:
+    ORC_RESOURCES = ResourceRegistry()
+run(ORC_STOP, ORC_RESOURCES)
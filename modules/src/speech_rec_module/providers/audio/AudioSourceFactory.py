@@ -0,0 +1,38 @@
+from typing import Any, Dict, List, Type
+from interfaces import IAudioSource
+from .MicrophoneSource import MicrophoneSource
+from .FileSource import FileSource
+from .PipeSource import PipeSource
+from .PushSource import PushSource
+from .BusSource import BusSource
+
+
+class AudioSourceFactory:
+
+    _sources: Dict[str, Type[IAudioSource]] = {
+        'microphone': MicrophoneSource,
+        'file': FileSource,
+        'pipe': PipeSource,
+        'push': PushSource,
+        'bus': BusSource
+    }
+
+    @classmethod
+    def register_source(cls, name: str, source_class: Type[IAudioSource]) -> None:
+        cls._sources[name] = source_class
+
+    @classmethod
+    def get_source(cls, name: str, rate: int, channels: int, frames_per_buffer: int, **options: Any) -> IAudioSource:
+        source_class = cls._sources.get(name)
+        if not source_class:
+            raise ValueError(f"Audio source '{name}' is not supported. Available: {list(cls._sources.keys())}")
+
+        return source_class(rate, channels, frames_per_buffer, **options)  # type: ignore[call-arg]
+
+    @classmethod
+    def get_available_sources(cls) -> List[str]:
+        return list(cls._sources.keys())
+
+    @classmethod
+    def is_source_supported(cls, name: str) -> bool:
+        return name in cls._sources
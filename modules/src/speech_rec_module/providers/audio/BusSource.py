@@ -0,0 +1,55 @@
+from typing import Optional
+from interfaces import IAudioSource
+from src.speech_rec_module.audio import SharedFrameRing, SharedRingConsumer
+
+
+class BusSource(IAudioSource):
+    """
+    Читатель общей аудиошины (SharedFrameRing), которую публикует сервис
+    распознавания. Подключается по имени сегмента, в том числе из другого процесса.
+    read() копирует кадры в bytes по контракту IAudioSource; без копий можно
+    читать напрямую через `consumer.read()`.
+    """
+
+    is_live = True
+
+    def __init__(self, rate: int, channels: int, frames_per_buffer: int, bus_name: str = '', consumer_name: str = 'bus-source',
+                 timeout: float = 1.0):
+        super().__init__(rate, channels, frames_per_buffer)
+        self.bus_name = bus_name
+        self.consumer_name = consumer_name
+        self.timeout = timeout
+        self.ring: Optional[SharedFrameRing] = None
+        self.consumer: Optional[SharedRingConsumer] = None
+
+    def open(self) -> None:
+        self.ring = SharedFrameRing.attach(self.bus_name)
+        if self.ring.frame_size != self.channels * self.sample_width:
+            frame_size = self.ring.frame_size
+            self.close()
+            raise ValueError(f"Audio bus '{self.bus_name}' has {frame_size}-byte frames, expected {self.channels * self.sample_width}")
+        self.consumer = self.ring.consumer(self.consumer_name)
+
+    def read(self, frames: int) -> bytes:
+        if self.ring is None or self.consumer is None:
+            raise OSError("Stream closed")
+        view = self.consumer.read(frames, timeout=self.timeout)
+        if view is None:
+            if not self.ring.producer_alive:
+                raise EOFError(f"Audio bus '{self.bus_name}' closed")
+            return b''
+        try:
+            return bytes(view)
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        if self.consumer is not None:
+            self.consumer.close()
+            self.consumer = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def is_active(self) -> bool:
+        return self.ring is not None and self.ring.producer_alive
@@ -0,0 +1,79 @@
+import time
+import wave
+from pathlib import Path
+from typing import Any, Optional
+from interfaces import IAudioSource
+
+
+class FileSource(IAudioSource):
+    """
+    Воспроизведение WAV или сырого PCM (.raw/.pcm) вместо микрофона.
+
+    В режиме realtime кадры отдаются со скоростью записи, иначе — так быстро,
+    как их успевает забирать распознаватель.
+    """
+
+    RAW_EXTENSIONS = {'.raw', '.pcm'}
+
+    def __init__(self, rate: int, channels: int, frames_per_buffer: int, path: str, realtime: bool = True):
+        super().__init__(rate, channels, frames_per_buffer)
+        self.path = path
+        self.realtime = realtime
+        self.is_live = realtime
+
+        self._file: Optional[Any] = None
+        self._wav: Optional[wave.Wave_read] = None
+        self._started_at = 0.0
+        self._frames_read = 0
+
+    def open(self) -> None:
+        if Path(self.path).suffix.lower() in self.RAW_EXTENSIONS:
+            self._file = open(self.path, 'rb')
+        else:
+            self._wav = wave.open(self.path, 'rb')
+            actual = (self._wav.getframerate(), self._wav.getnchannels(), self._wav.getsampwidth())
+            expected = (self.rate, self.channels, self.sample_width)
+            if actual != expected:
+                self._wav.close()
+                self._wav = None
+                raise ValueError(f"WAV format {actual} of '{self.path}' does not match expected (rate, channels, width) {expected}")
+
+        self._started_at = time.monotonic()
+        self._frames_read = 0
+
+    def read(self, frames: int) -> bytes:
+        if self._wav is not None:
+            data = self._wav.readframes(frames)
+        elif self._file is not None:
+            data = self._file.read(frames * self.channels * self.sample_width)
+        else:
+            raise OSError("Stream closed")
+
+        if not data:
+            raise EOFError(f"End of audio file '{self.path}'")
+
+        self._frames_read += len(data) // (self.channels * self.sample_width)
+        if self.realtime:
+            delay = self._started_at + self._frames_read / self.rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+    def close(self) -> None:
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def is_active(self) -> bool:
+        return self._wav is not None or self._file is not None
+
+    @property
+    def duration(self) -> float:
+        """Длительность записи в секундах"""
+        if Path(self.path).suffix.lower() in self.RAW_EXTENSIONS:
+            return Path(self.path).stat().st_size / (self.rate * self.channels * self.sample_width)
+        with wave.open(self.path, 'rb') as w:
+            return w.getnframes() / w.getframerate()
@@ -0,0 +1,123 @@
+import pyaudio
+from typing import Optional
+from interfaces import IAudioSource
+from utils.ResourceRegistry import ResourceRegistry
+
+
+class MicrophoneSource(IAudioSource):
+
+    is_live = True
+
+    def __init__(self, rate: int, channels: int, frames_per_buffer: int, device_index: Optional[int] = None,
+                 resources: Optional[ResourceRegistry] = None):
+        super().__init__(rate, channels, frames_per_buffer)
+        self.device_index = device_index
+        self.device_name: Optional[str] = None
+        self.resources = resources
+        self.p: Optional[pyaudio.PyAudio] = None
+        self.stream: Optional[pyaudio.Stream] = None
+
+    def open(self) -> None:
+        # PyAudio из реестра общий с другими источниками (стримы RecognitionPool),
+        # поэтому источник держит его через acquire/release, а не завершает сам
+        if self.resources is not None and self.p is None:
+            self.p = self.resources.acquire(
+                "pyaudio",
+                pyaudio.PyAudio,
+                on_evict=lambda p: p.terminate(),
+                owner="speech_rec_module"
+            )
+        elif self.p is None:
+            self.p = pyaudio.PyAudio()
+        self._open_stream()
+
+    def _open_stream(self) -> None:
+        assert self.p is not None
+        device_index = self._resolve_device()
+        self.stream = self.p.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=self.frames_per_buffer
+        )
+        self.stream.start_stream()
+
+    def _resolve_device(self) -> Optional[int]:
+        """
+        Индекс устройства по имени, запомненному при первом открытии: после
+        переинициализации PortAudio (переподключение устройств) индексы
+        могут сдвинуться. Если устройство пропало - берём вход по умолчанию.
+        """
+        assert self.p is not None
+        if self.device_name is None:
+            try:
+                info = self.p.get_device_info_by_index(self.device_index) if self.device_index is not None \
+                    else self.p.get_default_input_device_info()
+                self.device_name = str(info.get('name'))
+            except Exception:
+                pass
+            return self.device_index
+
+        for i in range(self.p.get_device_count()):
+            info = self.p.get_device_info_by_index(i)
+            if info.get('name') == self.device_name and int(info.get('maxInputChannels', 0)) > 0:
+                return i
+
+        print(f"[MicrophoneSource] input device '{self.device_name}' not found, falling back to default input")
+        self.device_name = None
+        self.device_index = None
+        return None
+
+    def read(self, frames: int) -> bytes:
+        if self.stream is None:
+            raise OSError("Stream closed")
+        return self.stream.read(frames, exception_on_overflow=False)
+
+    def _close_stream(self) -> None:
+        try:
+            if self.stream is not None:
+                if not self.stream.is_stopped():
+                    self.stream.stop_stream()
+                self.stream.close()
+        finally:
+            self.stream = None
+
+    def close(self) -> None:
+        try:
+            self._close_stream()
+        finally:
+            if self.p is not None:
+                if self.resources is not None:
+                    self.resources.release("pyaudio")
+                else:
+                    self.p.terminate()
+            self.p = None
+
+    def reopen(self) -> None:
+        """Переоткрывает только поток на уже инициализированном PortAudio"""
+        try:
+            self._close_stream()
+        except Exception:
+            self.stream = None
+        if self.p is None:
+            self.open()
+        else:
+            self._open_stream()
+
+    def reset(self) -> None:
+        """
+        PortAudio завершается, только если его больше никто не держит: пока
+        открыты другие источники на том же экземпляре, следующий open()
+        переоткроет поток на нём же.
+        """
+        if self.resources is not None and not self.resources.evict("pyaudio", if_unused=True) \
+                and self.resources.has("pyaudio"):
+            print("[MicrophoneSource] PortAudio is shared with other open sources, keeping it initialized")
+
+    def is_active(self) -> bool:
+        try:
+            return self.stream is not None and self.stream.is_active() and not self.stream.is_stopped()
+        except Exception:
+            return False
@@ -0,0 +1,41 @@
+import sys
+from typing import Any, Optional
+from interfaces import IAudioSource
+
+
+class PipeSource(IAudioSource):
+    """Сырой int16 PCM из stdin ('-') или именованного канала"""
+
+    is_live = False
+
+    def __init__(self, rate: int, channels: int, frames_per_buffer: int, path: str = '-'):
+        super().__init__(rate, channels, frames_per_buffer)
+        self.path = path or '-'
+        self._pipe: Optional[Any] = None
+
+    def open(self) -> None:
+        self._pipe = sys.stdin.buffer if self.path == '-' else open(self.path, 'rb')
+
+    def read(self, frames: int) -> bytes:
+        if self._pipe is None:
+            raise OSError("Stream closed")
+
+        size = frames * self.channels * self.sample_width
+        data = bytearray()
+        while len(data) < size:
+            part = self._pipe.read(size - len(data))
+            if not part:
+                break
+            data.extend(part)
+
+        if not data:
+            raise EOFError(f"Pipe '{self.path}' closed")
+        return bytes(data)
+
+    def close(self) -> None:
+        if self._pipe is not None and self._pipe is not sys.stdin.buffer:
+            self._pipe.close()
+        self._pipe = None
+
+    def is_active(self) -> bool:
+        return self._pipe is not None
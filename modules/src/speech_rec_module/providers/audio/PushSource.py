@@ -0,0 +1,73 @@
+import threading
+from typing import Optional
+from interfaces import IAudioSource
+
+
+class PushSource(IAudioSource):
+    """
+    int16 PCM, который присылают снаружи через push() - например, тонкие
+    клиенты в других комнатах по вебсокету. read() ждёт, пока наберётся
+    нужное число кадров; после finish() отдаёт остаток и бросает EOFError.
+    """
+
+    is_live = True
+
+    def __init__(self, rate: int, channels: int, frames_per_buffer: int, max_buffer_seconds: float = 10.0):
+        super().__init__(rate, channels, frames_per_buffer)
+        self.max_buffer_bytes = int(max_buffer_seconds * rate) * channels * self.sample_width
+        self._buffer = bytearray()
+        self._cond = threading.Condition()
+        self._opened = False
+        self._finished = False
+
+        self.pushed_bytes = 0
+        self.dropped_bytes = 0
+
+    def open(self) -> None:
+        with self._cond:
+            self._opened = True
+            self._finished = False
+
+    def push(self, pcm: bytes) -> None:
+        with self._cond:
+            if self._finished:
+                return
+            self._buffer.extend(pcm)
+            self.pushed_bytes += len(pcm)
+            overflow = len(self._buffer) - self.max_buffer_bytes
+            if overflow > 0:
+                overflow += -overflow % (self.channels * self.sample_width)
+                del self._buffer[:overflow]
+                self.dropped_bytes += overflow
+            self._cond.notify_all()
+
+    def finish(self) -> None:
+        """Клиент закончил передачу"""
+        with self._cond:
+            self._finished = True
+            self._cond.notify_all()
+
+    def read(self, frames: int, timeout: Optional[float] = 0.5) -> bytes:
+        size = frames * self.channels * self.sample_width
+        with self._cond:
+            if not self._opened:
+                raise OSError("Stream closed")
+            self._cond.wait_for(lambda: len(self._buffer) >= size or self._finished or not self._opened, timeout)
+            if not self._opened:
+                raise OSError("Stream closed")
+            frame_bytes = self.channels * self.sample_width
+            take = min(size, len(self._buffer) - len(self._buffer) % frame_bytes)
+            if take == 0 and self._finished:
+                raise EOFError("Push source finished")
+            data = bytes(self._buffer[:take])
+            del self._buffer[:take]
+            return data
+
+    def close(self) -> None:
+        with self._cond:
+            self._opened = False
+            self._buffer.clear()
+            self._cond.notify_all()
+
+    def is_active(self) -> bool:
+        return self._opened
@@ -0,0 +1,15 @@
+from .MicrophoneSource import MicrophoneSource
+from .FileSource import FileSource
+from .PipeSource import PipeSource
+from .PushSource import PushSource
+from .BusSource import BusSource
+from .AudioSourceFactory import AudioSourceFactory
+
+__all__ = [
+    "MicrophoneSource",
+    "FileSource",
+    "PipeSource",
+    "PushSource",
+    "BusSource",
+    "AudioSourceFactory"
+]
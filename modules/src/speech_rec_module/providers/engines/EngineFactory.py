@@ -0,0 +1,32 @@
+from typing import Any, Dict, List, Type
+from interfaces import IRecognitionEngine
+from .VoskEngine import VoskEngine
+from .WhisperEngine import WhisperEngine
+
+
+class EngineFactory:
+
+    _engines: Dict[str, Type[IRecognitionEngine]] = {
+        'vosk': VoskEngine,
+        'whisper': WhisperEngine
+    }
+
+    @classmethod
+    def register_engine(cls, name: str, engine_class: Type[IRecognitionEngine]) -> None:
+        cls._engines[name] = engine_class
+
+    @classmethod
+    def get_engine(cls, name: str, rate: int, **options: Any) -> IRecognitionEngine:
+        engine_class = cls._engines.get(name)
+        if not engine_class:
+            raise ValueError(f"Recognition engine '{name}' is not supported. Available: {list(cls._engines.keys())}")
+
+        return engine_class(rate, **options)  # type: ignore[call-arg]
+
+    @classmethod
+    def get_available_engines(cls) -> List[str]:
+        return list(cls._engines.keys())
+
+    @classmethod
+    def is_engine_supported(cls, name: str) -> bool:
+        return name in cls._engines
@@ -0,0 +1,53 @@
+import json
+from vosk import Model, KaldiRecognizer
+from interfaces import IRecognitionEngine
+from typing import Any, Dict, List, Optional
+
+
+class VoskEngine(IRecognitionEngine):
+    """
+    Потоковый движок на KaldiRecognizer. Уверенность фразы - среднее
+    `conf` её слов, поэтому тайминги слов включены всегда.
+    """
+
+    def __init__(self, rate: int, model: Model, grammar: Optional[List[str]] = None):
+        """
+        Args:
+            rate (int): Частота дискретизации
+            model (Model): Загруженная модель Vosk
+            grammar (Optional[List[str]]): Ограничить словарь распознавателя этими фразами
+        """
+        super().__init__(rate)
+        if grammar:
+            self.recognizer = KaldiRecognizer(model, rate, json.dumps(grammar, ensure_ascii=False))
+        else:
+            self.recognizer = KaldiRecognizer(model, rate)
+        self.recognizer.SetWords(True)
+        if hasattr(self.recognizer, 'SetPartialWords'):
+            self.recognizer.SetPartialWords(True)
+
+    def _parse(self, raw: str) -> Dict[str, Any]:
+        data = json.loads(raw)
+        words = data.get('result')
+        confidences = [w['conf'] for w in words or [] if 'conf' in w]
+        return self.make_result(
+            text=data.get('text', ''),
+            words=words,
+            confidence=sum(confidences) / len(confidences) if confidences else None
+        )
+
+    def accept(self, chunk: bytes) -> bool:
+        return bool(self.recognizer.AcceptWaveform(chunk))
+
+    def result(self) -> Dict[str, Any]:
+        return self._parse(self.recognizer.Result())
+
+    def partial(self) -> Dict[str, Any]:
+        data = json.loads(self.recognizer.PartialResult())
+        return self.make_result(text=data.get('partial', ''), words=data.get('partial_result'))
+
+    def final(self) -> Dict[str, Any]:
+        return self._parse(self.recognizer.FinalResult())
+
+    def reset(self) -> None:
+        self.recognizer.Reset()
@@ -0,0 +1,83 @@
+import math
+import numpy as np
+from interfaces import IRecognitionEngine
+from typing import Any, Dict, List, Optional
+
+
+class WhisperEngine(IRecognitionEngine):
+    """
+    Непотоковый движок на faster-whisper (CTranslate2, квантованные веса на CPU).
+    Используется как второй проход: звук копится в accept() и декодируется
+    целиком в final() / transcribe(). Уверенность - exp(avg_logprob) по сегментам.
+
+    faster-whisper - необязательная зависимость: `pip install faster-whisper`.
+    """
+
+    streaming = False
+    WHISPER_RATE = 16000
+
+    def __init__(self,
+                 rate: int,
+                 model: str = 'small',
+                 compute_type: str = 'int8',
+                 language: Optional[str] = 'ru',
+                 beam_size: int = 1,
+                 threads: int = 0):
+        """
+        Args:
+            rate (int): Частота входного звука
+            model (str): Размер модели (tiny, base, small, ...) или путь к сконвертированной модели
+            compute_type (str): Квантование весов (int8, int8_float32, float32)
+            language (Optional[str]): Язык речи; None - определять автоматически
+            beam_size (int): Ширина луча декодера
+            threads (int): Потоков CPU (0 - по умолчанию CTranslate2)
+        """
+        super().__init__(rate)
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise RuntimeError("faster-whisper is not installed, second pass is unavailable") from e
+
+        self.model = WhisperModel(model, device='cpu', compute_type=compute_type, cpu_threads=threads)
+        self.language = language or None
+        self.beam_size = beam_size
+        self._buffer: List[bytes] = []
+
+    def _to_float(self, pcm: bytes) -> np.ndarray:
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        if self.rate != self.WHISPER_RATE and len(audio):
+            positions = np.arange(0, len(audio), self.rate / self.WHISPER_RATE)
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+        return audio
+
+    def transcribe(self, pcm: bytes) -> Dict[str, Any]:
+        segments, _ = self.model.transcribe(
+            self._to_float(pcm),
+            language=self.language,
+            beam_size=self.beam_size,
+            condition_on_previous_text=False
+        )
+        segments = list(segments)
+        texts = [s.text.strip() for s in segments if s.text.strip()]
+        logprobs = [s.avg_logprob for s in segments]
+        return self.make_result(
+            text=' '.join(texts),
+            confidence=math.exp(sum(logprobs) / len(logprobs)) if logprobs else None
+        )
+
+    def accept(self, chunk: bytes) -> bool:
+        self._buffer.append(bytes(chunk))
+        return False
+
+    def result(self) -> Dict[str, Any]:
+        return self.make_result()
+
+    def partial(self) -> Dict[str, Any]:
+        return self.make_result()
+
+    def final(self) -> Dict[str, Any]:
+        pcm, self._buffer = b''.join(self._buffer), []
+        return self.transcribe(pcm) if pcm else self.make_result()
+
+    def reset(self) -> None:
+        self._buffer = []
@@ -0,0 +1,9 @@
+from .VoskEngine import VoskEngine
+from .WhisperEngine import WhisperEngine
+from .EngineFactory import EngineFactory
+
+__all__ = [
+    "VoskEngine",
+    "WhisperEngine",
+    "EngineFactory"
+]
@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import wave
+import shutil
+import subprocess
+import multiprocessing
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from paths import path_resolver
+from utils.EnvHelper import getenv, getenv_int
+from utils.LogService import get_logger
+from enums.Events import EventsType, EventsTopic
+from mtypes.Global import Message
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+
+_worker_model = None
+
+
+def _init_worker(model_path: str):
+    """Загрузка модели один раз на процесс пула"""
+    global _worker_model
+    from vosk import Model, SetLogLevel
+    SetLogLevel(-1)
+    _worker_model = Model(model_path)
+
+
+def _read_audio(path: str, rate: int) -> Tuple[bytes, int]:
+    """
+    16-bit PCM моно и его частота. WAV и сырой PCM читаются напрямую
+    (многоканальный WAV сводится в моно), остальные форматы - через ffmpeg,
+    если он установлен.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.raw', '.pcm'):
+        return Path(path).read_bytes(), rate
+
+    if suffix == '.wav':
+        with wave.open(path, 'rb') as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"Unsupported WAV sample width: {wav.getsampwidth() * 8} bit")
+            pcm = wav.readframes(wav.getnframes())
+            channels = wav.getnchannels()
+            file_rate = wav.getframerate()
+        if channels > 1:
+            samples = np.frombuffer(pcm, dtype=np.int16).reshape(-1, channels)
+            pcm = samples.mean(axis=1).astype(np.int16).tobytes()
+        return pcm, file_rate
+
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        raise ValueError(f"Cannot decode '{suffix}' without ffmpeg")
+    result = subprocess.run(
+        [ffmpeg, '-nostdin', '-loglevel', 'error', '-i', path, '-f', 's16le', '-ac', '1', '-ar', str(rate), '-'],
+        capture_output=True,
+        check=True
+    )
+    return result.stdout, rate
+
+
+def _transcribe_file(path: str, rate: int, chunk_frames: int) -> Dict[str, Any]:
+    from vosk import KaldiRecognizer
+
+    start = time.perf_counter()
+    pcm, file_rate = _read_audio(path, rate)
+    recognizer = KaldiRecognizer(_worker_model, file_rate)
+
+    texts: List[str] = []
+    step = chunk_frames * 2
+    for offset in range(0, len(pcm), step):
+        if recognizer.AcceptWaveform(pcm[offset:offset + step]):
+            texts.append(json.loads(recognizer.Result()).get('text', ''))
+    texts.append(json.loads(recognizer.FinalResult()).get('text', ''))
+
+    return {
+        'path': path,
+        'text': ' '.join(t for t in texts if t),
+        'audio_seconds': len(pcm) / 2 / file_rate,
+        'decode_seconds': time.perf_counter() - start,
+        'worker_pid': os.getpid()
+    }
+
+
+class BatchTranscriber:
+    """
+    Офлайн-расшифровка аудиофайлов (например, голосовых заметок) на пуле процессов.
+
+    Каждый процесс пула загружает модель один раз в инициализаторе и дальше
+    только декодирует, так что файлы распознаются параллельно без GIL.
+    Пул создаётся при первом запросе и живёт до cleanup(). Результаты
+    отдаются событиями по мере готовности файлов, итог - с пропускной
+    способностью в секундах аудио на секунду работы.
+    """
+
+    SERVICE_NAME = "BatchTranscriber"
+
+    def __init__(self,
+                 model_path: str,
+                 rate: int = 16000,
+                 workers: int = 0,
+                 notes_folder: str = ''):
+        """
+        Args:
+            model_path (str): Путь к модели, которую загрузит каждый процесс
+            rate (int): Частота, к которой приводятся файлы, декодируемые через ffmpeg
+            workers (int): Размер пула процессов (0 - половина ядер)
+            notes_folder (str): Папка внутри notes_path для .txt расшифровок
+        """
+        self.logger = get_logger()
+        self.model_path = model_path
+        self.rate = rate
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self.notes_dir = Path(path_resolver['notes_path']) / notes_folder if notes_folder else Path(path_resolver['notes_path'])
+        self.chunk_frames = rate // 2
+
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pool_start_seconds: Optional[float] = None
+
+        self.batches = 0
+        self.files = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        self.wall_seconds = 0.0
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            start = time.perf_counter()
+            # spawn на всех платформах: fork процесса с потоками захвата и сокета небезопасен
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.model_path,)
+            )
+            self.pool_start_seconds = time.perf_counter() - start
+            self.logger.info(f"Started transcription pool with {self.workers} workers", self.SERVICE_NAME)
+        return self.executor
+
+    def transcribe(self, paths: List[str], write_notes: bool = False, batch_id: Optional[str] = None) -> Generator[Message, None, None]:
+        """
+        Расшифровывает файлы, отдавая событие на каждый файл и итоговое событие.
+
+        Args:
+            paths (List[str]): Аудиофайлы
+            write_notes (bool): Сохранить расшифровки как .txt заметки
+            batch_id (Optional[str]): Идентификатор пакета, возвращается в событиях
+        """
+        executor = self._ensure_pool()
+        start = time.perf_counter()
+        futures = {executor.submit(_transcribe_file, path, self.rate, self.chunk_frames): path for path in paths}
+
+        audio_seconds = 0.0
+        failed = 0
+        notes_written = 0
+        for future in as_completed(futures):
+            path = futures[future]
+            payload: Dict[str, Any] = {'batch_id': batch_id, 'path': path}
+            try:
+                result = future.result()
+                audio_seconds += result['audio_seconds']
+                payload.update({
+                    'text': result['text'],
+                    'audio_seconds': round(result['audio_seconds'], 3),
+                    'decode_seconds': round(result['decode_seconds'], 3)
+                })
+                if write_notes and result['text']:
+                    payload['note_path'] = self._write_note(path, result['text'])
+                    notes_written += 1
+            except Exception as e:
+                failed += 1
+                payload['error'] = str(e)
+                self.logger.error(f"Failed to transcribe '{path}': {e}", self.SERVICE_NAME, e)
+            yield {'type': EventsType.EVENT.value, 'topic': EventsTopic.RAW_TEXT_DATA_TRANSCRIBED.value, 'payload': payload}
+
+        wall = time.perf_counter() - start
+        self.batches += 1
+        self.files += len(paths)
+        self.failed += failed
+        self.audio_seconds += audio_seconds
+        self.wall_seconds += wall
+
+        if notes_written:
+            yield {'type': EventsType.SERVICE_ACTION.value, 'topic': EventsTopic.ACTION_NOTES_REFETCH.value, 'payload': {}}
+        yield {
+            'type': EventsType.EVENT.value,
+            'topic': EventsTopic.ACTION_BATCH_TRANSCRIBE_DONE.value,
+            'payload': {
+                'batch_id': batch_id,
+                'files': len(paths),
+                'failed': failed,
+                'notes_written': notes_written,
+                'audio_seconds': round(audio_seconds, 3),
+                'wall_seconds': round(wall, 3),
+                'throughput': round(audio_seconds / wall, 3) if wall else None,
+                'workers': self.workers
+            }
+        }
+
+    def _write_note(self, source_path: str, text: str) -> str:
+        self.notes_dir.mkdir(parents=True, exist_ok=True)
+        stem = Path(source_path).stem
+        note = self.notes_dir / f"{stem}.txt"
+        index = 1
+        while note.exists():
+            note = self.notes_dir / f"{stem} ({index}).txt"
+            index += 1
+        note.write_text(text, encoding='utf-8')
+        return str(note)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'pool_started': self.executor is not None,
+            'batches': self.batches,
+            'files': self.files,
+            'failed': self.failed,
+            'audio_seconds': round(self.audio_seconds, 3),
+            'wall_seconds': round(self.wall_seconds, 3),
+            'throughput': round(self.audio_seconds / self.wall_seconds, 3) if self.wall_seconds else None
+        }
+
+    def cleanup(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    @classmethod
+    def from_env(cls) -> 'BatchTranscriber':
+        """
+        Модель для расшифровки: VOICE_RECOGNITION_BATCH_MODEL_PATH, иначе модель
+        команд, если она есть, иначе основная.
+        """
+        model_path = getenv("VOICE_RECOGNITION_BATCH_MODEL_PATH", "")
+        if not model_path:
+            command_path = getenv("VOICE_RECOGNITION_COMMAND_MODEL_PATH", "") or path_resolver['voice_command_model_path']
+            model_path = command_path if Path(command_path).exists() else path_resolver['voice_model_path']
+        return cls(
+            model_path=model_path,
+            rate=getenv_int("VOICE_RECOGNITION_DISCRETIZATION_RATE", 16000),
+            workers=getenv_int("VOICE_RECOGNITION_BATCH_WORKERS", 0),
+            notes_folder=getenv("VOICE_RECOGNITION_BATCH_NOTES_FOLDER", "")
+        )
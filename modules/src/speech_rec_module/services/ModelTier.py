@@ -0,0 +1,113 @@
+import gc
+import time
+import psutil
+from vosk import Model
+from utils.ResourceRegistry import ResourceRegistry
+from typing import Any, Dict, Optional
+
+
+class ModelTier:
+    """
+    Модель Vosk одного уровня распознавания (имя / команды).
+
+    Модель лежит в реестре оркестратора под своим ключом и загружается при
+    первом get(). Если задан idle_seconds, после простоя is_idle() сообщает,
+    что её можно выгрузить через unload(). Для статистики замеряются время
+    загрузки, прирост резидентной памяти процесса и время декодирования.
+    """
+
+    def __init__(self,
+                 tier: str,
+                 model_path: str,
+                 resources: ResourceRegistry,
+                 key: str,
+                 owner: Optional[str] = None,
+                 idle_seconds: float = 0.0):
+        """
+        Args:
+            tier (str): Название уровня для логов и статистики
+            model_path (str): Путь к директории с моделью
+            resources (ResourceRegistry): Реестр, в котором живёт модель
+            key (str): Ключ модели в реестре
+            owner (Optional[str]): Модуль-владелец ресурса
+            idle_seconds (float): Через сколько секунд простоя выгружать модель (0 - не выгружать)
+        """
+        self.tier = tier
+        self.model_path = model_path
+        self.resources = resources
+        self.key = key
+        self.owner = owner
+        self.idle_seconds = idle_seconds
+
+        self.model: Optional[Model] = None
+        self.last_used = time.monotonic()
+
+        self.loads = 0
+        self.unloads = 0
+        self.reused = False
+        self.load_seconds: Optional[float] = None
+        self.resident_mb: Optional[float] = None
+        self.decode_seconds = 0.0
+        self.decoded_frames = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    @staticmethod
+    def _rss_mb() -> float:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+
+    def get(self) -> Model:
+        """Модель уровня; загружается, если ещё не загружена"""
+        if self.model is None:
+            self.reused = self.resources.has(self.key)
+            rss_before = self._rss_mb()
+            start = time.perf_counter()
+            self.model = self.resources.acquire(
+                self.key,
+                lambda: Model(self.model_path),
+                signature=self.model_path,
+                owner=self.owner
+            )
+            self.load_seconds = time.perf_counter() - start
+            self.resident_mb = max(self._rss_mb() - rss_before, 0.0)
+            self.loads += 1
+        self.touch()
+        return self.model
+
+    def touch(self):
+        self.last_used = time.monotonic()
+
+    def is_idle(self) -> bool:
+        """Загружена и не использовалась дольше idle_seconds"""
+        if self.model is None or not self.idle_seconds:
+            return False
+        return time.monotonic() - self.last_used >= self.idle_seconds
+
+    def unload(self):
+        """Выгружает модель. Распознаватели поверх неё вызывающий должен отпустить заранее."""
+        self.model = None
+        self.resources.evict(self.key)
+        gc.collect()
+        self.unloads += 1
+
+    def track_decode(self, seconds: float, frames: int):
+        self.decode_seconds += seconds
+        self.decoded_frames += frames
+
+    def get_stats(self, rate: int) -> Dict[str, Any]:
+        decoded_seconds = self.decoded_frames / rate
+        return {
+            'model_path': self.model_path,
+            'loaded': self.loaded,
+            'loads': self.loads,
+            'unloads': self.unloads,
+            'reused': self.reused,
+            'load_seconds': round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            'resident_mb': round(self.resident_mb, 1) if self.resident_mb is not None else None,
+            'idle_seconds': self.idle_seconds,
+            'decoded_seconds': round(decoded_seconds, 3),
+            'decode_seconds': round(self.decode_seconds, 3),
+            'decode_real_time_factor': round(self.decode_seconds / decoded_seconds, 4) if decoded_seconds else None
+        }
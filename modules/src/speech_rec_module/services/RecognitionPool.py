@@ -0,0 +1,265 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from vosk import Model
+from interfaces import IAudioSource
+from src.speech_rec_module.audio import VoiceActivityDetector, Endpointer
+from src.speech_rec_module.providers.audio import AudioSourceFactory, PushSource
+from src.speech_rec_module.services.RecognitionStream import RecognitionStream
+from utils.EnvHelper import getenv, getenv_int, getenv_bool, getenv_float
+from utils.LogService import get_logger
+from utils.ResourceRegistry import ResourceRegistry
+from mtypes.Global import Message
+from typing import Any, Dict, Generator, List, Optional, Set
+
+
+class RecognitionPool:
+    """
+    Распознавание нескольких точек захвата в одном процессе.
+
+    Модель Vosk загружается один раз (через реестр оркестратора, так что она
+    общая и с основным SpeechRecognitionService), у каждого стрима своя пара
+    KaldiRecognizer. Декодирование раскидывается по пулу потоков размером
+    с число ядер: vosk отпускает GIL внутри вызовов распознавателя.
+    События стримов помечаются stream_id.
+    """
+
+    SERVICE_NAME = "RecognitionPool"
+    MODULE_ID = "speech_rec_module"
+
+    def __init__(self,
+                 name: str,
+                 model_path: str,
+                 resources: Optional[ResourceRegistry] = None,
+                 workers: int = 0,
+                 backlog_warn_seconds: float = 2.0):
+        """
+        Args:
+            name (str): Имя ассистента
+            model_path (str): Путь к директории с моделью
+            resources (Optional[ResourceRegistry]): Реестр, в котором лежит общая модель
+            workers (int): Размер пула потоков декодирования (0 - по числу ядер)
+            backlog_warn_seconds (float): Отставание стрима, после которого пул считается перегруженным
+        """
+        self.logger = get_logger()
+        self.resources = resources or ResourceRegistry()
+        self.name = name
+
+        aliases = [a.strip().lower() for a in getenv("ASSISTANT_NAME_ALIASES", "").split(",") if a.strip()]
+        self.wake_words: List[str] = [name.lower(), *[a for a in aliases if a != name.lower()]]
+
+        self.rate = getenv_int("VOICE_RECOGNITION_DISCRETIZATION_RATE", 16000)
+        self.channels = getenv_int("VOICE_RECOGNITION_CHANNELS", 1)
+        self.name_detection_buffer = getenv_int("VOICE_RECOGNITION_NAME_DETECTION_BUFFER", 1024)
+        self.full_detection_buffer = getenv_int("VOICE_RECOGNITION_FULL_DETECTION_BUFFER", 8192)
+        self.ring_seconds = getenv_int("VOICE_RECOGNITION_RING_BUFFER_SECONDS", 10)
+        self.recovery_reinit_after = getenv_int("VOICE_RECOGNITION_RECOVERY_REINIT_AFTER", 3)
+        self.recovery_window = getenv_int("VOICE_RECOGNITION_RECOVERY_WINDOW_SECONDS", 60)
+        self.wake_handoff_seconds = getenv_int("VOICE_RECOGNITION_WAKE_HANDOFF_SECONDS", 3)
+
+        self.model = self.resources.acquire(
+            "vosk.model",
+            lambda: Model(model_path),
+            signature=model_path,
+            owner=self.MODULE_ID
+        )
+
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="RecognitionPool")
+        self.max_decode_frames = self.rate
+        self.backlog_warn_frames = int(backlog_warn_seconds * self.rate)
+
+        self.streams: Dict[str, RecognitionStream] = {}
+        self._lock = threading.RLock()
+        self._in_flight: Set[str] = set()
+        self._lagging: Set[str] = set()
+        self._events: "queue.Queue[Message]" = queue.Queue()
+        self._wakeup = threading.Event()
+
+        self.tasks = 0
+        self.saturated_ticks = 0
+        self.ticks = 0
+
+    def add_stream(self, stream_id: str, source: IAudioSource) -> RecognitionStream:
+        vad = VoiceActivityDetector.from_env(self.rate, source.channels) if getenv_bool("VOICE_RECOGNITION_VAD_ENABLED", True) else None
+        endpointer = None
+        if getenv_bool("VOICE_RECOGNITION_ENDPOINT_ENABLED", True):
+            endpointer = Endpointer.from_env(VoiceActivityDetector.from_env(self.rate, source.channels), self.rate)
+
+        stream = RecognitionStream(
+            stream_id=stream_id,
+            model=self.model,
+            source=source,
+            wake_words=self.wake_words,
+            name=self.name,
+            name_detection_buffer=self.name_detection_buffer,
+            full_detection_buffer=self.full_detection_buffer,
+            ring_seconds=self.ring_seconds,
+            vad=vad,
+            endpointer=endpointer,
+            recovery_reinit_after=self.recovery_reinit_after,
+            recovery_window=self.recovery_window,
+            wake_handoff_seconds=self.wake_handoff_seconds
+        )
+        stream.start()
+
+        with self._lock:
+            old = self.streams.pop(stream_id, None)
+            self.streams[stream_id] = stream
+        if old:
+            with old.lock:
+                old.stop()
+
+        self.logger.info(f"Stream '{stream_id}' added ({source.source_name})", self.SERVICE_NAME)
+        self._wakeup.set()
+        return stream
+
+    def add_device_stream(self, stream_id: str, device_index: Optional[int]) -> RecognitionStream:
+        source = AudioSourceFactory.get_source(
+            'microphone',
+            rate=self.rate,
+            channels=self.channels,
+            frames_per_buffer=self.name_detection_buffer,
+            device_index=device_index,
+            resources=self.resources
+        )
+        return self.add_stream(stream_id, source)
+
+    def remove_stream(self, stream_id: str) -> bool:
+        with self._lock:
+            stream = self.streams.pop(stream_id, None)
+            self._lagging.discard(stream_id)
+        if stream is None:
+            return False
+        with stream.lock:
+            stream.stop()
+        self.logger.info(f"Stream '{stream_id}' removed", self.SERVICE_NAME)
+        return True
+
+    def push_audio(self, stream_id: str, pcm: bytes) -> None:
+        """PCM от тонкого клиента; стрим создаётся при первом чанке"""
+        with self._lock:
+            stream = self.streams.get(stream_id)
+        if stream is None or not isinstance(stream.source, PushSource):
+            stream = self.add_stream(stream_id, PushSource(self.rate, self.channels, self.name_detection_buffer))
+        stream.source.push(pcm)  # type: ignore[attr-defined]
+        self._wakeup.set()
+
+    def finish_stream(self, stream_id: str) -> None:
+        """Тонкий клиент закончил передачу: стрим дораспознаётся и удаляется"""
+        with self._lock:
+            stream = self.streams.get(stream_id)
+        if stream is not None and isinstance(stream.source, PushSource):
+            stream.source.finish()
+            self._wakeup.set()
+
+    def _schedule(self) -> None:
+        with self._lock:
+            streams = list(self.streams.items())
+
+        waiting = 0
+        for stream_id, stream in streams:
+            if stream.finished:
+                if stream.lost_error is not None:
+                    self.logger.error(
+                        f"Stream '{stream_id}' lost: audio source could not be recovered after capture error: {stream.lost_error}",
+                        self.SERVICE_NAME,
+                        stream.lost_error
+                    )
+                self.remove_stream(stream_id)
+                continue
+
+            self._check_backlog(stream_id, stream)
+
+            with self._lock:
+                if stream_id in self._in_flight or not stream.ready():
+                    continue
+                if len(self._in_flight) >= self.workers:
+                    waiting += 1
+                    continue
+                self._in_flight.add(stream_id)
+
+            self.tasks += 1
+            future = self.executor.submit(stream.decode, self.max_decode_frames)
+            future.add_done_callback(lambda f, sid=stream_id: self._on_decoded(sid, f))
+
+        self.ticks += 1
+        if waiting:
+            self.saturated_ticks += 1
+
+    def _on_decoded(self, stream_id: str, future: Future) -> None:
+        with self._lock:
+            self._in_flight.discard(stream_id)
+        try:
+            for event in future.result():
+                self._events.put(event)
+        except Exception as e:
+            self.logger.error(f"Decoding failed for stream '{stream_id}': {e}", self.SERVICE_NAME, e)
+        self._wakeup.set()
+
+    def _check_backlog(self, stream_id: str, stream: RecognitionStream) -> None:
+        backlog = stream.backlog_frames()
+        if backlog > self.backlog_warn_frames and stream_id not in self._lagging:
+            self._lagging.add(stream_id)
+            self.logger.warning(
+                f"Stream '{stream_id}' is {backlog / self.rate:.2f}s behind real time, pool of {self.workers} workers is saturated",
+                self.SERVICE_NAME
+            )
+        elif backlog <= self.backlog_warn_frames // 2:
+            self._lagging.discard(stream_id)
+
+    def run(self, stop_event: Optional[threading.Event] = None) -> Generator[Message, None, None]:
+        while not (stop_event and stop_event.is_set()):
+            self._schedule()
+            self._wakeup.wait(0.02)
+            self._wakeup.clear()
+            while True:
+                try:
+                    yield self._events.get_nowait()
+                except queue.Empty:
+                    break
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            streams = dict(self.streams)
+            in_flight = len(self._in_flight)
+            lagging = sorted(self._lagging)
+        return {
+            'workers': self.workers,
+            'in_flight': in_flight,
+            'tasks': self.tasks,
+            'saturated_ratio': round(self.saturated_ticks / self.ticks, 4) if self.ticks else 0.0,
+            'lagging_streams': lagging,
+            'streams': {sid: s.get_stats() for sid, s in streams.items()}
+        }
+
+    def cleanup(self):
+        with self._lock:
+            stream_ids = list(self.streams.keys())
+        for stream_id in stream_ids:
+            try:
+                self.remove_stream(stream_id)
+            except Exception as e:
+                print(f"[{self.SERVICE_NAME}] error removing stream '{stream_id}': {e}")
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    @classmethod
+    def from_env(cls, name: str, model_path: str, resources: Optional[ResourceRegistry] = None) -> 'RecognitionPool':
+        """
+        Пул по init.properties: VOICE_RECOGNITION_POOL_DEVICES задаёт локальные
+        устройства в виде `stream_id=device_index` через запятую.
+        """
+        pool = cls(
+            name=name,
+            model_path=model_path,
+            resources=resources,
+            workers=getenv_int("VOICE_RECOGNITION_POOL_WORKERS", 0),
+            backlog_warn_seconds=getenv_float("VOICE_RECOGNITION_POOL_BACKLOG_WARN_SECONDS", 2.0)
+        )
+        for entry in getenv("VOICE_RECOGNITION_POOL_DEVICES", "").split(","):
+            stream_id, _, device = entry.strip().partition("=")
+            if not stream_id:
+                continue
+            pool.add_device_stream(stream_id.strip(), int(device) if device.strip() else None)
+        return pool
@@ -0,0 +1,312 @@
+import time
+import threading
+from collections import deque
+from vosk import Model
+from interfaces import IAudioSource
+from src.speech_rec_module.audio import AudioRingBuffer, AudioCapture, VoiceActivityDetector, Endpointer, WakeAudioHistory
+from src.speech_rec_module.providers.engines import EngineFactory
+from enums.Events import EventsType, EventsTopic
+from utils.Tracer import Tracer
+from mtypes.Global import Message
+from typing import Any, Deque, Dict, List, Optional
+
+
+class RecognitionStream:
+    """
+    Одна точка захвата в пуле распознавания.
+
+    Держит свой источник, кольцевой буфер, поток захвата и пару
+    распознавателей (имя по грамматике + полный текст) поверх общей модели.
+    В отличие от SpeechRecognitionService не читает звук сам: пул вызывает
+    decode() в рабочем потоке, когда в буфере накопился звук. Один поток
+    одновременно декодирует не больше одного вызова decode() на стрим.
+
+    Ошибка захвата у живого источника восстанавливается так же, как
+    в SpeechRecognitionService: сначала переоткрывается поток, затем
+    переинициализируется бэкенд. Стрим завершается (finished, lost_error),
+    только если восстановить источник не удалось.
+    """
+
+    def __init__(self,
+                 stream_id: str,
+                 model: Model,
+                 source: IAudioSource,
+                 wake_words: List[str],
+                 name: str,
+                 name_detection_buffer: int = 1024,
+                 full_detection_buffer: int = 8192,
+                 ring_seconds: int = 10,
+                 vad: Optional[VoiceActivityDetector] = None,
+                 endpointer: Optional[Endpointer] = None,
+                 recovery_reinit_after: int = 3,
+                 recovery_window: int = 60,
+                 wake_handoff_seconds: int = 3):
+        self.stream_id = stream_id
+        self.source = source
+        self.rate = source.rate
+        self.name = name
+        self.wake_words = wake_words
+
+        self.name_recognizer = EngineFactory.get_engine('vosk', self.rate, model=model, grammar=[*wake_words, "[unk]"])
+        self.full_recognizer = EngineFactory.get_engine('vosk', self.rate, model=model)
+
+        self.name_detection_buffer = name_detection_buffer
+        self.full_detection_buffer = full_detection_buffer
+        self.vad = vad
+        self.endpointer = endpointer
+
+        self.ring = AudioRingBuffer(
+            capacity_frames=max(ring_seconds * self.rate, full_detection_buffer * 2),
+            channels=source.channels
+        )
+        self.capture: Optional[AudioCapture] = None
+        self.is_name_listening_state = True
+        self.finished = False
+        # Звук после имени в той же фразе передаётся полному распознавателю, как в SpeechRecognitionService
+        self.wake_audio = WakeAudioHistory(
+            self.rate,
+            self.ring.frame_size,
+            wake_handoff_seconds * self.rate,
+            {w.split()[-1] for w in wake_words}
+        )
+        self.lost_error: Optional[Exception] = None
+
+        self.recovery_reinit_after = recovery_reinit_after
+        self.recovery_window = recovery_window
+        self._recovery_times: Deque[float] = deque()
+        self.stream_reopens = 0
+        self.backend_reinits = 0
+
+        self.lock = threading.Lock()
+        self.decoded_frames = 0
+        self.decode_seconds = 0.0
+        self.max_backlog_frames = 0
+        self.wakes = 0
+        self.utterances = 0
+        self._trace: Optional[Dict[str, Any]] = None
+
+    def start(self):
+        self.source.open()
+        self._start_capture()
+
+    def _start_capture(self):
+        self.capture = AudioCapture(
+            read_fn=self.source.read,
+            ring=self.ring,
+            chunk_frames=self.name_detection_buffer,
+            blocking=not self.source.is_live
+        )
+        self.capture.start()
+
+    def stop(self):
+        if self.capture:
+            self.capture.stop()
+            self.capture = None
+        try:
+            self.source.close()
+        except Exception as e:
+            print(f"[RecognitionStream:{self.stream_id}] error closing audio source: {e}")
+
+    def _chunk_frames(self) -> int:
+        if self.is_name_listening_state:
+            return self.name_detection_buffer
+        if self.endpointer:
+            return max(self.name_detection_buffer, min(self.full_detection_buffer, self.endpointer.chunk_frames))
+        return self.full_detection_buffer
+
+    def backlog_frames(self) -> int:
+        return self.ring.available()
+
+    def ready(self) -> bool:
+        """Есть ли что декодировать (целый чанк или остаток исчерпанного источника)"""
+        if self.finished:
+            return False
+        available = self.ring.available()
+        if self.capture is not None and (self.capture.finished or self.capture.error):
+            return True
+        return available >= self._chunk_frames()
+
+    def decode(self, max_frames: int) -> List[Message]:
+        """
+        Декодирует накопленный звук, но не больше max_frames за вызов,
+        чтобы один стрим не занимал рабочий поток надолго.
+        """
+        with self.lock:
+            events: List[Message] = []
+            backlog = self.ring.available()
+            self.max_backlog_frames = max(self.max_backlog_frames, backlog)
+            start = time.perf_counter()
+            budget = max_frames
+
+            while budget > 0:
+                chunk_frames = self._chunk_frames()
+                available = self.ring.available()
+                if available < chunk_frames:
+                    if self.capture is not None and (self.capture.finished or self.capture.error) and available:
+                        chunk_frames = available
+                    else:
+                        break
+
+                data = self.ring.read(chunk_frames, timeout=0)
+                if data is None:
+                    break
+                chunk = bytes(data)
+                budget -= chunk_frames
+                self.decoded_frames += chunk_frames
+
+                if self.is_name_listening_state:
+                    events.extend(self._feed_name(chunk))
+                else:
+                    events.extend(self._feed_full(chunk))
+
+            if self.capture is not None and self.ring.available() == 0:
+                if self.capture.error:
+                    error = self.capture.error
+                    print(f"[RecognitionStream:{self.stream_id}] capture error: {error}")
+                    if not self._recover():
+                        self.lost_error = error
+                        self.finished = True
+                elif self.capture.finished:
+                    if not self.is_name_listening_state:
+                        events.extend(self._final(self.full_recognizer.final()['text'], 'kaldi'))
+                    self.finished = True
+
+            self.decode_seconds += time.perf_counter() - start
+            return events
+
+    def _recover(self) -> bool:
+        """
+        Переоткрывает источник после ошибки захвата; полная переинициализация
+        бэкенда - после recovery_reinit_after сбоев за recovery_window или если
+        переоткрыть поток не удалось. Неживые источники не восстанавливаются.
+        """
+        if not self.source.is_live:
+            return False
+        if self.capture:
+            self.capture.stop()
+            self.capture = None
+
+        now = time.monotonic()
+        while self._recovery_times and now - self._recovery_times[0] > self.recovery_window:
+            self._recovery_times.popleft()
+        self._recovery_times.append(now)
+
+        level = 'backend' if len(self._recovery_times) >= self.recovery_reinit_after else 'stream'
+        if level == 'stream':
+            try:
+                self.source.reopen()
+            except Exception as e:
+                print(f"[RecognitionStream:{self.stream_id}] failed to reopen audio source: {e}")
+                level = 'backend'
+
+        if level == 'backend':
+            try:
+                try:
+                    self.source.close()
+                except Exception as e:
+                    print(f"[RecognitionStream:{self.stream_id}] error closing audio source: {e}")
+                self.source.reset()
+                self.source.open()
+                self._recovery_times.clear()
+            except Exception as e:
+                print(f"[RecognitionStream:{self.stream_id}] failed to reinitialize audio backend: {e}")
+                return False
+
+        if level == 'stream':
+            self.stream_reopens += 1
+        else:
+            self.backend_reinits += 1
+        self._start_capture()
+        print(f"[RecognitionStream:{self.stream_id}] audio source recovered ({level})")
+        return True
+
+    def _feed_name(self, chunk: bytes) -> List[Message]:
+        was_speech = self.vad.in_speech if self.vad else False
+        chunks = self.vad.process(chunk) if self.vad else [chunk]
+        if not chunks and was_speech:
+            result = self.name_recognizer.final()
+            self.name_recognizer.reset()
+            if self._has_wake_word(result['text']):
+                return self._wake(self.wake_audio.after_wake_word(result['words']))
+
+        for index, part in enumerate(chunks):
+            self.wake_audio.remember(part)
+            if self.name_recognizer.accept(part):
+                result = self.name_recognizer.result()
+            else:
+                result = self.name_recognizer.partial()
+            if self._has_wake_word(result['text']):
+                # Звук после имени - и в этом чанке, и в ещё не разобранных - уходит полному распознавателю
+                handoff = self.wake_audio.after_wake_word(result['words']) + b''.join(chunks[index + 1:])
+                return self._wake(handoff)
+        return []
+
+    def _has_wake_word(self, text: Optional[str]) -> bool:
+        text = (text or '').lower()
+        return bool(text) and any(w in text for w in self.wake_words)
+
+    def _wake(self, handoff: bytes = b'') -> List[Message]:
+        self.wakes += 1
+        self.is_name_listening_state = False
+        self.name_recognizer.reset()
+        self.wake_audio.forget()
+        self.full_recognizer.reset()
+        if self.vad:
+            self.vad.reset()
+        if self.endpointer:
+            self.endpointer.start()
+        self._trace = Tracer.new_trace()
+        events = [self._message(EventsType.SERVICE_ACTION, EventsTopic.ACTION_WAKE, {'name': self.name, 'trace': self._trace})]
+        if handoff:
+            events.extend(self._feed_full(handoff))
+        return events
+
+    def _feed_full(self, chunk: bytes) -> List[Message]:
+        if self.endpointer:
+            self.endpointer.observe(chunk)
+
+        if self.full_recognizer.accept(chunk):
+            return self._final(self.full_recognizer.result()['text'], 'kaldi')
+
+        if self.endpointer:
+            trigger = self.endpointer.check(self.full_recognizer.partial()['text'])
+            if trigger:
+                return self._final(self.full_recognizer.final()['text'], trigger)
+        return []
+
+    def _final(self, text: Optional[str], trigger: str) -> List[Message]:
+        if not text:
+            return []
+        endpoint = self.endpointer.finish(trigger) if self.endpointer else None
+        self.utterances += 1
+        self.is_name_listening_state = True
+        payload: Dict[str, Any] = {'text': text, 'trace': self._trace}
+        if endpoint:
+            payload['endpoint'] = endpoint
+        if self._trace:
+            Tracer.getInstance().add_span('recognition', self._trace, self._trace['started_at'], stream_id=self.stream_id)
+        return [self._message(EventsType.EVENT, EventsTopic.RAW_TEXT_DATA_RECOGNIZED, payload)]
+
+    def _message(self, type: EventsType, topic: EventsTopic, payload: Dict[str, Any]) -> Message:
+        return {'type': type.value, 'topic': topic.value, 'payload': {**payload, 'stream_id': self.stream_id}}
+
+    def get_stats(self) -> Dict[str, Any]:
+        backlog = self.ring.available()
+        decoded_seconds = self.decoded_frames / self.rate
+        return {
+            'source': self.source.source_name,
+            'listening_for_name': self.is_name_listening_state,
+            'backlog_seconds': round(backlog / self.rate, 3),
+            'max_backlog_seconds': round(self.max_backlog_frames / self.rate, 3),
+            'decoded_seconds': round(decoded_seconds, 3),
+            'decode_real_time_factor': round(self.decode_seconds / decoded_seconds, 4) if decoded_seconds else None,
+            'wakes': self.wakes,
+            'utterances': self.utterances,
+            'finished': self.finished,
+            'recovery': {
+                'stream_reopens': self.stream_reopens,
+                'backend_reinits': self.backend_reinits,
+                'lost_error': str(self.lost_error) if self.lost_error else None
+            },
+            'ring': self.ring.get_stats()
+        }
@@ -2,7 +2,9 @@ from src.speech_rec_module.services import SpeechRecognitionService
 from utils import AudioService
 from mtypes.Global import Message
 from colorama import Fore, Style
-from typing import Generator
+from interfaces import IAudioSource
+from utils.ResourceRegistry import ResourceRegistry
+from typing import Generator, Optional
 import colorama
 
 colorama.init()
@@ -10,13 +12,17 @@ colorama.init()
 class Recognizer:
     def __init__(self,
                  name: str,
-                 VOICE_RECOGNITION_MODEL_DIR_PATH: str):
+                 VOICE_RECOGNITION_MODEL_DIR_PATH: str,
+                 audio_source: Optional[IAudioSource] = None,
+                 resources: Optional[ResourceRegistry] = None):
         """
         Инициализация голосового ассистента
         
         Args:
             name (str): Имя ассистента
             VOICE_RECOGNITION_MODEL_DIR_PATH (str): Путь к директории с моделью распознавания речи
+            audio_source (Optional[IAudioSource]): Источник звука вместо настроенного в init.properties
+            resources (Optional[ResourceRegistry]): Реестр оркестратора для переиспользования модели между перезапусками
         """
 
         self.current_state = 'NORMAL'
@@ -26,7 +32,7 @@ class Recognizer:
         
         self.services = {
             'audio': AudioService().getInstance(),
-            "speech_recognition": SpeechRecognitionService(name, VOICE_RECOGNITION_MODEL_DIR_PATH),
+            "speech_recognition": SpeechRecognitionService(name, VOICE_RECOGNITION_MODEL_DIR_PATH, audio_source, resources),
         }
 
     def run(self, stop_event=None) -> Generator[Message, None, None]:
@@ -40,6 +46,17 @@ class Recognizer:
         finally:
             print(f"[Recognizer] run loop finished")
 
+    def set_audio_source(self, source: IAudioSource):
+        self.services["speech_recognition"].set_audio_source(source)
+
+    def open_follow_up(self):
+        """Открывает окно, в котором следующую команду можно сказать без имени"""
+        self.services["speech_recognition"].open_follow_up()
+
+    def get_stats(self) -> dict:
+        """Статистика сервиса распознавания (захват звука, буферы)"""
+        return self.services["speech_recognition"].get_stats()
+
     def cleanup(self):
         """Корректная очистка ресурсов"""
         try:
@@ -1,43 +1,75 @@
-import pyaudio
-import time, json
-from vosk import Model, KaldiRecognizer
+import time
+import threading
+from pathlib import Path
+import numpy as np
 from colorama import Fore, Style, init
-from interfaces import IService
+from interfaces import IService, IAudioSource, IRecognitionEngine
 from utils import AudioService
-from utils.EnvHelper import getenv_int, getenv
+from src.speech_rec_module.audio import AudioRingBuffer, AudioCapture, VoiceActivityDetector, Endpointer, SharedFrameRing, KeywordSpotter, WakeAudioHistory
+from src.speech_rec_module.providers.audio import AudioSourceFactory
+from src.speech_rec_module.providers.engines import EngineFactory
+from src.speech_rec_module.services.ModelTier import ModelTier
+from utils.EnvHelper import getenv_int, getenv, getenv_bool, getenv_float
 from utils.LogService import get_logger
+from utils.ResourceRegistry import ResourceRegistry
+from utils.Tracer import Tracer
+from paths import path_resolver
 from enums.Events import EventsType, EventsTopic
 from mtypes.Global import Message
-from typing import Generator, override, Optional
+from collections import deque
+from typing import Any, Dict, Generator, override, Optional, Deque, List
 
 init()
 
 class SpeechRecognitionService(IService):
     SERVICE_NAME = "SpeechRecognitionService"
     
-    def __init__(self, name, model_path):
+    MODULE_ID = "speech_rec_module"
+
+    def __init__(self, name, model_path, audio_source: Optional[IAudioSource] = None, resources: Optional[ResourceRegistry] = None):
         """
         Инициализация сервиса распознавания речи
         
         Args:
             name (str): Имя, которое будет распознаваться
             model_path (str): Путь к директории с моделью
+            audio_source (Optional[IAudioSource]): Источник звука; по умолчанию берётся из VOICE_RECOGNITION_SOURCE
+            resources (Optional[ResourceRegistry]): Реестр, в котором модель переживает перезапуск модуля
         """
         self.logger = get_logger()
+        self.resources = resources or ResourceRegistry()
         self.name = name
         self._name_lower = name.lower()
+
+        aliases = [a.strip().lower() for a in getenv("ASSISTANT_NAME_ALIASES", "").split(",") if a.strip()]
+        self.wake_words: List[str] = [self._name_lower, *[a for a in aliases if a != self._name_lower]]
+        self._wake_tokens = {w.split()[-1] for w in self.wake_words}
+
+        self.rate = getenv_int("VOICE_RECOGNITION_DISCRETIZATION_RATE", 16000)
+        self.channels = getenv_int("VOICE_RECOGNITION_CHANNELS", 1)
         
+        self.wake_tier = ModelTier('wake', model_path, self.resources, key="vosk.model", owner=self.MODULE_ID)
+        self.command_tier = self._create_command_tier(model_path)
+
         try:
-            self.logger.info(f"Loading Vosk model from: {model_path}", self.SERVICE_NAME)
-            self.model = Model(model_path)
+            reused = self.resources.has("vosk.model")
+            self.logger.info(f"{'Reusing' if reused else 'Loading'} Vosk model from: {model_path}", self.SERVICE_NAME)
+            self.model = self.wake_tier.get()
             self.logger.info("Vosk model loaded successfully", self.SERVICE_NAME)
         except Exception as e:
             self.logger.critical(f"Failed to load Vosk model from {model_path}", self.SERVICE_NAME, e)
             raise
 
         try:
-            self.name_recognizer = KaldiRecognizer(self.model, getenv_int("VOICE_RECOGNITION_DISCRETIZATION_RATE", 16000))
-            self.full_recognizer = KaldiRecognizer(self.model, getenv_int("VOICE_RECOGNITION_DISCRETIZATION_RATE", 16000))
+            grammar = None
+            if getenv_bool("VOICE_RECOGNITION_WAKE_GRAMMAR_ENABLED", True):
+                grammar = [*self.wake_words, "[unk]"]
+                self.logger.info(f"Wake recognizer restricted to grammar: {grammar}", self.SERVICE_NAME)
+            self.name_recognizer = EngineFactory.get_engine('vosk', self.rate, model=self.model, grammar=grammar)
+
+            self.full_recognizer: Optional[IRecognitionEngine] = None
+            if self.command_tier is self.wake_tier:
+                self.full_recognizer = EngineFactory.get_engine('vosk', self.rate, model=self.model)
             self.logger.info("Kaldi recognizers initialized", self.SERVICE_NAME)
         except Exception as e:
             self.logger.critical("Failed to initialize Kaldi recognizers", self.SERVICE_NAME, e)
@@ -46,53 +78,836 @@ class SpeechRecognitionService(IService):
         self.name_detection_buffer = getenv_int("VOICE_RECOGNITION_NAME_DETECTION_BUFFER", 1024)
         self.full_detection_buffer = getenv_int("VOICE_RECOGNITION_FULL_DETECTION_BUFFER", 8192)
 
+        ring_seconds = getenv_int("VOICE_RECOGNITION_RING_BUFFER_SECONDS", 10)
+        self.ring = AudioRingBuffer(
+            capacity_frames=max(ring_seconds * self.rate, self.full_detection_buffer * 2),
+            channels=self.channels
+        )
+        self.capture: Optional[AudioCapture] = None
+        self._reported_dropped_frames = 0
+        self.bus: Optional[SharedFrameRing] = self._create_audio_bus()
+
+        self.vad: Optional[VoiceActivityDetector] = None
+        if getenv_bool("VOICE_RECOGNITION_VAD_ENABLED", True):
+            self.vad = VoiceActivityDetector.from_env(self.rate, self.channels)
+
+        self.endpointer: Optional[Endpointer] = None
+        if getenv_bool("VOICE_RECOGNITION_ENDPOINT_ENABLED", True):
+            self.endpointer = Endpointer.from_env(self.vad or VoiceActivityDetector.from_env(self.rate, self.channels), self.rate)
+
         self.name_in_partial = False
         self.is_name_listening_state = True
 
-        self.p: Optional[pyaudio.PyAudio] = None
-        self.stream: Optional[pyaudio.Stream] = None
+        self.wake_audio = WakeAudioHistory(
+            self.rate,
+            self.ring.frame_size,
+            getenv_int("VOICE_RECOGNITION_WAKE_HANDOFF_SECONDS", 3) * self.rate,
+            self._wake_tokens
+        )
+        self._wake_handoff = b''
+
+        self.spotter: Optional[KeywordSpotter] = self._create_keyword_spotter()
+        self._kws_audio: Deque[bytes] = deque()
+        self._kws_audio_frames = 0
+        self.kws_candidates = 0
+        self.kws_confirmed = 0
+        self.kws_confirm_seconds = 0.0
+        self.wake_cpu_seconds = 0.0
+        self.wake_listen_frames = 0
+
+        self.follow_up_enabled = getenv_bool("VOICE_RECOGNITION_FOLLOW_UP_ENABLED", False)
+        self.follow_up_frames = int(getenv_float("VOICE_RECOGNITION_FOLLOW_UP_SECONDS", 6.0) * self.rate)
+        self._follow_up_requested = threading.Event()
+        self._follow_up_pending = False
+        self._follow_up_active = False
+        self._wake_speech_started: Optional[int] = None
+        self.follow_ups_opened = 0
+        self.follow_ups_used = 0
+        self.follow_up_timeouts = 0
+        self.wake_overhead_frames = 0
+        self.wake_overhead_measured = 0
+
+        self.partials_enabled = getenv_bool("VOICE_RECOGNITION_PARTIALS_ENABLED", False)
+        self.partials_interval = getenv_int("VOICE_RECOGNITION_PARTIALS_INTERVAL_MS", 250) / 1000
+        self._utterance_id = 0
+        self._trace: Optional[Dict[str, Any]] = None
+        self.tracer = Tracer.getInstance()
+        self._partial_seq = 0
+        self._partial_text = ''
+        self._partial_emitted_at = 0.0
+        self.partials_emitted = 0
+        self.partials_throttled = 0
+
+        self.earcon_suppression = getenv("VOICE_RECOGNITION_EARCON_SUPPRESSION", "skip").lower()
+        self.earcon_gain = 10 ** (-getenv_float("VOICE_RECOGNITION_EARCON_ATTENUATION_DB", 30.0) / 20)
+        self.earcon_tail_frames = getenv_int("VOICE_RECOGNITION_EARCON_TAIL_MS", 150) * self.rate // 1000
+        self._earcon_window: Optional[List[Optional[int]]] = None
+        self.earcon_skipped_frames = 0
+        self.earcon_attenuated_frames = 0
+
+        self.second_pass: Optional[IRecognitionEngine] = self._create_second_pass()
+        self.second_pass_confidence = getenv_float("VOICE_RECOGNITION_SECOND_PASS_CONFIDENCE", 0.75)
+        self._utterance_audio: List[bytes] = []
+        self.streaming_utterances = 0
+        self.streaming_confidence_sum = 0.0
+        self.streaming_confidence_count = 0
+        self.second_pass_runs = 0
+        self.second_pass_replaced = 0
+        self.second_pass_agreed = 0
+        self.second_pass_seconds = 0.0
+        self.second_pass_audio_frames = 0
+
+        self.recovery_reinit_after = getenv_int("VOICE_RECOGNITION_RECOVERY_REINIT_AFTER", 3)
+        self.recovery_window = getenv_int("VOICE_RECOGNITION_RECOVERY_WINDOW_SECONDS", 60)
+        self._recovery_times: Deque[float] = deque()
+        self.recoveries: Deque[dict] = deque(maxlen=50)
+        self.stream_reopens = 0
+        self.backend_reinits = 0
+
+        self.source: Optional[IAudioSource] = audio_source
         self._init_audio_stream()
 
         self.services = {
             "audio": AudioService().getInstance()
         }
+        self.services['audio'].warm_up() # type: ignore
 
-    def _init_audio_stream(self):
+    def _create_command_tier(self, wake_model_path: str) -> ModelTier:
+        """
+        Модель для команд. Если рядом с моделью имени есть отдельная
+        (VOICE_RECOGNITION_COMMAND_MODEL_PATH или voice_command_model_path),
+        она загружается при первом обращении и выгружается после простоя;
+        иначе оба распознавателя работают на модели имени.
+        """
+        path = getenv("VOICE_RECOGNITION_COMMAND_MODEL_PATH", "") or path_resolver['voice_command_model_path']
+        if not Path(path).exists() or Path(path).resolve() == Path(wake_model_path).resolve():
+            return self.wake_tier
+
+        self.logger.info(f"Command recognition will use a separate model from: {path}", self.SERVICE_NAME)
+        return ModelTier(
+            'command',
+            path,
+            self.resources,
+            key="vosk.command_model",
+            owner=self.MODULE_ID,
+            idle_seconds=getenv_float("VOICE_RECOGNITION_COMMAND_MODEL_IDLE_SECONDS", 300.0)
+        )
+
+    def _command_recognizer(self) -> IRecognitionEngine:
+        """Распознаватель команд; догружает модель команд, если она была выгружена"""
+        if self.full_recognizer is None:
+            loaded = self.command_tier.loaded
+            try:
+                self.full_recognizer = EngineFactory.get_engine('vosk', self.rate, model=self.command_tier.get())
+            except Exception as e:
+                self.logger.critical(f"Failed to load command model from {self.command_tier.model_path}", self.SERVICE_NAME, e)
+                raise
+            if not loaded:
+                self.logger.info(
+                    f"Command model loaded in {self.command_tier.load_seconds:.2f}s "
+                    f"(+{self.command_tier.resident_mb:.0f} MB resident)",
+                    self.SERVICE_NAME
+                )
+        self.command_tier.touch()
+        return self.full_recognizer
+
+    def _unload_idle_command_model(self):
+        if self.command_tier is self.wake_tier or not self.command_tier.is_idle():
+            return
+        self.full_recognizer = None
+        self.command_tier.unload()
+        self.logger.info("Command model unloaded after idle period", self.SERVICE_NAME)
+
+    def _accept_waveform(self, recognizer: IRecognitionEngine, tier: ModelTier, chunk: bytes) -> bool:
+        start = time.perf_counter()
+        try:
+            return recognizer.accept(chunk)
+        finally:
+            tier.track_decode(time.perf_counter() - start, len(chunk) // self.ring.frame_size)
+
+    def _create_second_pass(self) -> Optional[IRecognitionEngine]:
+        """
+        Непотоковый движок для повторного распознавания фраз с низкой
+        уверенностью Vosk (VOICE_RECOGNITION_SECOND_PASS_ENGINE, по умолчанию выключен)
+        """
+        engine = getenv("VOICE_RECOGNITION_SECOND_PASS_ENGINE", "").lower()
+        if not engine:
+            return None
+
+        options: Dict[str, Any] = {}
+        if engine == 'whisper':
+            options = dict(
+                model=getenv("VOICE_RECOGNITION_WHISPER_MODEL", "small"),
+                compute_type=getenv("VOICE_RECOGNITION_WHISPER_COMPUTE_TYPE", "int8"),
+                language=getenv("VOICE_RECOGNITION_WHISPER_LANGUAGE", "ru"),
+                beam_size=getenv_int("VOICE_RECOGNITION_WHISPER_BEAM_SIZE", 1)
+            )
         try:
-            if self.stream:
-                self.stream.stop_stream()
-                self.stream.close()
-            if self.p:
-                self.p.terminate()
+            second_pass = EngineFactory.get_engine(engine, self.rate, **options)
         except Exception as e:
-            self.logger.warning(f"Error during audio stream cleanup: {e}", self.SERVICE_NAME, e)
-            
+            self.logger.warning(f"Second pass engine '{engine}' unavailable, using streaming results only: {e}", self.SERVICE_NAME)
+            return None
+        self.logger.info(f"Low-confidence utterances will be re-decoded by '{second_pass.engine_name}'", self.SERVICE_NAME)
+        return second_pass
+
+    def _create_keyword_spotter(self) -> Optional[KeywordSpotter]:
+        """Детектор имени на MFCC + DTW вместо постоянно работающего Kaldi (VOICE_RECOGNITION_WAKE_ENGINE=kws)"""
+        if getenv("VOICE_RECOGNITION_WAKE_ENGINE", "kaldi").lower() != 'kws':
+            return None
+
+        path = getenv("VOICE_RECOGNITION_KWS_TEMPLATES_PATH", "") or path_resolver['wake_templates_path']
         try:
-            self.logger.info("Initializing PyAudio stream", self.SERVICE_NAME)
-            self.p = pyaudio.PyAudio()
-            self.stream = self.p.open(
-                format=pyaudio.paInt16,
-                channels=getenv_int("VOICE_RECOGNITION_CHANNELS", 1),
-                rate=getenv_int("VOICE_RECOGNITION_DISCRETIZATION_RATE", 16000),
-                input=True,
-                frames_per_buffer=self.full_detection_buffer
+            spotter = KeywordSpotter.load(
+                path,
+                rate=self.rate,
+                threshold=getenv_float("VOICE_RECOGNITION_KWS_THRESHOLD", 0.0),
+                check_interval_ms=getenv_int("VOICE_RECOGNITION_KWS_CHECK_INTERVAL_MS", 100)
             )
-            self.stream.start_stream()
-            self.logger.info("PyAudio stream initialized successfully", self.SERVICE_NAME)
         except Exception as e:
-            self.logger.critical("Failed to initialize PyAudio stream", self.SERVICE_NAME, e)
-            raise
+            self.logger.warning(f"Keyword spotter unavailable, falling back to Kaldi wake detection: {e}", self.SERVICE_NAME)
+            return None
+        self.logger.info(f"Keyword spotter loaded {len(spotter.templates)} templates from {path}", self.SERVICE_NAME)
+        return spotter
+
+    def _create_audio_bus(self) -> Optional[SharedFrameRing]:
+        """Общая аудиошина в shared memory для сторонних читателей (VOICE_RECOGNITION_AUDIO_BUS_NAME)"""
+        bus_name = getenv("VOICE_RECOGNITION_AUDIO_BUS_NAME", "")
+        if not bus_name:
+            return None
+
+        options = dict(
+            capacity_frames=getenv_int("VOICE_RECOGNITION_AUDIO_BUS_SECONDS", 10) * self.rate,
+            frame_size=self.ring.frame_size,
+            max_consumers=getenv_int("VOICE_RECOGNITION_AUDIO_BUS_CONSUMERS", 8),
+            overhang_frames=self.full_detection_buffer
+        )
+        try:
+            bus = SharedFrameRing.create(bus_name, **options)
+        except FileExistsError:
+            try:
+                stale = SharedFrameRing.attach(bus_name)
+            except ValueError as e:
+                self.logger.error(f"Audio bus '{bus_name}' is taken by a foreign segment, bus disabled: {e}", self.SERVICE_NAME)
+                return None
+            if not stale.is_abandoned():
+                self.logger.error(
+                    f"Audio bus '{bus_name}' is published by live process {stale.producer_pid}, bus disabled",
+                    self.SERVICE_NAME
+                )
+                stale.close()
+                return None
+            # Сегмент остался от упавшего процесса
+            self.logger.warning(f"Audio bus '{bus_name}' left by process {stale.producer_pid}, recreating it", self.SERVICE_NAME)
+            stale.owner = True
+            stale.close()
+            bus = SharedFrameRing.create(bus_name, **options)
+        self.logger.info(f"Publishing captured audio to shared bus '{bus_name}'", self.SERVICE_NAME)
+        return bus
+
+    def _init_audio_stream(self):
+        recovering = self.capture is not None and self.source is not None
+        last_data_at = self.capture.last_data_at if self.capture else None
+        if self.capture:
+            self.capture.stop()
+            self.capture = None
+
+        if recovering:
+            self._recover_audio_source(last_data_at)
+        else:
+            try:
+                if self.source:
+                    self.source.close()
+            except Exception as e:
+                self.logger.warning(f"Error during audio stream cleanup: {e}", self.SERVICE_NAME, e)
+
+            if self.source is None:
+                self.source = self._create_audio_source()
+                
+            try:
+                self.logger.info(f"Initializing audio source '{self.source.source_name}'", self.SERVICE_NAME)
+                self.source.open()
+                self.logger.info("Audio source initialized successfully", self.SERVICE_NAME)
+            except Exception as e:
+                self.logger.critical("Failed to initialize audio source", self.SERVICE_NAME, e)
+                raise
+
+        self.ring.clear()
+        self.capture = AudioCapture(
+            read_fn=self.source.read,
+            ring=self.ring,
+            chunk_frames=self.name_detection_buffer,
+            blocking=not self.source.is_live,
+            bus=self.bus
+        )
+        self.capture.start()
+
+    def _recover_audio_source(self, last_data_at: Optional[float]):
+        """
+        Восстановление источника после ошибки. Сначала переоткрывается только
+        поток; полная переинициализация бэкенда (для PyAudio - PortAudio с
+        перечислением устройств) выполняется, если за recovery_window набралось
+        recovery_reinit_after сбоев или если переоткрыть поток не удалось
+        (например, устройство отключили).
+        """
+        assert self.source is not None
+        started = time.monotonic()
+        while self._recovery_times and started - self._recovery_times[0] > self.recovery_window:
+            self._recovery_times.popleft()
+        self._recovery_times.append(started)
+
+        level = 'backend' if len(self._recovery_times) >= self.recovery_reinit_after else 'stream'
+        error = None
+        if level == 'stream':
+            try:
+                self.source.reopen()
+            except Exception as e:
+                error = e
+                level = 'backend'
+
+        if level == 'backend':
+            try:
+                try:
+                    self.source.close()
+                except Exception as e:
+                    self.logger.warning(f"Error during audio stream cleanup: {e}", self.SERVICE_NAME, e)
+                self.source.reset()
+                self.source.open()
+                self._recovery_times.clear()
+            except Exception as e:
+                self.logger.critical("Failed to reinitialize audio backend", self.SERVICE_NAME, e)
+                raise
+
+        finished = time.monotonic()
+        record = {
+            'level': level,
+            'gap_ms': round((finished - (last_data_at or started)) * 1000, 1),
+            'recovery_ms': round((finished - started) * 1000, 1),
+            'stream_error': str(error) if error else None,
+            'at': time.time()
+        }
+        self.recoveries.append(record)
+        if level == 'stream':
+            self.stream_reopens += 1
+        else:
+            self.backend_reinits += 1
+        self.logger.info(f"Audio source recovered ({level}), gap {record['gap_ms']} ms", self.SERVICE_NAME)
+
+    def set_audio_source(self, source: IAudioSource):
+        """Подменяет источник звука и сбрасывает состояние распознавания (модель не перезагружается)"""
+        if self.capture:
+            self.capture.stop()
+            self.capture = None
+        try:
+            if self.source:
+                self.source.close()
+        except Exception as e:
+            self.logger.warning(f"Error during audio source cleanup: {e}", self.SERVICE_NAME, e)
+
+        self.source = source
+        self._earcon_window = None
+        self.name_recognizer.reset()
+        if self.full_recognizer:
+            self.full_recognizer.reset()
+        self.wake_audio.forget()
+        self._wake_handoff = b''
+        if self.spotter:
+            self.spotter.reset()
+            self._forget_kws_audio()
+        if self.vad:
+            self.vad.reset()
+        self.name_in_partial = False
+        self.is_name_listening_state = True
+
+        self._init_audio_stream()
+
+    def get_audio_position(self) -> float:
+        """Сколько секунд звука декодер уже забрал из буфера с момента запуска"""
+        return self.ring.read_frames / self.rate
+
+    def _create_audio_source(self) -> IAudioSource:
+        source_name = getenv("VOICE_RECOGNITION_SOURCE", "microphone")
+        options = {}
+        if source_name == 'microphone':
+            device_index = getenv_int("VOICE_RECOGNITION_INPUT_DEVICE_INDEX", -1)
+            options['device_index'] = device_index if device_index >= 0 else None
+            options['resources'] = self.resources
+        elif source_name == 'file':
+            options['path'] = getenv("VOICE_RECOGNITION_SOURCE_PATH", "")
+            options['realtime'] = getenv_bool("VOICE_RECOGNITION_SOURCE_REALTIME", True)
+        elif source_name == 'pipe':
+            options['path'] = getenv("VOICE_RECOGNITION_SOURCE_PATH", "-")
+
+        return AudioSourceFactory.get_source(
+            source_name,
+            rate=self.rate,
+            channels=self.channels,
+            frames_per_buffer=self.full_detection_buffer,
+            **options
+        )
 
     def _is_stream_active(self):
         try:
-            return self.stream is not None and self.stream.is_active() and not self.stream.is_stopped()
+            if self.capture is not None and self.capture.finished:
+                return True
+            if self.capture is None or not self.capture.is_alive():
+                return False
+            return self.source is not None and self.source.is_active()
         except:
             return False
 
+    def _read_frames(self, frames: int) -> Optional[memoryview]:
+        """
+        Забирает кадры из кольцевого буфера, наполняемого потоком захвата.
+        Ошибка потока захвата пробрасывается, чтобы сработало восстановление стрима.
+        Когда источник исчерпан, отдаётся остаток буфера, а затем EOFError.
+        """
+        if self.capture and self.capture.error:
+            raise self.capture.error
+
+        if self.capture and self.capture.finished:
+            available = self.ring.available()
+            if available == 0:
+                raise EOFError("Audio source exhausted")
+            frames = min(frames, available)
+
+        data = self.ring.read(frames, timeout=frames / self.rate + 0.5)
+        self._report_dropped_frames()
+        return data
+
+    def _report_dropped_frames(self):
+        dropped = self.ring.dropped_frames
+        if dropped > self._reported_dropped_frames:
+            self.logger.warning(
+                f"Audio ring buffer overrun: {dropped - self._reported_dropped_frames} frames dropped "
+                f"(total {dropped}, overruns {self.ring.overruns})",
+                self.SERVICE_NAME
+            )
+            self._reported_dropped_frames = dropped
+
+    def get_stats(self) -> dict:
+        """Статистика захвата звука: переполнения и опустошения кольцевого буфера"""
+        return {
+            'ring': self.ring.get_stats(),
+            'vad': self.vad.get_stats() if self.vad else None,
+            'endpoint': self.endpointer.get_stats() if self.endpointer else None,
+            'partials': {
+                'enabled': self.partials_enabled,
+                'emitted': self.partials_emitted,
+                'throttled': self.partials_throttled
+            },
+            'bus': self.bus.get_stats() if self.bus else None,
+            'wake': self._wake_stats(),
+            'follow_up': self._follow_up_stats(),
+            'engines': self._engine_stats(),
+            'models': {
+                'wake': self.wake_tier.get_stats(self.rate),
+                'command': self.command_tier.get_stats(self.rate) if self.command_tier is not self.wake_tier else 'shared'
+            },
+            'recovery': {
+                'stream_reopens': self.stream_reopens,
+                'backend_reinits': self.backend_reinits,
+                'max_gap_ms': max((r['gap_ms'] for r in self.recoveries), default=0.0),
+                'mean_gap_ms': round(sum(r['gap_ms'] for r in self.recoveries) / len(self.recoveries), 1) if self.recoveries else 0.0,
+                'recent': list(self.recoveries)[-5:]
+            },
+            'earcon': {
+                'suppression': self.earcon_suppression,
+                'skipped_frames': self.earcon_skipped_frames,
+                'attenuated_frames': self.earcon_attenuated_frames
+            }
+        }
+
+    def open_follow_up(self):
+        """
+        Ответ ассистента закончился: следующую фразу можно сказать без имени.
+        Вызывается из потока клиента, окно открывает цикл распознавания.
+        """
+        if self.follow_up_enabled:
+            self._follow_up_requested.set()
+
+    @property
+    def wake_overhead_ms(self) -> Optional[float]:
+        """Среднее время от начала речи до срабатывания на имя в обычных обращениях"""
+        if not self.wake_overhead_measured:
+            return None
+        return self.wake_overhead_frames * 1000 / self.rate / self.wake_overhead_measured
+
+    def _follow_up_stats(self) -> dict:
+        overhead = self.wake_overhead_ms
+        return {
+            'enabled': self.follow_up_enabled,
+            'window_seconds': self.follow_up_frames / self.rate,
+            'opened': self.follow_ups_opened,
+            'used': self.follow_ups_used,
+            'timeouts': self.follow_up_timeouts,
+            'use_rate': round(self.follow_ups_used / self.follow_ups_opened, 4) if self.follow_ups_opened else 0.0,
+            'wake_overhead_ms': round(overhead, 1) if overhead is not None else None,
+            'saved_ms': round(overhead * self.follow_ups_used, 1) if overhead is not None else None
+        }
+
+    def _record_wake_overhead(self):
+        if self._wake_speech_started is None:
+            return
+        self.wake_overhead_frames += self.ring.read_index - self._wake_speech_started
+        self.wake_overhead_measured += 1
+        self._wake_speech_started = None
+
+    def _follow_up_heard_speech(self) -> bool:
+        if self.endpointer:
+            return self.endpointer.heard_speech
+        return bool(self._command_recognizer().partial()['text'])
+
+    def _follow_up_expired(self, window_start: int) -> bool:
+        """Окно без имени закрывается, если за follow_up_frames так и не началась речь"""
+        if self.ring.read_index - window_start < self.follow_up_frames:
+            return False
+        return not self._follow_up_heard_speech()
+
+    def _engine_stats(self) -> dict:
+        stats: Dict[str, Any] = {
+            'streaming': {
+                'engine': self.full_recognizer.engine_name if self.full_recognizer else 'vosk',
+                'utterances': self.streaming_utterances,
+                'mean_confidence': round(self.streaming_confidence_sum / self.streaming_confidence_count, 4) if self.streaming_confidence_count else None
+            },
+            'second_pass': None
+        }
+        if self.second_pass:
+            audio_seconds = self.second_pass_audio_frames / self.rate
+            stats['second_pass'] = {
+                'engine': self.second_pass.engine_name,
+                'confidence_threshold': self.second_pass_confidence,
+                'runs': self.second_pass_runs,
+                'skipped': self.streaming_utterances - self.second_pass_runs,
+                'replaced': self.second_pass_replaced,
+                'agreement_rate': round(self.second_pass_agreed / self.second_pass_runs, 4) if self.second_pass_runs else None,
+                'mean_latency_ms': round(self.second_pass_seconds * 1000 / self.second_pass_runs, 1) if self.second_pass_runs else None,
+                'real_time_factor': round(self.second_pass_seconds / audio_seconds, 4) if audio_seconds else None
+            }
+        return stats
+
+    def _wake_stats(self) -> dict:
+        audio_seconds = self.wake_listen_frames / self.rate
+        stats = {
+            'engine': 'kws' if self.spotter else 'kaldi',
+            'audio_seconds': round(audio_seconds, 3),
+            'cpu_seconds': round(self.wake_cpu_seconds, 3),
+            'cpu_seconds_per_audio_second': round(self.wake_cpu_seconds / audio_seconds, 4) if audio_seconds else None
+        }
+        if self.spotter:
+            stats['kws'] = {
+                **self.spotter.get_stats(),
+                'candidates': self.kws_candidates,
+                'confirmed': self.kws_confirmed,
+                'rejected': self.kws_candidates - self.kws_confirmed,
+                'mean_confirm_ms': round(self.kws_confirm_seconds * 1000 / self.kws_candidates, 2) if self.kws_candidates else 0.0
+            }
+        return stats
+
+    def _play_earcon(self, sound_name: str):
+        """
+        Проигрывает звук и запоминает, какие кадры захвата пришлись на него:
+        с текущей позиции записи до конца звука плюс хвост на эхо и задержку ввода.
+        """
+        future = self.services['audio'].play_earcon(sound_name) # type: ignore
+        if future is None or self.earcon_suppression == 'off':
+            return
+
+        window: List[Optional[int]] = [self.ring.written_frames, None]
+        self._earcon_window = window
+
+        def _on_done(_):
+            window[1] = self.ring.written_frames + self.earcon_tail_frames
+
+        future.add_done_callback(_on_done)
+
+    def _suppress_earcon(self, chunk: bytes, start_frame: int) -> bytes:
+        """Вырезает или приглушает кадры чанка, захваченные во время собственного звука"""
+        window = self._earcon_window
+        if window is None:
+            return chunk
+
+        mute_from, mute_to = window
+        end_frame = start_frame + len(chunk) // self.ring.frame_size
+        if mute_to is not None and start_frame >= mute_to:
+            self._earcon_window = None
+            return chunk
+
+        lo = max(start_frame, mute_from) # type: ignore
+        hi = end_frame if mute_to is None else min(end_frame, mute_to)
+        if hi <= lo:
+            return chunk
+
+        a = (lo - start_frame) * self.ring.frame_size
+        b = (hi - start_frame) * self.ring.frame_size
+        if self.earcon_suppression == 'attenuate':
+            samples = np.frombuffer(chunk, dtype=np.int16).copy()
+            samples[a // 2:b // 2] = (samples[a // 2:b // 2] * self.earcon_gain).astype(np.int16)
+            self.earcon_attenuated_frames += hi - lo
+            return samples.tobytes()
+
+        self.earcon_skipped_frames += hi - lo
+        return chunk[:a] + chunk[b:]
+
+    def _begin_utterance(self):
+        self._utterance_id += 1
+        self._partial_seq = 0
+        self._partial_text = ''
+        self._partial_emitted_at = 0.0
+        self._utterance_audio = []
+        if self.endpointer:
+            self.endpointer.start()
+
+    def _collect_utterance_audio(self, chunk: bytes):
+        """Звук фразы нужен только второму проходу"""
+        if self.second_pass:
+            self._utterance_audio.append(chunk)
+
+    def _full_read_frames(self) -> int:
+        """
+        Промежуточные результаты и эндпоинтер требуют читать звук мельче
+        полного буфера: порциями не длиннее интервала отправки и чанка эндпоинтера.
+        """
+        frames = self.full_detection_buffer
+        if self.partials_enabled:
+            frames = min(frames, int(self.rate * self.partials_interval))
+        if self.endpointer:
+            frames = min(frames, self.endpointer.chunk_frames)
+        return max(self.name_detection_buffer, frames)
+
+    def _partial_message(self, text: str) -> Optional[Message]:
+        """
+        Промежуточная гипотеза полного распознавателя в виде дельты к предыдущей:
+        keep - сколько символов прошлого текста сохраняется, append - что дописать.
+        Не чаще раза в partials_interval; одинаковые гипотезы не отправляются.
+        """
+        now = time.monotonic()
+        if now - self._partial_emitted_at < self.partials_interval:
+            self.partials_throttled += 1
+            return None
+
+        if not text or text == self._partial_text:
+            return None
+
+        keep = 0
+        for a, b in zip(self._partial_text, text):
+            if a != b:
+                break
+            keep += 1
+
+        payload = {
+            'utterance_id': self._utterance_id,
+            'trace': self._trace,
+            'seq': self._partial_seq,
+            'keep': keep,
+            'append': text[keep:]
+        }
+        self._partial_text = text
+        self._partial_seq += 1
+        self._partial_emitted_at = now
+        self.partials_emitted += 1
+        return { 'type': EventsType.EVENT.value, 'topic': EventsTopic.RAW_TEXT_DATA_PARTIAL.value, 'payload': payload }
+
+    def _run_second_pass(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Перераспознаёт фразу непотоковым движком, если уверенность Vosk ниже порога.
+        Результат второго прохода заменяет потоковый, только если он не пустой.
+        """
+        confidence = result.get('confidence')
+        if self.second_pass is None or not self._utterance_audio:
+            return result
+        if confidence is not None and confidence >= self.second_pass_confidence:
+            return result
+
+        pcm = b''.join(self._utterance_audio)
+        self._utterance_audio = []
+        start = time.perf_counter()
+        try:
+            with self.tracer.span('second_pass', self._trace, engine=self.second_pass.engine_name):
+                second = self.second_pass.transcribe(pcm)
+        except Exception as e:
+            self.logger.error(f"Second pass failed: {e}", self.SERVICE_NAME, e)
+            return result
+        finally:
+            self.second_pass_seconds += time.perf_counter() - start
+            self.second_pass_audio_frames += len(pcm) // self.ring.frame_size
+            self.second_pass_runs += 1
+
+        if second['text'].lower().split() == result['text'].lower().split():
+            self.second_pass_agreed += 1
+        if not second['text']:
+            return result
+
+        self.second_pass_replaced += 1
+        return {**second, 'engine': self.second_pass.engine_name, 'first_pass': result['text']}
+
+    def _final_message(self, result: Dict[str, Any], endpoint: Optional[dict] = None) -> Message:
+        if self._follow_up_active:
+            self._follow_up_active = False
+            self.follow_ups_used += 1
+
+        self.streaming_utterances += 1
+        if result.get('confidence') is not None:
+            self.streaming_confidence_sum += result['confidence']
+            self.streaming_confidence_count += 1
+        final = self._run_second_pass(result)
+        self._utterance_audio = []
+
+        payload = {
+            'text': final['text'],
+            'utterance_id': self._utterance_id,
+            'trace': self._trace,
+            'engine': final.get('engine', 'vosk'),
+            'confidence': round(final['confidence'], 4) if final.get('confidence') is not None else None,
+            'second_pass': final is not result
+        }
+        if 'first_pass' in final:
+            payload['first_pass_text'] = final['first_pass']
+        if endpoint:
+            payload['endpoint'] = endpoint
+        if self._trace:
+            # От срабатывания имени до готового текста: речь, декодирование и второй проход
+            self.tracer.add_span('recognition', self._trace, self._trace['started_at'],
+                                 utterance_id=self._utterance_id, engine=payload['engine'], second_pass=payload['second_pass'])
+        return { 'type': EventsType.EVENT.value, 'topic': EventsTopic.RAW_TEXT_DATA_RECOGNIZED.value, 'payload': payload }
+
+    def _finish_endpoint(self, trigger: str) -> Optional[dict]:
+        return self.endpointer.finish(trigger) if self.endpointer else None
+
+    def _accept_name_chunk(self, data) -> bool:
+        chunk = bytes(data)
+        self.wake_audio.remember(chunk)
+
+        if self._accept_waveform(self.name_recognizer, self.wake_tier, chunk):
+            result = self.name_recognizer.result()
+            if self._detect_wake_word(result['text'], result['words']):
+                return True
+            self.name_in_partial = False
+        else:
+            partial = self.name_recognizer.partial()
+            if self._detect_wake_word(partial['text'], partial['words']):
+                self.name_in_partial = True
+                return True
+        return False
+
+    def _accept_wake_chunk(self, chunk) -> bool:
+        if self.spotter is None:
+            return self._accept_name_chunk(chunk)
+
+        chunk = bytes(chunk)
+        self._remember_kws_audio(chunk)
+        score = self.spotter.process(chunk)
+        return score is not None and self._confirm_keyword()
+
+    def _flush_wake(self) -> bool:
+        """VAD перестал видеть речь: последняя проверка хвоста фразы"""
+        if self.spotter is None:
+            return self._flush_name_recognizer()
+
+        detected = self.spotter.check() is not None and self._confirm_keyword()
+        self.spotter.reset()
+        self._forget_kws_audio()
+        return detected
+
+    def _remember_kws_audio(self, chunk: bytes):
+        assert self.spotter is not None
+        limit = self.spotter.buffer_frames * self.spotter.extractor.hop + self.rate // 2
+        self._kws_audio.append(chunk)
+        self._kws_audio_frames += len(chunk) // self.ring.frame_size
+        while self._kws_audio and self._kws_audio_frames - len(self._kws_audio[0]) // self.ring.frame_size >= limit:
+            self._kws_audio_frames -= len(self._kws_audio.popleft()) // self.ring.frame_size
+
+    def _forget_kws_audio(self):
+        self._kws_audio.clear()
+        self._kws_audio_frames = 0
+
+    def _confirm_keyword(self) -> bool:
+        """
+        Кандидат от детектора: хвост звука прогоняется через wake-распознаватель Vosk.
+        Тайминги слов и передача звука после имени работают так же,
+        как при постоянном распознавании.
+        """
+        assert self.spotter is not None
+        start = time.perf_counter()
+        self.kws_candidates += 1
+
+        self.name_recognizer.reset()
+        self.wake_audio.forget()
+        words = None
+        for chunk in self._kws_audio:
+            self.wake_audio.remember(chunk)
+            if self._accept_waveform(self.name_recognizer, self.wake_tier, chunk):
+                result = self.name_recognizer.result()
+                if words is None and self._has_wake_word(result['text']):
+                    words = result['words'] or []
+        if words is None:
+            result = self.name_recognizer.final()
+            if self._has_wake_word(result['text']):
+                words = result['words'] or []
+        self.name_recognizer.reset()
+
+        if words is not None:
+            self._wake_handoff = self.wake_audio.after_wake_word(words)
+            self.kws_confirmed += 1
+        self.spotter.reset()
+        self._forget_kws_audio()
+        self.kws_confirm_seconds += time.perf_counter() - start
+        return words is not None
+
+    def _flush_name_recognizer(self) -> bool:
+        """Закрывает фразу после того, как VAD перестал видеть речь"""
+        result = self.name_recognizer.final()
+        detected = self._detect_wake_word(result['text'], result['words'])
+        self.name_recognizer.reset()
+        return detected
+
+    def _has_wake_word(self, text: Optional[str]) -> bool:
+        text = (text or '').lower()
+        return bool(text) and any(w in text for w in self.wake_words)
+
+    def _detect_wake_word(self, text: Optional[str], words: Optional[list]) -> bool:
+        if not self._has_wake_word(text):
+            return False
+        self._wake_handoff = self.wake_audio.after_wake_word(words)
+        return True
+
+    def _handoff_wake_audio(self) -> Optional[Dict[str, Any]]:
+        """
+        Передаёт полному распознавателю звук, сказанный сразу после имени.
+
+        Returns:
+            Optional[Dict[str, Any]]: Результат, если фраза завершилась уже внутри переданного звука
+        """
+        handoff, self._wake_handoff = self._wake_handoff, b''
+        self.wake_audio.forget()
+        if not handoff:
+            return None
+
+        if self.endpointer:
+            self.endpointer.observe(handoff)
+        self._collect_utterance_audio(handoff)
+        if self._accept_waveform(self._command_recognizer(), self.command_tier, handoff):
+            result = self._command_recognizer().result()
+            return result if result['text'] else None
+        return None
+
     def _wait_for_name(self, timeout=None, stop_event=None):
+        # thread_time не учитывает ожидание звука, так что это чистая цена ожидания имени
+        cpu_start = time.thread_time()
+        try:
+            return self._listen_for_name(timeout, stop_event)
+        finally:
+            self.wake_cpu_seconds += time.thread_time() - cpu_start
+
+    def _listen_for_name(self, timeout=None, stop_event=None):
         start_time = time.time()
         
-        self.name_recognizer.Reset()
+        if not (self.vad and self.vad.in_speech):
+            self.name_recognizer.reset()
+            self.wake_audio.forget()
+            if self.spotter:
+                self.spotter.reset()
+                self._forget_kws_audio()
         self.name_in_partial = False
         
         while True:
@@ -101,6 +916,13 @@ class SpeechRecognitionService(IService):
                 
             if timeout and (time.time() - start_time) > timeout:
                 return False
+
+            self._unload_idle_command_model()
+
+            if self._follow_up_requested.is_set():
+                self._follow_up_requested.clear()
+                self._follow_up_pending = True
+                return True
             
             if not self._is_stream_active():
                 print(f"[{self.SERVICE_NAME}] Stream is not active, reinitializing...")
@@ -111,32 +933,40 @@ class SpeechRecognitionService(IService):
                     return False
                 
             try:
-                if not self.stream:
+                if not self.source:
                     print(f"[{self.SERVICE_NAME}] Stream is None, reinitializing...")
                     self._init_audio_stream()
                 
-                if self.stream is None:
+                if self.source is None:
                     print(f"[{self.SERVICE_NAME}] Failed to initialize stream")
                     return False
                     
-                data = self.stream.read(self.name_detection_buffer, exception_on_overflow=False)
+                data = self._read_frames(self.name_detection_buffer)
                 if not data:
-                    time.sleep(0.01)
+                    continue
+                self.wake_listen_frames += len(data) // self.ring.frame_size
+
+                if self.vad is None:
+                    if self._accept_wake_chunk(data):
+                        return True
                     continue
 
-                if self.name_recognizer.AcceptWaveform(data):
-                    result = json.loads(self.name_recognizer.Result())
-                    if result.get('text') and self._name_lower in result['text'].lower():
+                was_speech = self.vad.in_speech
+                chunks = self.vad.process(data)
+                if not chunks:
+                    self._wake_speech_started = None
+                    if was_speech and self._flush_wake():
+                        return True
+                    continue
+                if not was_speech:
+                    self._wake_speech_started = self.ring.read_index - len(data) // self.ring.frame_size
+
+                for chunk in chunks:
+                    if self._accept_wake_chunk(chunk):
                         return True
-                    self.name_in_partial = False
-                else:
-                    partial = json.loads(self.name_recognizer.PartialResult())
-                    part_text = (partial.get('partial') or '').lower()
-                    if part_text:
-                        if self._name_lower in part_text:
-                            self.name_in_partial = True
-                            return True
                 
+            except EOFError:
+                raise
             except Exception as e:
                 print(f"[{self.SERVICE_NAME}] error in _wait_for_name: {e}")
                 if "Stream closed" in str(e) or "-9988" in str(e):
@@ -148,8 +978,6 @@ class SpeechRecognitionService(IService):
                         return False
                 elif stop_event and stop_event.is_set():
                     return False
-            
-            time.sleep(0.01)
 
     @override
     def execute(self, stop_event=None, **args) -> Generator[Message, None, None]:
@@ -161,11 +989,29 @@ class SpeechRecognitionService(IService):
                 
                 name_detected = self._wait_for_name(timeout=1.0, stop_event=stop_event)
                 if name_detected:
-                    self.services['audio'].play_sound_async("listening") # type: ignore
-                    yield { 'type': EventsType.SERVICE_ACTION.value, 'topic': EventsTopic.ACTION_WAKE.value, 'payload': { 'name': self.name } } # type: ignore
+                    follow_up, self._follow_up_pending = self._follow_up_pending, False
+                    # Трасса запроса начинается с имени и едет дальше в payload сообщений
+                    self._trace = Tracer.new_trace()
+                    if follow_up:
+                        # Окно после ответа: без звука, сразу слушаем команду
+                        self.follow_ups_opened += 1
+                        yield { 'type': EventsType.SERVICE_ACTION.value, 'topic': EventsTopic.ACTION_WAKE.value, 'payload': { 'name': self.name, 'follow_up': True, 'trace': self._trace } } # type: ignore
+                    else:
+                        self._follow_up_requested.clear()
+                        self._record_wake_overhead()
+                        self._play_earcon("listening")
+                        yield { 'type': EventsType.SERVICE_ACTION.value, 'topic': EventsTopic.ACTION_WAKE.value, 'payload': { 'name': self.name, 'trace': self._trace } } # type: ignore
 
                     self.is_name_listening_state = False
-                    self.full_recognizer.Reset()
+                    self._command_recognizer().reset()
+                    self._begin_utterance()
+                    self._follow_up_active = follow_up
+                    window_start = self.ring.read_index
+
+                    handoff_result = self._handoff_wake_audio()
+                    if handoff_result:
+                        self.is_name_listening_state = True
+                        yield self._final_message(handoff_result, self._finish_endpoint('kaldi'))
                     
                     while not self.is_name_listening_state:
                         if stop_event and stop_event.is_set():
@@ -182,28 +1028,67 @@ class SpeechRecognitionService(IService):
                                 break
                         
                         try:
-                            if not self.stream:
+                            if not self.source:
                                 print(f"[{self.SERVICE_NAME}] Stream is None, reinitializing...")
                                 self._init_audio_stream()
                             
-                            if self.stream is None:
+                            if self.source is None:
                                 print(f"[{self.SERVICE_NAME}] Failed to initialize stream during full recognition")
                                 self.is_name_listening_state = True
                                 break
                                 
-                            data = self.stream.read(self.full_detection_buffer, exception_on_overflow=False)
-                            
-                            if data and self.full_recognizer.AcceptWaveform(data):
-                                result = json.loads(self.full_recognizer.Result())
-                                if result.get('text'):
+                            data = self._read_frames(self._full_read_frames())
+                            if not data:
+                                continue
+
+                            chunk = self._suppress_earcon(bytes(data), self.ring.read_index - len(data) // self.ring.frame_size)
+                            if not chunk:
+                                continue
+
+                            if self.endpointer:
+                                self.endpointer.observe(chunk)
+                            self._collect_utterance_audio(chunk)
+
+                            recognizer = self._command_recognizer()
+                            if self._accept_waveform(recognizer, self.command_tier, chunk):
+                                result = recognizer.result()
+                                if result['text']:
                                     self.is_name_listening_state = True
-                                    yield { 'type': EventsType.EVENT.value, 'topic': EventsTopic.RAW_TEXT_DATA_RECOGNIZED.value, 'payload': { 'text': result['text'] } }
+                                    yield self._final_message(result, self._finish_endpoint('kaldi'))
+                            elif self.partials_enabled or self.endpointer:
+                                partial_text = recognizer.partial()['text']
+                                if self.partials_enabled:
+                                    partial = self._partial_message(partial_text)
+                                    if partial:
+                                        yield partial
+
+                                trigger = self.endpointer.check(partial_text) if self.endpointer else None
+                                if trigger:
+                                    # Свой эндпоинтер увидел конец фразы раньше Kaldi - закрываем её принудительно
+                                    result = recognizer.final()
+                                    endpoint = self._finish_endpoint(trigger)
+                                    if result['text']:
+                                        self.is_name_listening_state = True
+                                        yield self._final_message(result, endpoint)
+
+                            if self._follow_up_active and self._follow_up_expired(window_start):
+                                self._follow_up_active = False
+                                self.follow_up_timeouts += 1
+                                self.is_name_listening_state = True
+                                yield { 'type': EventsType.SERVICE_ACTION.value, 'topic': EventsTopic.ACTION_FOLLOW_UP_END.value, 'payload': { 'reason': 'silence' } }
+                        except EOFError:
+                            result = self._command_recognizer().final()
+                            if result['text']:
+                                yield self._final_message(result)
+                            raise
                         except Exception as stream_error:
                             print(f"[{self.SERVICE_NAME}] error during full recognition: {stream_error}")
                             if "Stream closed" in str(stream_error) or "-9988" in str(stream_error):
                                 print(f"[{self.SERVICE_NAME}] Stream closed error during full recognition, will reinitialize on next iteration")
                                 self.is_name_listening_state = True
                                 break
+        except EOFError:
+            print(f"[{self.SERVICE_NAME}] audio source exhausted, stopping recognition")
         except Exception as e:
             print(f"[{self.SERVICE_NAME}] error in execute: {e}")
         finally:
@@ -211,23 +1096,23 @@ class SpeechRecognitionService(IService):
 
     def cleanup(self):
         try:
-            if hasattr(self, 'stream') and self.stream is not None:
-                try:
-                    if not self.stream.is_stopped():
-                        self.stream.stop_stream()
-                    self.stream.close()
-                except Exception as stream_e:
-                    print(f"[{self.SERVICE_NAME}] error closing stream: {stream_e}")
-                finally:
-                    self.stream = None
-            
-            if hasattr(self, 'p') and self.p is not None:
+            if getattr(self, 'capture', None) is not None:
+                self.capture.stop()
+                self.capture = None
+
+            if getattr(self, 'source', None) is not None:
                 try:
-                    self.p.terminate()
-                except Exception as pa_e:
-                    print(f"[{self.SERVICE_NAME}] error terminating PyAudio: {pa_e}")
+                    self.source.close()
+                except Exception as source_e:
+                    print(f"[{self.SERVICE_NAME}] error closing audio source: {source_e}")
                 finally:
-                    self.p = None
+                    self.source = None
+
+            if getattr(self, 'bus', None) is not None:
+                self.bus.close()
+                self.bus = None
                 
         except Exception as e:
-            print(f"[{self.SERVICE_NAME}] error during cleanup: {e}")
\ No newline at end of file
+            print(f"[{self.SERVICE_NAME}] error during cleanup: {e}")
+        finally:
+            type(self).drop_instance()
\ No newline at end of file
@@ -1,7 +1,13 @@
 from .SpeechRecognitionService import SpeechRecognitionService
 from .Recognizer import Recognizer
+from .RecognitionStream import RecognitionStream
+from .RecognitionPool import RecognitionPool
+from .BatchTranscriber import BatchTranscriber
 
 __all__ = [
     "SpeechRecognitionService",
-    "Recognizer"
+    "Recognizer",
+    "RecognitionStream",
+    "RecognitionPool",
+    "BatchTranscriber"
 ]
\ No newline at end of file
@@ -1,48 +1,195 @@
 import pygame
 import os
+import time
+import hashlib
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 from colorama import Fore, Style
 from interfaces import IService
 from paths import path_resolver
-from typing import Any
+from utils.EnvHelper import getenv, getenv_int
+from typing import Any, Dict, Iterable, List, Optional
 
 class AudioService(IService):
     SERVICE_NAME = "AudioService"
 
     audio_dir = Path(path_resolver['audio_path'])
+    pcm_cache_dir = Path(path_resolver['cache_path']) / 'audio'
+
+    supported_extensions = {'.wav', '.mp3', '.ogg', '.flac', '.mid', '.midi', '.aac', '.wma', '.m4a'}
 
     def __init__(self):
+        """
+        Звуки не декодируются при создании сервиса: здесь только составляется
+        список файлов. Микшер поднимается и звук декодируется при первом
+        воспроизведении (или в warm_up), декодированный PCM кладётся в
+        файловый кеш на диске, и при следующих запусках звук читается оттуда
+        без повторного декодирования. Отображать файл в память смысла нет:
+        pygame.mixer.Sound всё равно копирует буфер в свой чанк.
+        """
         super().__init__()
-        self.sounds = {}
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.sound_files: Dict[str, Path] = {}
+        self._lock = threading.RLock()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.load_seconds = 0.0
+
+        self.reserved_channels = max(1, getenv_int("AUDIO_EARCON_CHANNELS", 2))
+        self.earcons_played = 0
 
         if not os.path.exists(self.audio_dir):
             print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Директория {self.audio_dir} не найдена")
         else:
-            self._load_sounds()
+            self._index_sounds()
 
-    def _load_sounds(self):
-        """Загружает все звуковые файлы из директории в память."""
+    def _index_sounds(self):
+        """Составляет список звуковых файлов без их загрузки."""
         try:
-            supported_extensions = {'.wav', '.mp3', '.ogg', '.flac', '.mid', '.midi', '.aac', '.wma', '.m4a'}
-            
-            for file in os.listdir(self.audio_dir):
-                file_path = os.path.join(self.audio_dir, file)
-                if os.path.isfile(file_path) and Path(file).suffix.lower() in supported_extensions:
-                    sound_name = Path(file).stem
-                    try:
-                        sound_object = pygame.mixer.Sound(file_path)
-                        self.sounds[sound_name] = sound_object
-                        print(f"{Fore.GREEN}[УСПЕХ]{Style.RESET_ALL} Загружен звук: {Fore.MAGENTA}{sound_name}{Style.RESET_ALL} ({file})")
-                    except pygame.error as e:
-                        print(f"{Fore.YELLOW}[ПРЕДУПРЕЖДЕНИЕ]{Style.RESET_ALL} Не удалось загрузить звук {Fore.MAGENTA}{file_path}{Style.RESET_ALL}: {e}")
-                    except Exception as e:
-                        print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Неожиданная ошибка при загрузке звука {Fore.MAGENTA}{file_path}{Style.RESET_ALL}: {e}")
-                        
+            for entry in os.scandir(self.audio_dir):
+                if entry.is_file() and Path(entry.name).suffix.lower() in self.supported_extensions:
+                    self.sound_files[Path(entry.name).stem] = Path(entry.path)
         except Exception as e:
             print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Ошибка при сканировании директории звуков: {e}")
 
+    def _ensure_mixer(self):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        # Первые каналы микшера не раздаются Sound.play() - на них играют только earcon'ы.
+        # Резервируем и тогда, когда микшер уже поднял кто-то другой
+        pygame.mixer.set_reserved(self.reserved_channels)
+
+    def _earcon_channel(self) -> pygame.mixer.Channel:
+        for i in range(self.reserved_channels):
+            channel = pygame.mixer.Channel(i)
+            if not channel.get_busy():
+                return channel
+        return pygame.mixer.Channel(0)
+
+    def _cache_path(self, file_path: Path) -> Path:
+        """Ключ кеша - хеш содержимого файла и формат микшера (частота, формат, каналы)"""
+        with open(file_path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        frequency, size, channels = pygame.mixer.get_init()
+        return self.pcm_cache_dir / f"{file_path.stem}_{digest}_{frequency}_{size}_{channels}.pcm"
+
+    def _decode(self, file_path: Path) -> pygame.mixer.Sound:
+        """Звук из файлового кеша декодированного PCM; при промахе - декодирование и запись в кеш"""
+        cache_path = self._cache_path(file_path)
+
+        if cache_path.exists() and cache_path.stat().st_size > 0:
+            sound = pygame.mixer.Sound(buffer=cache_path.read_bytes())
+            self.cache_hits += 1
+            return sound
+
+        sound = pygame.mixer.Sound(str(file_path))
+        self.cache_misses += 1
+        try:
+            os.makedirs(self.pcm_cache_dir, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(sound.get_raw())
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"{Fore.YELLOW}[ПРЕДУПРЕЖДЕНИЕ]{Style.RESET_ALL} Не удалось сохранить PCM-кеш звука {Fore.MAGENTA}{file_path.name}{Style.RESET_ALL}: {e}")
+        return sound
+
+    def _get_sound(self, sound_name: str) -> Optional[pygame.mixer.Sound]:
+        """Возвращает звук, декодируя его при первом обращении."""
+        with self._lock:
+            if sound_name in self.sounds:
+                return self.sounds[sound_name]
+
+            file_path = self.sound_files.get(sound_name)
+            if file_path is None:
+                return None
+
+            self._ensure_mixer()
+            start = time.perf_counter()
+            try:
+                sound = self._decode(file_path)
+            except pygame.error as e:
+                print(f"{Fore.YELLOW}[ПРЕДУПРЕЖДЕНИЕ]{Style.RESET_ALL} Не удалось загрузить звук {Fore.MAGENTA}{file_path}{Style.RESET_ALL}: {e}")
+                return None
+            except Exception as e:
+                print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Неожиданная ошибка при загрузке звука {Fore.MAGENTA}{file_path}{Style.RESET_ALL}: {e}")
+                return None
+            self.load_seconds += time.perf_counter() - start
+
+            self.sounds[sound_name] = sound
+            return sound
+
+    def warm_up(self, sound_names: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Заранее загружает только нужные звуки.
+
+        Args:
+            sound_names (Optional[Iterable[str]]): Имена звуков; по умолчанию AUDIO_WARMUP_SOUNDS из init.properties
+
+        Returns:
+            List[str]: Имена загруженных звуков
+        """
+        if sound_names is None:
+            sound_names = [n.strip() for n in getenv("AUDIO_WARMUP_SOUNDS", "listening").split(",") if n.strip()]
+        return [name for name in sound_names if self._get_sound(name) is not None]
+
+    def get_available_sounds(self) -> List[str]:
+        return list(self.sound_files.keys())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'available': len(self.sound_files),
+            'loaded': len(self.sounds),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'load_seconds': round(self.load_seconds, 4),
+            'earcons_played': self.earcons_played
+        }
+
+    def play_earcon(self, sound_name: str) -> Optional[Future]:
+        """
+        Воспроизводит звук на зарезервированном канале, не блокируя вызывающего.
+
+        Args:
+            sound_name (str): Имя звука (без расширения).
+
+        Returns:
+            Optional[Future]: Завершается, когда звук доиграл (результат - длительность в секундах),
+            или None, если звук не найден или не запустился.
+        """
+        sound = self._get_sound(sound_name)
+        if sound is None:
+            print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Звук '{sound_name}' не найден")
+            return None
+
+        try:
+            with self._lock:
+                channel = self._earcon_channel()
+                channel.play(sound)
+        except Exception as e:
+            print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Ошибка при запуске воспроизведения звука '{sound_name}': {e}")
+            return None
+
+        self.earcons_played += 1
+        started = time.monotonic()
+        length = sound.get_length()
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+
+        def _complete():
+            # Таймер срабатывает по длине звука; дожидаемся канала, если микшер отстаёт
+            deadline = started + length + 1.0
+            while channel.get_busy() and channel.get_sound() is sound and time.monotonic() < deadline:
+                time.sleep(0.01)
+            future.set_result(time.monotonic() - started)
+
+        timer = threading.Timer(length, _complete)
+        timer.daemon = True
+        timer.start()
+        return future
+
     def play_sound(self, sound_name: str) -> bool:
         """
         Синхронно воспроизводит звук по имени.
@@ -54,15 +201,12 @@ class AudioService(IService):
         Returns:
             bool: True, если воспроизведение успешно, иначе False.
         """
-        if sound_name not in self.sounds:
-            print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Звук '{sound_name}' не найден")
+        future = self.play_earcon(sound_name)
+        if future is None:
             return False
             
         try:
-            sound = self.sounds[sound_name]
-            sound.play()
-            while pygame.mixer.get_busy():
-                pygame.time.wait(10)
+            future.result()
             return True
         except Exception as e:
             print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Ошибка при воспроизведении звука '{sound_name}': {e}")
@@ -79,12 +223,13 @@ class AudioService(IService):
         Returns:
             bool: True, если запуск воспроизведения успешен, иначе False.
         """
-        if sound_name not in self.sounds:
+        sound = self._get_sound(sound_name)
+        if sound is None:
             print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Звук '{sound_name}' не найден")
             return False
             
         try:
-            self.sounds[sound_name].play()
+            sound.play()
             return True
         except Exception as e:
             print(f"{Fore.RED}[ОШИБКА]{Style.RESET_ALL} Ошибка при запуске воспроизведения звука '{sound_name}': {e}")
@@ -93,6 +238,8 @@ class AudioService(IService):
     def stop_all_sounds(self):
         """Останавливает воспроизведение всех звуков."""
         try:
+            if not pygame.mixer.get_init():
+                return
             pygame.mixer.stop()
             print(f"{Fore.GREEN}[УСПЕХ]{Style.RESET_ALL} Все звуки остановлены")
         except Exception as e:
@@ -58,3 +58,7 @@ def getenv_bool(key: str, default: bool = False) -> bool:
         if value is None:
             return default
         return value.lower() in ('true', '1', 'yes', 'on')
+
+def setenv(key: str, value) -> None:
+    """Переопределяет значение из init.properties на время работы процесса"""
+    _get_properties_service().set(key, value)
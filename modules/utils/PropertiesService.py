@@ -88,6 +88,11 @@ class PropertiesService(ISingleton):
         value = self.get(key, default)
         return str(value) if value is not None else default
     
+    def set(self, key: str, value: Any):
+        """Переопределяет свойство в памяти (файл не меняется)"""
+        with self._lock:
+            self._properties[key] = value
+
     def reload(self):
         with self._lock:
             self._load_properties()
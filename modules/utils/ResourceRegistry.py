@@ -0,0 +1,171 @@
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class ResourceRegistry:
+    """
+    Реестр тяжёлых объектов, переживающих перезапуск модулей.
+
+    Оркестратор создаёт один реестр на процесс и передаёт его модулям через
+    init globals (ORC_RESOURCES). Модуль берёт объект по ключу через acquire():
+    если объект уже есть и его сигнатура (конфигурация, из которой он собран)
+    не изменилась, возвращается готовый экземпляр, иначе старый выселяется
+    и строится новый. Держатели, которые делят один объект, отдают его через
+    release(); evict(key, if_unused=True) не трогает объект, пока он у кого-то
+    на руках.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _build_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            if key not in self._build_locks:
+                self._build_locks[key] = threading.Lock()
+            return self._build_locks[key]
+
+    def acquire(self,
+                key: str,
+                factory: Callable[[], Any],
+                signature: Optional[Hashable] = None,
+                on_evict: Optional[Callable[[Any], None]] = None,
+                owner: Optional[str] = None) -> Any:
+        """
+        Возвращает объект по ключу, создавая его при необходимости.
+
+        Args:
+            key (str): Ключ ресурса
+            factory (Callable[[], Any]): Функция, создающая ресурс
+            signature (Optional[Hashable]): Конфигурация ресурса; при смене ресурс пересоздаётся
+            on_evict (Optional[Callable[[Any], None]]): Освобождение ресурса при выселении
+            owner (Optional[str]): Модуль-владелец (для evict_owner)
+        """
+        with self._build_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry['signature'] == signature:
+                    self.hits += 1
+                    entry['acquired'] += 1
+                    entry['holders'] += 1
+                    entry['last_acquired_at'] = time.time()
+                    return entry['value']
+
+            if entry is not None:
+                self.evict(key)
+
+            build_start = time.perf_counter()
+            value = factory()
+            build_time = time.perf_counter() - build_start
+
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = {
+                    'value': value,
+                    'signature': signature,
+                    'on_evict': on_evict,
+                    'owner': owner,
+                    'build_time': build_time,
+                    'created_at': time.time(),
+                    'last_acquired_at': time.time(),
+                    'acquired': 1,
+                    'holders': 1
+                }
+            return value
+
+    def park(self, key: str, value: Any, signature: Optional[Hashable] = None,
+             on_evict: Optional[Callable[[Any], None]] = None, owner: Optional[str] = None) -> None:
+        """Кладёт уже созданный объект в реестр, выселяя прежний под тем же ключом"""
+        with self._lock:
+            if key in self._entries and self._entries[key]['value'] is not value:
+                self.evict(key)
+            self._entries[key] = {
+                'value': value,
+                'signature': signature,
+                'on_evict': on_evict,
+                'owner': owner,
+                'build_time': 0.0,
+                'created_at': time.time(),
+                'last_acquired_at': time.time(),
+                'acquired': 0,
+                'holders': 0
+            }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['value'] if entry is not None else default
+
+    def has(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def release(self, key: str) -> int:
+        """
+        Держатель больше не пользуется объектом. Объект остаётся в реестре
+        (переживает перезапуск модуля), возвращается число оставшихся держателей.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return 0
+            entry['holders'] = max(0, entry['holders'] - 1)
+            return entry['holders']
+
+    def evict(self, key: str, if_unused: bool = False) -> bool:
+        """
+        Args:
+            key (str): Ключ ресурса
+            if_unused (bool): Выселять, только если у объекта не осталось держателей
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (if_unused and entry['holders'] > 0):
+                return False
+            del self._entries[key]
+            self.evictions += 1
+
+        if entry['on_evict']:
+            try:
+                entry['on_evict'](entry['value'])
+            except Exception as e:
+                print(f"[ResourceRegistry] error evicting '{key}': {e}")
+        return True
+
+    def evict_owner(self, owner: str) -> List[str]:
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if e['owner'] == owner]
+        for key in keys:
+            self.evict(key)
+        return keys
+
+    def clear(self) -> None:
+        with self._lock:
+            keys = list(self._entries.keys())
+        for key in keys:
+            self.evict(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'resources': {
+                    key: {
+                        'owner': e['owner'],
+                        'type': type(e['value']).__name__,
+                        'build_time': round(e['build_time'], 4),
+                        'created_at': e['created_at'],
+                        'acquired': e['acquired'],
+                        'holders': e['holders']
+                    }
+                    for key, e in self._entries.items()
+                }
+            }
@@ -0,0 +1,153 @@
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Dict, Generator, List, Optional
+from interfaces import ISingleton
+from utils.EnvHelper import getenv, getenv_bool, getenv_int
+
+
+Trace = Dict[str, Any]
+
+
+class Tracer(ISingleton):
+    """
+    Сквозная трассировка запроса от имени ассистента до готового ответа.
+
+    Трасса - словарь {'id', 'started_at'}; он заводится при срабатывании
+    имени и едет в payload сообщений под ключом 'trace' (ModuleClient
+    проставляет sent_at при отправке, прикладывает текущую трассу потока
+    к первому и итоговому сообщению запроса и делает трассу текущей в потоке
+    обработчика при получении). Этапы записываются спанами в файл формата
+    Chrome trace (JSON-массив, дописывается построчно; открывается в
+    chrome://tracing или Perfetto) и копятся в памяти для сводки p50/p95.
+    Выключено (TRACE_ENABLED=false) - трассы по-прежнему передаются,
+    но спаны не пишутся.
+    """
+
+    def __init__(self):
+        self.enabled = getenv_bool("TRACE_ENABLED", False)
+        self.path = getenv("TRACE_PATH", "") or self._default_path()
+        self.max_samples = getenv_int("TRACE_SUMMARY_SAMPLES", 500)
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._durations: Dict[str, Deque[float]] = {}
+        self.spans_written = 0
+
+    @staticmethod
+    def _default_path() -> str:
+        try:
+            from paths import path_resolver
+            return str(Path(path_resolver['temp_path']) / 'traces.json')
+        except Exception:
+            return 'traces.json'
+
+    @staticmethod
+    def new_trace(started_at: Optional[float] = None) -> Trace:
+        return {'id': uuid.uuid4().hex[:16], 'started_at': started_at or time.time()}
+
+    def current(self) -> Optional[Trace]:
+        return getattr(self._local, 'trace', None)
+
+    @contextmanager
+    def activate(self, trace: Optional[Trace]) -> Generator[Optional[Trace], None, None]:
+        """Делает трассу текущей в потоке на время блока"""
+        previous = self.current()
+        self._local.trace = trace
+        try:
+            yield trace
+        finally:
+            self._local.trace = previous
+
+    def add_span(self, name: str, trace: Optional[Trace], start: float, end: Optional[float] = None, **attrs):
+        """
+        Args:
+            name (str): Этап (recognition, queue, context_build, tool:<имя>, ...)
+            trace (Optional[Trace]): Трасса; None - текущая в потоке
+            start (float): Начало этапа, time.time()
+            end (Optional[float]): Конец этапа (по умолчанию - сейчас)
+        """
+        if not self.enabled:
+            return
+        trace = trace or self.current()
+        if not trace:
+            return
+        end = time.time() if end is None else end
+        duration = max(0.0, end - start)
+        event = {
+            'name': name,
+            'cat': name.split(':', 1)[0],
+            'ph': 'X',
+            'ts': round(start * 1e6),
+            'dur': round(duration * 1e6),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': {'trace_id': trace.get('id'), **attrs}
+        }
+        with self._lock:
+            self._durations.setdefault(name, deque(maxlen=self.max_samples)).append(duration)
+            self._write(event)
+
+    @contextmanager
+    def span(self, name: str, trace: Optional[Trace] = None, **attrs) -> Generator[Dict[str, Any], None, None]:
+        """Спан на время блока; в выданный словарь можно дописать атрибуты"""
+        start = time.time()
+        try:
+            yield attrs
+        finally:
+            self.add_span(name, trace, start, **attrs)
+
+    def _write(self, event: Dict[str, Any]):
+        try:
+            path = Path(self.path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            new_file = not path.exists() or path.stat().st_size == 0
+            with open(path, 'a', encoding='utf-8') as f:
+                # Незакрытый массив - допустимый Chrome trace, так файл можно дописывать
+                if new_file:
+                    f.write('[\n')
+                f.write(json.dumps(event, ensure_ascii=False) + ',\n')
+            self.spans_written += 1
+        except Exception as e:
+            print(f"[Tracer] Failed to write span: {e}")
+
+    @staticmethod
+    def summarize(durations: Dict[str, List[float]]) -> Dict[str, Dict[str, Any]]:
+        summary = {}
+        for stage, values in sorted(durations.items()):
+            ordered = sorted(values)
+            if not ordered:
+                continue
+            summary[stage] = {
+                'count': len(ordered),
+                'p50': round(ordered[len(ordered) // 2], 4),
+                'p95': round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 4),
+                'max': round(ordered[-1], 4)
+            }
+        return summary
+
+    def get_summary(self) -> Dict[str, Dict[str, Any]]:
+        """p50/p95 по полным именам этапов (queue:<топик>, tool:<имя> - отдельно) для спанов этого процесса"""
+        with self._lock:
+            return self.summarize({stage: list(values) for stage, values in self._durations.items()})
+
+    @classmethod
+    def summarize_file(cls, path: str) -> Dict[str, Dict[str, Any]]:
+        """Сводка p50/p95 по этапам для файла трасс (все модули и запуски)"""
+        text = Path(path).read_text(encoding='utf-8').strip().rstrip(',')
+        events = json.loads(text if text.endswith(']') else text + ']')
+        durations: Dict[str, List[float]] = {}
+        for event in events:
+            if event.get('ph') == 'X':
+                durations.setdefault(event['name'], []).append(event.get('dur', 0) / 1e6)
+        return cls.summarize(durations)
+
+
+if __name__ == '__main__':
+    print(json.dumps(Tracer.summarize_file(sys.argv[1] if len(sys.argv) > 1 else Tracer._default_path()), indent=2))
@@ -21,11 +21,17 @@ export const EventsTopic: {
     readonly JSON_DIALOGS_DATA_SET: 'json_dialogs_data_set';
 
     readonly RAW_TEXT_DATA_RECOGNIZED: 'raw_text_data_recognized';
+    readonly RAW_TEXT_DATA_PARTIAL: 'raw_text_data_partial';
+    readonly RAW_TEXT_DATA_TRANSCRIBED: 'raw_text_data_transcribed';
+    readonly RAW_AUDIO_DATA_CHUNK: 'raw_audio_data_chunk';
 
     readonly ACTION_APP_OPEN: 'action_app_open';
     readonly ACTION_THEME_SET: 'action_theme_set';
     readonly ACTION_APIKEYS_SET: 'action_apikeys_set';
     readonly ACTION_WAKE: 'action_wake';
+    readonly ACTION_FOLLOW_UP_END: 'action_follow_up_end';
+    readonly ACTION_BATCH_TRANSCRIBE: 'action_batch_transcribe';
+    readonly ACTION_BATCH_TRANSCRIBE_DONE: 'action_batch_transcribe_done';
     readonly ACTION_TRANSCRIPT: 'action_transcript';
     readonly ACTION_MODE_SET: 'action_mode_set';
     readonly ACTION_AIMODEL_SET: 'action_aimodel_set';
@@ -25,18 +25,34 @@ const AppContent = observer(() => {
   const [messages, setMessages] = useState<IncomingMsg[]>([]);
   const [mode, setMode] = useState<'waiting' | 'listening' | "initializing" | "thinking">('initializing');
   const [transcript, setTranscript] = useState({});
+  const [partial, setPartial] = useState<{ utteranceId: number | null; text: string }>({ utteranceId: null, text: '' });
   const [systemReady, setSystemReady] = useState(false);
   const [theme, setTheme] = useState<Record<string, string> | null>(null);
 
   const handleWake = () => {
+    setPartial({ utteranceId: null, text: '' });
     setMode('listening');
   };
 
+  const handleFollowUpEnd = () => {
+    setPartial({ utteranceId: null, text: '' });
+    setMode(prev => prev === 'listening' ? 'waiting' : prev);
+  };
+
+  const handlePartialText = (m: any) => {
+    const { utterance_id, keep, append } = m.payload || {};
+    setPartial(prev => {
+      const base = prev.utteranceId === utterance_id ? prev.text : '';
+      return { utteranceId: utterance_id, text: base.slice(0, keep || 0) + (append || '') };
+    });
+  };
+
   const handleTranscript = (m: any) => {
     setTranscript(m || '');
   };
 
   const rawDataTextRecognized = (m: any) => {
+    setPartial({ utteranceId: null, text: '' });
     setMode('thinking');
   };
 
@@ -86,9 +102,9 @@ const AppContent = observer(() => {
   };
 
   const handleStreamStart = (m: any) => {
-    const { original_text, model_name } = m.payload?.data || {};
+    const { stream_id, original_text, model_name } = m.payload?.data || {};
     if (original_text && model_name) {
-      StreamingAIStore.startSession(original_text, model_name);
+      StreamingAIStore.startSession(original_text, model_name, stream_id);
       setMode('thinking');
       
       AIMessagesStore.addMessageToActiveDialog(original_text, 'user');
@@ -96,14 +112,14 @@ const AppContent = observer(() => {
   };
 
   const handleStreamChunk = (m: any) => {
-    const { type, content, accumulated_thinking, accumulated_content } = m.payload?.data || {};
-    if (type && content) {
-      StreamingAIStore.addChunk(
-        type, 
-        content, 
-        type === 'thinking' ? accumulated_thinking : accumulated_content
-      );
+    const { stream_id, seq, deltas, checkpoint } = m.payload?.data || {};
+    if (stream_id === undefined || seq === undefined) return;
+
+    if (checkpoint && !StreamingAIStore.isStreaming()) {
+      // Ответ начался до подключения интерфейса
+      setMode('thinking');
     }
+    StreamingAIStore.applyDelta(stream_id, seq, deltas || {}, checkpoint);
   };
 
   const handleStreamEnd = (m: any) => {
@@ -149,8 +165,10 @@ const AppContent = observer(() => {
     [EventsTopic.ACTION_AI_STREAM_CHUNK]: handleStreamChunk,
     [EventsTopic.ACTION_AI_STREAM_END]: handleStreamEnd,
     [EventsTopic.ACTION_WAKE]: handleWake,
+    [EventsTopic.ACTION_FOLLOW_UP_END]: handleFollowUpEnd,
     [EventsTopic.ACTION_TRANSCRIPT]: handleTranscript,
     [EventsTopic.RAW_TEXT_DATA_RECOGNIZED]: rawDataTextRecognized,
+    [EventsTopic.RAW_TEXT_DATA_PARTIAL]: handlePartialText,
     [EventsTopic.JSON_INITAL_DATA_SET]: (m: any) => {
       SettingsStore.applySettings(m?.payload?.data?.settings);
       setThemesData(m);
@@ -214,6 +232,7 @@ const AppContent = observer(() => {
         assistantName={__ASSISTANT_NAME__}
         mode={mode}
         transcript={transcript as any}
+        partialText={partial.text}
         messages={messages}
         systemReady={systemReady}
       >
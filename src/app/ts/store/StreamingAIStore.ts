@@ -8,8 +8,23 @@ interface StreamingMessage {
   isComplete: boolean;
 }
 
+interface StreamDeltas {
+  thinking?: string;
+  content?: string;
+}
+
+export interface StreamCheckpoint {
+  original_text: string;
+  model_name: string;
+  thinking: string;
+  content: string;
+}
+
 interface StreamingSession {
   id: string;
+  streamId?: string;
+  lastSeq: number;
+  needsResync: boolean;
   originalText: string;
   modelName: string;
   startTime: Date;
@@ -28,11 +43,14 @@ class StreamingAIStore {
     makeAutoObservable(this);
   }
 
-  startSession(originalText: string, modelName: string): string {
+  startSession(originalText: string, modelName: string, streamId?: string): string {
     const sessionId = `session_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
     
     this.currentSession = {
       id: sessionId,
+      streamId,
+      lastSeq: -1,
+      needsResync: false,
       originalText,
       modelName,
       startTime: new Date(),
@@ -46,26 +64,54 @@ class StreamingAIStore {
     return sessionId;
   }
 
-  addChunk(type: 'thinking' | 'content', content: string, accumulated?: string) {
-    if (!this.currentSession || !this.currentSession.isActive) return;
-
-    const chunkId = `chunk_${Date.now()}_${Math.random().toString(36).substr(2, 6)}`;
-    
-    const chunk: StreamingMessage = {
-      id: chunkId,
-      type,
-      content,
-      timestamp: new Date(),
-      isComplete: false
-    };
+  /**
+   * Применяет сообщение потока: дельты дописываются по порядку seq.
+   * После пропущенного сообщения дельты игнорируются до ближайшей контрольной
+   * точки с полным текстом; по ней же восстанавливается ответ, начавшийся до подключения.
+   */
+  applyDelta(streamId: string, seq: number, deltas: StreamDeltas, checkpoint?: StreamCheckpoint) {
+    if (checkpoint && this.currentSession?.streamId !== streamId) {
+      this.startSession(checkpoint.original_text, checkpoint.model_name, streamId);
+    }
 
-    this.currentSession.chunks.push(chunk);
+    const session = this.currentSession;
+    if (!session || !session.isActive) return;
+    if (session.streamId && session.streamId !== streamId) return;
+
+    if (checkpoint) {
+      session.thinking = checkpoint.thinking;
+      session.content = checkpoint.content;
+      session.lastSeq = seq;
+      session.needsResync = false;
+      this.pushChunks(session, deltas);
+      return;
+    }
 
-    if (type === 'thinking' && accumulated) {
-      this.currentSession.thinking = accumulated;
-    } else if (type === 'content' && accumulated) {
-      this.currentSession.content = accumulated;
+    if (session.needsResync) return;
+    if (seq !== session.lastSeq + 1) {
+      session.needsResync = true;
+      return;
     }
+
+    session.lastSeq = seq;
+    if (deltas.thinking) session.thinking += deltas.thinking;
+    if (deltas.content) session.content += deltas.content;
+    this.pushChunks(session, deltas);
+  }
+
+  private pushChunks(session: StreamingSession, deltas: StreamDeltas) {
+    (['thinking', 'content'] as const).forEach(type => {
+      const content = deltas[type];
+      if (!content) return;
+
+      session.chunks.push({
+        id: `chunk_${Date.now()}_${Math.random().toString(36).substr(2, 6)}`,
+        type,
+        content,
+        timestamp: new Date(),
+        isComplete: false
+      });
+    });
   }
 
   endSession() {
@@ -138,6 +138,10 @@ export interface ToolCall {
   execution_time: string;
   args: any;
   response: any;
+  timed_out?: boolean;
+  cached?: boolean;
+  iteration?: number;
+  iteration_wall_time?: string;
 }
 
 // AI response representation
@@ -155,6 +159,7 @@ export interface AIResponse {
     total_time?: number;
     thinking_time?: number;
     tool_calls_time?: number;
+    tool_calls_serial_time?: number;
   };
 }
 
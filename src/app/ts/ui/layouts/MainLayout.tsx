@@ -17,10 +17,11 @@ interface MainLayoutProps {
     messages: {type:string;topic:string;payload:any;from?:string}[];
     toasts?: { id:string; message:string }[];
     transcript: string;
+    partialText?: string;
     systemReady: boolean;
 }
 
-const MainLayout: React.FC<MainLayoutProps> = observer(( { children, assistantName, mode, transcript, systemReady, messages, toasts=[] } ) => {
+const MainLayout: React.FC<MainLayoutProps> = observer(( { children, assistantName, mode, transcript, partialText = '', systemReady, messages, toasts=[] } ) => {
     
     const { initDownloadingVoiceModel } = useSocketActions();
 
@@ -50,7 +51,7 @@ const MainLayout: React.FC<MainLayoutProps> = observer(( { children, assistantNa
             <div className='flex-1 relative overflow-hidden flex'>
                 <div className='w-60 bg-ui-bg-secondary border-r border-ui-border-primary flex flex-col text-xs'>
                     <div className='flex-1 overflow-hidden'>
-                        <StatePanel mode={mode} transcript={transcript} systemReady={systemReady} />
+                        <StatePanel mode={mode} transcript={transcript} partialText={partialText} systemReady={systemReady} />
                     </div>
                     <hr className='border-ui-border-primary' />
                     <div className='mt-auto'>
@@ -10,10 +10,11 @@ import ModulesStore from '../../store/ModulesStore';
 interface Props { 
   mode: string;
   transcript: string | Object;
+  partialText?: string;
   systemReady?: boolean;
 }
 
-const StatePanel: React.FC<Props> = observer(({ mode, systemReady = false }) => {
+const StatePanel: React.FC<Props> = observer(({ mode, partialText = '', systemReady = false }) => {
   const ctx = useContext(GContext);
 
   if (!ctx?.states) return null;
@@ -40,6 +41,11 @@ const StatePanel: React.FC<Props> = observer(({ mode, systemReady = false }) =>
             {!systemReady ? 'ИНИЦИАЛИЗАЦИЯ' : ctx.states[mode]}
           </div>
         </div>
+        {mode === 'listening' && partialText && (
+          <div className='text-xs text-ui-text-secondary italic break-words'>
+            {partialText}
+          </div>
+        )}
       </div>
 
       <hr className='border-ui-border-primary' />